@@ -4,23 +4,80 @@ FastAPI REST API for MCP Investigation Tool
 Enables integration with Lovable.dev frontend
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
 from typing import Optional
 import uvicorn
-from datetime import datetime
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import argparse
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import time
+from datetime import datetime
+
+from src.config import get_settings
+from src.estimator import get_estimator, over_budget
+from src.storage.artifacts import read_report
+from src.storage.jobs import JobStore, TERMINAL_STATUSES
+from src.storage.metrics import MetricsStore, get_metrics_store
+from src.storage.report_index import get_report_index
+from src.utils.report_delivery import (
+    MIN_COMPRESS_SIZE,
+    accepts_encoding,
+    byte_range,
+    compressed_variant,
+    is_not_modified,
+    negotiate_encoding,
+    resolve_report_path,
+    validators,
+    variant_path,
+)
+from src.utils.report_render import get_rendered, is_rendered
+from src.worker import InvestigationWorker
+
+# Stores and the worker are opened on first use, so importing the API loads
+# no settings and writes no files
+
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Return the job queue and status shared by every worker process through local storage."""
+    return JobStore(get_settings().state_dir / "jobs.db")
+
+
+@lru_cache(maxsize=1)
+def get_worker() -> InvestigationWorker:
+    """Return this process's job worker."""
+    return InvestigationWorker(get_job_store())
+
+
+def get_api_metrics() -> MetricsStore:
+    """Return the metrics store shared by every worker process."""
+    return get_metrics_store(get_settings().state_dir / "metrics.db")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the stores, start the job worker and drain running investigations on shutdown."""
+    loop = asyncio.get_running_loop()
+    # Open and backfill the report index before serving listings and searches
+    await loop.run_in_executor(None, get_report_index, get_settings().output_dir)
+    worker = await loop.run_in_executor(None, get_worker)
+    get_api_metrics()
+    worker.start()
+    yield
+    await loop.run_in_executor(None, worker.drain)
 
-from src.crew import MCPInvestigationCrew
 
 # Create FastAPI app
 app = FastAPI(
     title="MCP Investigation API",
     description="REST API for multi-agent MCP tool architecture investigations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for Lovable frontend
@@ -32,14 +89,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Thread pool for running investigations
-executor = ThreadPoolExecutor(max_workers=3)
-
 
 class InvestigationRequest(BaseModel):
     """Request model for starting an investigation."""
     topic: str
     depth: str = "comprehensive"
+    max_cost_usd: Optional[float] = None  # Reject if the estimate is above this (or the server limit)
+    max_duration_seconds: Optional[float] = None
+
+
+class EstimateResponse(BaseModel):
+    """Pre-flight estimate of an investigation."""
+    topic: str
+    depth: str
+    tokenizer: str
+    prompt_tokens: int
+    completion_tokens: int
+    duration_seconds: float
+    cost_usd: Optional[float] = None
+    queue_wait_seconds: float
+    within_budget: bool
+    budget_message: Optional[str] = None
+    phases: list
 
 
 class InvestigationResponse(BaseModel):
@@ -51,6 +122,7 @@ class InvestigationResponse(BaseModel):
     completed_at: str
     duration_seconds: float
     status: str
+    usage: Optional[dict] = None  # LLM tokens, latency and retries, per agent and phase
 
 
 class InvestigationStatus(BaseModel):
@@ -61,8 +133,190 @@ class InvestigationStatus(BaseModel):
     message: str
 
 
-# In-memory storage for investigation status (use Redis in production)
-investigation_status = {}
+class JobStatus(BaseModel):
+    """Status model for a queued or running investigation job."""
+    job_id: str
+    topic: str
+    depth: str
+    status: str
+    phase: str
+    message: str
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    report: Optional[str] = None
+    usage: Optional[dict] = None
+    estimated_seconds: Optional[float] = None
+    eta_seconds: Optional[float] = None  # Until completion, from queued and running estimates
+    progress: Optional[dict] = None  # Live per-phase status, LLM/tool counts and tokens
+
+
+def validate_request(request: InvestigationRequest):
+    """Reject invalid requests and apply queue back-pressure."""
+    if not request.topic or not request.topic.strip():
+        raise HTTPException(status_code=400, detail="Topic is required")
+
+    if request.depth not in ["quick", "standard", "comprehensive"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Depth must be 'quick', 'standard', or 'comprehensive'"
+        )
+
+    if get_job_store().count_by_status().get("queued", 0) >= get_settings().max_queued_investigations:
+        raise HTTPException(status_code=429, detail="Investigation queue is full, retry later")
+
+
+def budget_violation(request: InvestigationRequest, estimate: dict) -> Optional[str]:
+    """Check an estimate against the tighter of the server's and the request's limits."""
+    def tighter(server: Optional[float], client: Optional[float]) -> Optional[float]:
+        limits = [limit for limit in (server, client) if limit is not None]
+        return min(limits) if limits else None
+
+    settings = get_settings()
+    return over_budget(
+        estimate,
+        max_cost_usd=tighter(settings.max_request_cost_usd, request.max_cost_usd),
+        max_seconds=tighter(settings.max_request_seconds, request.max_duration_seconds)
+    )
+
+
+def preflight(request: InvestigationRequest) -> dict:
+    """Estimate a request and reject it with 422 if it exceeds its budget."""
+    estimate = get_estimator().estimate(request.topic, request.depth)
+    violation = budget_violation(request, estimate)
+    if violation:
+        raise HTTPException(status_code=422, detail={"message": violation, "estimate": estimate})
+    return estimate
+
+
+def queue_wait_seconds(before: Optional[str] = None) -> float:
+    """Estimated seconds until a free slot picks up work queued before a timestamp."""
+    job_store = get_job_store()
+    slots = sum(w["capacity"] for w in job_store.live_workers(get_settings().job_lease_seconds))
+    return round(job_store.pending_seconds(before) / max(slots, 1), 1)
+
+
+def check_not_modified(request_headers, headers: dict) -> bool:
+    """Evaluate a conditional request and count it as a cache hit or miss."""
+    conditional = "if-none-match" in request_headers or "if-modified-since" in request_headers
+    not_modified = is_not_modified(request_headers, headers)
+    if conditional:
+        get_api_metrics().inc(
+            "report_cache_requests_total",
+            {"cache": "conditional", "result": "hit" if not_modified else "miss"}
+        )
+    return not_modified
+
+
+def compressed_report_response(report_path, request: Request) -> Response:
+    """
+    Serve a gzip-stored report as is to clients that accept gzip, else decompressed.
+
+    Range requests address the decompressed report and are answered from it
+    with 206 (or 416 past its end).
+    """
+    encoding = None
+    if "range" not in request.headers and accepts_encoding(request.headers.get("accept-encoding"), "gzip"):
+        encoding = "gzip"
+
+    headers = validators(report_path, encoding)
+    headers["cache-control"] = "no-cache"
+    headers["vary"] = "Accept-Encoding"
+    if check_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["content-encoding"] = encoding
+        return FileResponse(report_path, media_type="text/markdown; charset=utf-8", headers=headers)
+
+    body = read_report(report_path).encode("utf-8")
+    headers["accept-ranges"] = "bytes"
+    # A stale If-Range gets the whole current report
+    if request.headers.get("if-range", headers["etag"]) == headers["etag"]:
+        try:
+            span = byte_range(request.headers.get("range"), len(body))
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{len(body)}"})
+        if span:
+            start, end = span
+            headers["content-range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(
+                body[start:end + 1],
+                status_code=206,
+                media_type="text/markdown; charset=utf-8",
+                headers=headers
+            )
+    return Response(body, media_type="text/markdown; charset=utf-8", headers=headers)
+
+
+def to_job_status(job: dict) -> JobStatus:
+    """Convert a job store record to its API model."""
+    return JobStatus(
+        job_id=job["id"],
+        topic=job["topic"],
+        depth=job["depth"],
+        status=job["status"],
+        phase=job["phase"],
+        message=job["message"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        completed_at=job["completed_at"],
+        duration_seconds=job["duration_seconds"],
+        report=job["report"],
+        usage=job["usage"],
+        estimated_seconds=job["estimated_seconds"],
+        eta_seconds=job_eta(job),
+        progress=job["progress"]
+    )
+
+
+def job_eta(job: dict) -> Optional[float]:
+    """Estimated seconds until a job completes, from its own and earlier jobs' estimates."""
+    if job["status"] in TERMINAL_STATUSES or job["estimated_seconds"] is None:
+        return None
+    if job["status"] == "queued":
+        return round(queue_wait_seconds(job["created_at"]) + job["estimated_seconds"], 1)
+    elapsed = time.time() - datetime.fromisoformat(job["started_at"]).timestamp()
+    return round(max(job["estimated_seconds"] - elapsed, 0.0), 1)
+
+
+async def wait_for_job(job_id: str, request: Optional[Request] = None) -> dict:
+    """
+    Wait until a job reaches a terminal status on any worker process.
+
+    If the waiting client disconnects, the job is cancelled once and waiting
+    stops, so an abandoned request does not keep a worker busy or keep polling.
+
+    Store calls run in the threadpool, so a locked database does not stall
+    the event loop.
+
+    Returns:
+        The terminal job, or the job as cancelled (or flagged for
+        cancellation) when the client disconnected
+
+    Raises:
+        HTTPException: 404 if the job does not exist
+    """
+    while True:
+        job = await run_in_threadpool(get_job_store().get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["status"] in TERMINAL_STATUSES:
+            return job
+        if request is not None and await request.is_disconnected():
+            return await run_in_threadpool(cancel_job_everywhere, job_id) or job
+        await asyncio.sleep(get_settings().job_poll_interval)
+
+
+def cancel_job_everywhere(job_id: str) -> Optional[dict]:
+    """Flag a job as cancelled; stop it right away if it runs in this process."""
+    job_store = get_job_store()
+    job = job_store.request_cancel(job_id)
+    if job is not None:
+        get_worker().cancel(job_id)
+        job = job_store.get(job_id)
+    return job
 
 
 @app.get("/")
@@ -76,77 +330,174 @@ async def root():
 
 
 @app.post("/api/investigate", response_model=InvestigationResponse)
-async def investigate(request: InvestigationRequest):
+async def investigate(
+    request: InvestigationRequest,
+    http_request: Request,
+    profile: bool = Query(False, description="Profile the run; artifacts are saved to logs/")
+):
     """
-    Start a new investigation.
+    Run an investigation and wait for the report.
+
+    The job is queued in the shared job store and may run on any worker
+    process; this request returns once it has finished.
 
     Args:
         request: Investigation request with topic and depth
+        profile: Run under the sampling profiler
 
     Returns:
         Investigation report and metadata
     """
+    # The store and estimator block, so they run in the threadpool
+    await run_in_threadpool(validate_request, request)
+    estimate = await run_in_threadpool(preflight, request)
+
+    job = await run_in_threadpool(
+        get_job_store().submit,
+        request.topic,
+        request.depth,
+        profile=profile,
+        estimated_seconds=estimate["duration_seconds"]
+    )
+    job = await wait_for_job(job["id"], http_request)
+
+    if job["status"] == "cancelled" or job.get("cancel_requested"):
+        raise HTTPException(status_code=409, detail="Investigation cancelled")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=500, detail=f"Investigation failed: {job['message']}")
+
+    return InvestigationResponse(
+        report=job["report"],
+        topic=job["topic"],
+        depth=job["depth"],
+        started_at=job["started_at"],
+        completed_at=job["completed_at"],
+        duration_seconds=job["duration_seconds"],
+        status=job["status"],
+        usage=job["usage"]
+    )
+
+
+@app.post("/api/jobs", response_model=JobStatus, status_code=202)
+def submit_job(
+    request: InvestigationRequest,
+    profile: bool = Query(False, description="Profile the run; artifacts are saved to logs/")
+):
+    """
+    Queue an investigation without waiting for it to finish.
+
+    Args:
+        request: Investigation request with topic and depth
+        profile: Run under the sampling profiler
+
+    Returns:
+        The queued job; poll /api/jobs/{job_id} for progress
+    """
+    validate_request(request)
+    estimate = preflight(request)
+    return to_job_status(get_job_store().submit(
+        request.topic,
+        request.depth,
+        profile=profile,
+        estimated_seconds=estimate["duration_seconds"]
+    ))
+
+
+@app.post("/api/estimate", response_model=EstimateResponse)
+def estimate_investigation(request: InvestigationRequest):
+    """
+    Estimate tokens, cost and duration of an investigation without running it.
+
+    Args:
+        request: Investigation request with topic, depth and optional budget
+
+    Returns:
+        Per-phase and total estimates, the expected queue wait and whether
+        the request fits its budget
+    """
     if not request.topic or not request.topic.strip():
         raise HTTPException(status_code=400, detail="Topic is required")
-
     if request.depth not in ["quick", "standard", "comprehensive"]:
         raise HTTPException(
             status_code=400,
             detail="Depth must be 'quick', 'standard', or 'comprehensive'"
         )
 
-    try:
-        start_time = datetime.now()
+    estimate = get_estimator().estimate(request.topic, request.depth)
+    violation = budget_violation(request, estimate)
+    return EstimateResponse(
+        **estimate,
+        queue_wait_seconds=queue_wait_seconds(),
+        within_budget=violation is None,
+        budget_message=violation
+    )
 
-        # Update status
-        investigation_status[request.topic] = {
-            "status": "running",
-            "phase": "initializing",
-            "message": "Starting investigation..."
-        }
 
-        # Run investigation in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        crew = MCPInvestigationCrew(verbose=True)
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str):
+    """
+    Get the status, and once completed the report, of a job.
 
-        def run_investigation():
-            return crew.investigate(topic=request.topic, depth=request.depth)
+    Args:
+        job_id: Job ID returned by /api/jobs
 
-        result = await loop.run_in_executor(executor, run_investigation)
+    Returns:
+        Current job status
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return to_job_status(job)
 
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
 
-        # Update status
-        investigation_status[request.topic] = {
-            "status": "completed",
-            "phase": "finished",
-            "message": "Investigation complete!"
-        }
+@app.post("/api/jobs/{job_id}/cancel", response_model=JobStatus)
+def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job.
 
-        return InvestigationResponse(
-            report=str(result),
-            topic=request.topic,
-            depth=request.depth,
-            started_at=start_time.isoformat(),
-            completed_at=end_time.isoformat(),
-            duration_seconds=duration,
-            status="completed"
-        )
+    Queued jobs are dropped; running jobs stop at the next phase, tool call
+    or LLM call and free their worker slot immediately.
 
-    except Exception as e:
-        investigation_status[request.topic] = {
-            "status": "failed",
-            "phase": "error",
-            "message": str(e)
-        }
-        raise HTTPException(status_code=500, detail=f"Investigation failed: {str(e)}")
+    Args:
+        job_id: Job ID returned by /api/jobs
+
+    Returns:
+        Job status after the cancel request
+    """
+    job = cancel_job_everywhere(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return to_job_status(job)
+
+
+@app.post("/api/cancel/{topic}", response_model=InvestigationStatus)
+def cancel_topic(topic: str):
+    """
+    Cancel the active investigation of a topic.
+
+    Args:
+        topic: Investigation topic
+
+    Returns:
+        Investigation status after the cancel request
+    """
+    job = get_job_store().latest_active_for_topic(topic)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No active investigation for this topic")
+
+    job = cancel_job_everywhere(job["id"])
+    return InvestigationStatus(
+        topic=topic,
+        status=job["status"],
+        phase=job["phase"],
+        message=job["message"]
+    )
 
 
 @app.get("/api/status/{topic}", response_model=InvestigationStatus)
-async def get_status(topic: str):
+def get_status(topic: str):
     """
-    Get the status of an investigation.
+    Get the status of the latest investigation of a topic.
 
     Args:
         topic: Investigation topic
@@ -154,78 +505,267 @@ async def get_status(topic: str):
     Returns:
         Current investigation status
     """
-    if topic not in investigation_status:
+    job = get_job_store().latest_for_topic(topic)
+    if job is None:
         raise HTTPException(status_code=404, detail="Investigation not found")
 
-    status = investigation_status[topic]
     return InvestigationStatus(
         topic=topic,
-        status=status["status"],
-        phase=status["phase"],
-        message=status["message"]
+        status=job["status"],
+        phase=job["phase"],
+        message=job["message"]
     )
 
 
 @app.get("/api/recent")
-async def list_recent():
+def list_recent(
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    depth: Optional[str] = None,
+    topic: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
     """
-    List recent investigations.
+    List recent investigations from the report index.
+
+    Args:
+        limit: Page size
+        offset: Number of investigations to skip
+        depth: Filter by investigation depth
+        topic: Filter by topic substring
+        since: Only investigations completed at or after this ISO timestamp
+        until: Only investigations completed before this ISO timestamp
 
     Returns:
-        List of recent investigation metadata
+        Page of recent investigation metadata and the total match count
     """
-    output_dir = Path("outputs")
-    if not output_dir.exists():
-        return {"investigations": []}
-
-    reports = sorted(
-        output_dir.glob("investigation_*.md"),
-        key=lambda x: x.stat().st_mtime,
-        reverse=True
+    reports, total = get_report_index(get_settings().output_dir).query(
+        limit=limit,
+        offset=offset,
+        depth=depth,
+        topic=topic,
+        since=since,
+        until=until
     )
 
-    investigations = []
-    for report in reports[:10]:
-        timestamp = datetime.fromtimestamp(report.stat().st_mtime)
-        topic = report.stem.replace("investigation_", "").replace("_", " ")
-        size = report.stat().st_size / 1024  # KB
+    investigations = [
+        {
+            "topic": report["topic"],
+            "filename": report["filename"],
+            "timestamp": report["completed_at"],
+            "size_kb": round(report["size_bytes"] / 1024, 1),
+            "depth": report["depth"],
+            "duration_seconds": report["duration_seconds"],
+            "total_tokens": report["total_tokens"]
+        }
+        for report in reports
+    ]
+
+    return {"investigations": investigations, "total": total}
+
+
+@app.get("/api/search")
+def search_reports(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Full-text search over all saved reports.
+
+    Args:
+        q: Search query; all words must match, the last one as a prefix
+        limit: Page size
+        offset: Number of results to skip
+
+    Returns:
+        Ranked page of matching reports with highlighted snippets
+    """
+    start = time.perf_counter()
+    reports, total = get_report_index(get_settings().output_dir).search(q, limit=limit, offset=offset)
+
+    results = [
+        {
+            "topic": report["topic"],
+            "filename": report["filename"],
+            "timestamp": report["completed_at"],
+            "depth": report["depth"],
+            "score": round(-report["score"], 4),
+            "snippet": report["snippet"]
+        }
+        for report in reports
+    ]
+
+    return {
+        "query": q,
+        "total": total,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+@app.get("/api/report/{filename:path}/raw")
+def get_report_raw(filename: str, request: Request):
+    """
+    Stream a report as markdown.
+
+    Supports gzip/br negotiation, conditional requests (ETag and
+    Last-Modified, answered with 304) and byte ranges.
+
+    Args:
+        filename: Report path relative to the output directory, as listed
+
+    Returns:
+        Report file streamed from disk
+    """
+    report_path = resolve_report_path(get_settings().output_dir, filename)
+    if report_path is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    if report_path.suffix == ".gz":
+        return compressed_report_response(report_path, request)
+
+    # Ranges address the identity representation only
+    encoding = None
+    if "range" not in request.headers and report_path.stat().st_size >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+    headers = validators(report_path, encoding)
+    headers["cache-control"] = "no-cache"
+    headers["vary"] = "Accept-Encoding"
+    if check_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["content-encoding"] = encoding
+        get_api_metrics().inc(
+            "report_cache_requests_total",
+            {"cache": "compressed", "result": "hit" if variant_path(report_path, encoding).exists() else "miss"}
+        )
+        return FileResponse(
+            compressed_variant(report_path, encoding),
+            media_type="text/markdown; charset=utf-8",
+            headers=headers
+        )
+
+    return FileResponse(report_path, media_type="text/markdown; charset=utf-8", headers=headers)
+
 
-        investigations.append({
-            "topic": topic,
-            "filename": report.name,
-            "timestamp": timestamp.isoformat(),
-            "size_kb": round(size, 1)
-        })
+@app.get("/api/report/{filename:path}/html")
+def get_report_html(filename: str, request: Request):
+    """
+    Get a report rendered as HTML, with a table of contents and section index.
+
+    Renders are cached by content hash when the report is saved, so views
+    do not re-render. Supports conditional requests like the other report
+    endpoints.
+
+    Args:
+        filename: Report path relative to the output directory
+
+    Returns:
+        content_hash, html, toc (HTML list) and sections (level, id, title)
+    """
+    output_dir = get_settings().output_dir
+    report_path = resolve_report_path(output_dir, filename)
+    if report_path is None:
+        raise HTTPException(status_code=404, detail="Report not found")
 
-    return {"investigations": investigations}
+    headers = validators(report_path, "html")
+    headers["cache-control"] = "no-cache"
+    if check_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    get_api_metrics().inc(
+        "report_cache_requests_total",
+        {"cache": "rendered", "result": "hit" if is_rendered(report_path, output_dir) else "miss"}
+    )
+    return JSONResponse({"filename": filename, **get_rendered(report_path, output_dir)}, headers=headers)
 
 
-@app.get("/api/report/{filename}")
-async def get_report(filename: str):
+@app.get("/api/report/{filename:path}")
+def get_report(filename: str, request: Request):
     """
     Get a specific investigation report.
 
     Args:
-        filename: Report filename
+        filename: Report path relative to the output directory
 
     Returns:
         Report content
     """
-    output_dir = Path("outputs")
-    report_path = output_dir / filename
-
-    if not report_path.exists():
+    report_path = resolve_report_path(get_settings().output_dir, filename)
+    if report_path is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    content = report_path.read_text()
-    return {"filename": filename, "content": content}
+    headers = validators(report_path)
+    headers["cache-control"] = "no-cache"
+    if check_not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+
+    content = read_report(report_path)
+    return JSONResponse({"filename": filename, "content": content}, headers=headers)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus metrics for the whole deployment.
+
+    Counters and histograms live in shared local storage and gauges are read
+    from the job store, so every worker process returns the same totals.
+    """
+    job_store = get_job_store()
+    jobs = job_store.count_by_status()
+    workers = job_store.live_workers(get_settings().job_lease_seconds)
+    gauges = [
+        ("investigation_queue_depth", "Investigations waiting for a free worker slot",
+         [({}, jobs.get("queued", 0))]),
+        ("investigation_jobs", "Jobs in the job store by status",
+         [({"status": status}, count) for status, count in sorted(jobs.items())]),
+        ("investigation_workers", "Live API worker processes", [({}, len(workers))]),
+        ("investigation_worker_slots", "Investigation slots across live workers by state", [
+            ({"state": "busy"}, sum(w["active"] for w in workers)),
+            ({"state": "total"}, sum(w["capacity"] for w in workers)),
+        ]),
+    ]
+    return PlainTextResponse(
+        get_api_metrics().render(gauges),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "api:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the MCP Investigation API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.api_workers,
+        help="Number of worker processes (>1 enables production mode without reload)"
     )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Production: N processes sharing one socket and the job store.
+        # On SIGTERM uvicorn stops accepting connections, waits for in-flight
+        # requests, then each worker drains its running investigations.
+        uvicorn.run(
+            "api:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            timeout_graceful_shutdown=settings.shutdown_timeout_seconds,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "api:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
@@ -5,18 +5,30 @@ Gradio Web UI for MCP Investigation Tool
 
 import gradio as gr
 from datetime import datetime
-from pathlib import Path
 
+from src.api_client import get_api_client
+from src.config import OUTPUT_DIR
 from src.crew import MCPInvestigationCrew
+from src.storage.report_index import get_report_index
+from src.utils.cancellation import CancellationToken, InvestigationCancelled
 
 
-def investigate_topic(topic: str, depth: str):
+# Cancellation tokens (or API job handles) of running investigations, keyed by Gradio session
+active_tokens = {}
+
+
+def investigate_topic(topic: str, depth: str, request: gr.Request = None):
     """
     Run an investigation and yield progress updates.
 
+    With INVESTIGATION_API_URL set, the investigation runs on the API's job
+    queue and the status follows the job; otherwise the crew runs in this
+    process.
+
     Args:
         topic: Investigation topic
         depth: Investigation depth
+        request: Gradio request, identifies the session for cancellation
 
     Yields:
         Tuple of (report_markdown, status_message)
@@ -25,6 +37,11 @@ def investigate_topic(topic: str, depth: str):
         yield "❌ Please enter a topic to investigate.", "Error: No topic provided"
         return
 
+    session = request.session_hash if request else None
+    cancel_token = CancellationToken()
+    active_tokens[session] = cancel_token
+    run = None
+
     try:
         # Initial status
         start_time = datetime.now()
@@ -33,31 +50,40 @@ def investigate_topic(topic: str, depth: str):
 
         yield "*Investigation in progress...*", initial_status
 
-        # Phase 1: MCP Research
-        phase1_status = initial_status + "\n🔬 **Phase 1/4: MCP Research**\n"
-        phase1_status += "Searching for MCP documentation and best practices...\n"
-        yield "*Investigation in progress...*", phase1_status
-
-        # Create crew and run investigation
-        crew = MCPInvestigationCrew(verbose=True)
-
-        # Phase 2: Technical Analysis (simulated - actual work happens in crew)
-        phase2_status = phase1_status + "\n💻 **Phase 2/4: Technical Analysis**\n"
-        phase2_status += "Analyzing GitHub code examples and patterns...\n"
-        yield "*Investigation in progress...*", phase2_status
-
-        # Phase 3: Architecture Design
-        phase3_status = phase2_status + "\n🏗️ **Phase 3/4: Architecture Design**\n"
-        phase3_status += "Synthesizing findings and designing architecture...\n"
-        yield "*Investigation in progress...*", phase3_status
-
-        # Phase 4: Documentation
-        phase4_status = phase3_status + "\n✍️ **Phase 4/4: Documentation**\n"
-        phase4_status += "Creating comprehensive markdown report...\n"
-        yield "*Investigation in progress...*", phase4_status
-
-        # Run actual investigation
-        result = crew.investigate(topic=topic, depth=depth)
+        client = get_api_client()
+        if client is not None:
+            # Run on the API's shared job queue and follow the job's phase
+            run = client.start(topic, depth)
+            active_tokens[session] = run
+            for job in run.updates():
+                yield "*Investigation in progress...*", initial_status + f"\n{job['message']}\n"
+            result = run.outcome()
+        else:
+            # Phase 1: MCP Research
+            phase1_status = initial_status + "\n🔬 **Phase 1/4: MCP Research**\n"
+            phase1_status += "Searching for MCP documentation and best practices...\n"
+            yield "*Investigation in progress...*", phase1_status
+
+            # Create crew and run investigation
+            crew = MCPInvestigationCrew(verbose=True)
+
+            # Phase 2: Technical Analysis (simulated - actual work happens in crew)
+            phase2_status = phase1_status + "\n💻 **Phase 2/4: Technical Analysis**\n"
+            phase2_status += "Analyzing GitHub code examples and patterns...\n"
+            yield "*Investigation in progress...*", phase2_status
+
+            # Phase 3: Architecture Design
+            phase3_status = phase2_status + "\n🏗️ **Phase 3/4: Architecture Design**\n"
+            phase3_status += "Synthesizing findings and designing architecture...\n"
+            yield "*Investigation in progress...*", phase3_status
+
+            # Phase 4: Documentation
+            phase4_status = phase3_status + "\n✍️ **Phase 4/4: Documentation**\n"
+            phase4_status += "Creating comprehensive markdown report...\n"
+            yield "*Investigation in progress...*", phase4_status
+
+            # Run actual investigation
+            result = crew.investigate(topic=topic, depth=depth, cancel_token=cancel_token)
 
         # Final success
         end_time = datetime.now()
@@ -66,10 +92,34 @@ def investigate_topic(topic: str, depth: str):
 
         yield str(result), success_msg
 
+    except InvestigationCancelled:
+        yield "*Investigation cancelled.*", "⏹️ **Investigation cancelled.**"
+
     except Exception as e:
         error_msg = f"❌ Error during investigation:\n\n```\n{str(e)}\n```"
         yield error_msg, "Investigation failed"
 
+    except GeneratorExit:
+        # Gradio closes the generator when the client disconnects; stop the job too
+        if run is None:
+            cancel_token.cancel("Client disconnected")
+        elif not run.done:
+            run.cancel("Client disconnected")
+        raise
+
+    finally:
+        active_tokens.pop(session, None)
+
+
+def cancel_investigation(request: gr.Request = None):
+    """Cancel the investigation running in this session."""
+    token = active_tokens.get(request.session_hash if request else None)
+    if token is None:
+        return "No investigation is running."
+
+    token.cancel("Investigation cancelled by user")
+    return "⏹️ **Cancelling...** The investigation stops at its next step."
+
 
 def get_example_topics():
     """Return example investigation topics."""
@@ -87,21 +137,17 @@ def get_example_topics():
 
 def list_recent_investigations():
     """List recent investigation reports."""
-    output_dir = Path("outputs")
-    if not output_dir.exists():
-        return "No investigations yet."
-
-    reports = sorted(output_dir.glob("investigation_*.md"), key=lambda x: x.stat().st_mtime, reverse=True)
+    reports, _ = get_report_index(OUTPUT_DIR).query(limit=10)
 
     if not reports:
         return "No investigations yet."
 
     result = "## Recent Investigations\n\n"
-    for i, report in enumerate(reports[:10], 1):
-        timestamp = datetime.fromtimestamp(report.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
-        topic = report.stem.replace("investigation_", "").replace("_", " ")
-        size = report.stat().st_size / 1024  # KB
-        result += f"{i}. **{topic}** - {timestamp} ({size:.1f} KB)\n"
+    for i, report in enumerate(reports, 1):
+        timestamp = datetime.fromisoformat(report["completed_at"]).strftime('%Y-%m-%d %H:%M')
+        size = report["size_bytes"] / 1024  # KB
+        depth = f", {report['depth']}" if report["depth"] else ""
+        result += f"{i}. **{report['topic']}** - {timestamp} ({size:.1f} KB{depth})\n"
 
     return result
 
@@ -134,6 +180,7 @@ with gr.Blocks(title="MCP Investigation Tool") as demo:
 
             with gr.Row():
                 investigate_btn = gr.Button("🚀 Start Investigation", variant="primary", size="lg")
+                cancel_btn = gr.Button("⏹️ Cancel", variant="stop", size="lg")
                 clear_btn = gr.Button("🗑️ Clear", size="lg")
 
         with gr.Column(scale=1):
@@ -190,6 +237,11 @@ with gr.Blocks(title="MCP Investigation Tool") as demo:
         outputs=[report_output, status_output]
     )
 
+    cancel_btn.click(
+        fn=cancel_investigation,
+        outputs=[status_output]
+    )
+
     clear_btn.click(
         fn=lambda: ("", "comprehensive", "Ready to investigate.", "*No investigation yet.*"),
         outputs=[topic_input, depth_selector, status_output, report_output]
@@ -7,20 +7,149 @@ Features: Session logging, version display, real-time progress, proper markdown
 import gradio as gr
 from datetime import datetime
 from pathlib import Path
-import markdown
 
-from src.crew import MCPInvestigationCrew
+from src.api_client import InvestigationAPIClient, get_api_client
+from src.config import OUTPUT_DIR
+from src.crew import PHASES, MCPInvestigationCrew
+from src.storage.report_index import get_report_index
+from src.utils.cancellation import CancellationToken, InvestigationCancelled
 from src.utils.logging_config import SessionLogger
+from src.utils.progress import BackgroundInvestigation, InvestigationProgress
+from src.utils.report_render import get_rendered, render_text
 from src.utils.version_info import get_agent_versions, format_version_info
 
 
-def investigate_topic(topic: str, depth: str):
+# Cancellation tokens (or API job handles) of running investigations, keyed by Gradio session
+active_tokens = {}
+
+PHASE_ICONS = ["🔬", "💻", "🏗️", "✍️"]
+
+
+def render_progress(header: str, progress: InvestigationProgress, models: list) -> str:
+    """
+    Render live investigation progress as markdown.
+
+    Args:
+        header: Status text shown above the phases
+        progress: Progress state built from the crew's events
+        models: Model of each phase's agent, in phase order
+
+    Returns:
+        Status markdown
+    """
+    lines = [header]
+    for index, ((name, phase), icon, model) in enumerate(zip(progress.phases.items(), PHASE_ICONS, models), 1):
+        lines.append(f"{icon} **Phase {index}/{len(progress.phases)}: {name}** ({phase['agent']}, {model})")
+        elapsed = progress.elapsed(name)
+        counts = f"{phase['llm_calls']} LLM calls · {phase['tool_calls']} tool calls"
+        if phase["status"] == "done":
+            lines.append(f"✅ Done in {elapsed:.0f}s · {phase['steps']} steps · {counts}\n")
+        elif phase["status"] == "running":
+            lines.append(f"🔄 Running for {elapsed:.0f}s · {counts}\n")
+        else:
+            lines.append("⏳ Waiting\n")
+
+    lines.append(
+        f"**Tokens so far:** {progress.prompt_tokens:,} prompt · {progress.completion_tokens:,} completion "
+        f"in {progress.llm_calls} LLM calls"
+    )
+    if progress.recent_tools:
+        lines.append("\n**Recent tool calls:**")
+        for call in progress.recent_tools:
+            took = "running" if call["duration_seconds"] is None else f"{call['duration_seconds']:.1f}s"
+            lines.append(f"- `{call['tool']}` {call['input'][:80]} ({took})")
+    return "\n".join(lines)
+
+
+def render_report(result: str) -> str:
+    """Convert a report to HTML, reusing the render cached when the report was saved."""
+    return render_text(result, OUTPUT_DIR)["html"]
+
+
+def investigate_via_api(topic: str, depth: str, session, client: InvestigationAPIClient):
+    """
+    Run an investigation on the API's shared job queue and render its progress.
+
+    The crew runs in an API worker, so it counts against the API's global
+    concurrency limit and is logged there; this app only polls the job.
+
+    Yields:
+        Tuple of (report_html, status_message, session_info)
+    """
+    start_time = datetime.now()
+    versions = get_agent_versions()
+    models = [agent["model"] for agent in versions["agents"].values()]
+    version_str = ""
+
+    try:
+        run = client.start(topic, depth)
+        active_tokens[session] = run
+        version_str = f"**Job ID:** `{run.job_id}`"
+        initial_status = f"""🔍 **Investigation Submitted**
+
+**Topic:** {topic}
+**Depth:** {depth}
+**Started:** {start_time.strftime('%H:%M:%S')}
+**Job ID:** `{run.job_id}`
+
+"""
+        for job in run.updates():
+            if job["status"] == "queued":
+                eta = f" (~{job['eta_seconds'] / 60:.0f} min until done)" if job["eta_seconds"] is not None else ""
+                status = initial_status + f"⏳ Waiting for a free worker{eta}...\n"
+            elif job["progress"]:
+                status = render_progress(initial_status, InvestigationProgress.from_dict(job["progress"]), models)
+            else:
+                status = initial_status + f"{job['message']}\n"
+            yield "*Investigation in progress...*", status, version_str
+
+        result_html = render_report(run.outcome())
+        job = run.job
+        success_msg = f"""✅ **Investigation Complete!**
+
+**Topic:** {topic}
+**Completed:** {datetime.now().strftime('%H:%M:%S')}
+**Duration:** {job['duration_seconds']:.1f} seconds
+**Job ID:** `{run.job_id}`
+
+🎉 Report generated successfully!
+"""
+        yield result_html, success_msg, version_str
+
+    except InvestigationCancelled:
+        yield "<p style='color: #666;'>Investigation cancelled.</p>", "⏹️ **Investigation cancelled.**", version_str
+
+    except Exception as e:
+        error_msg = f"""❌ Error during investigation:
+
+**Error:**
+```
+{str(e)}
+```
+"""
+        yield f"<p style='color: red;'>Investigation failed. See status for details.</p>", error_msg, version_str
+
+    except GeneratorExit:
+        # Gradio closes the generator when the client disconnects; stop the job too
+        if not run.done:
+            run.cancel("Client disconnected")
+        raise
+
+    finally:
+        active_tokens.pop(session, None)
+
+
+def investigate_topic(topic: str, depth: str, request: gr.Request = None):
     """
     Run an investigation with session logging and progress updates.
 
+    With INVESTIGATION_API_URL set, the investigation runs on the API's job
+    queue; otherwise the crew runs in this process.
+
     Args:
         topic: Investigation topic
         depth: Investigation depth
+        request: Gradio request, identifies the session for cancellation
 
     Yields:
         Tuple of (report_html, status_message, session_info)
@@ -29,10 +158,19 @@ def investigate_topic(topic: str, depth: str):
         yield "❌ Please enter a topic to investigate.", "Error: No topic provided", ""
         return
 
+    session = request.session_hash if request else None
+    client = get_api_client()
+    if client is not None:
+        yield from investigate_via_api(topic, depth, session, client)
+        return
+
     # Initialize session logger
     session_logger = SessionLogger()
     session_id = session_logger.session_id
 
+    cancel_token = CancellationToken()
+    active_tokens[session] = cancel_token
+
     try:
         start_time = datetime.now()
         session_logger.start_investigation(topic, depth)
@@ -49,92 +187,32 @@ def investigate_topic(topic: str, depth: str):
 **Started:** {start_time.strftime('%H:%M:%S')}
 **Session ID:** `{session_id}`
 
-⏳ **Initializing AI agents...**
-- Loading {versions['agents']['mcp_researcher']['model']} for research
-- Loading {versions['agents']['architect']['model']} for architecture
-- Preparing tools and workflows
 """
 
         yield "*Investigation in progress...*", initial_status, version_str
 
-        # Create crew
+        # Create crew; it runs on a background thread while this generator renders its events
         session_logger.log_event("crew_init", "Initializing CrewAI workflow")
-        crew_status = initial_status + "\n✅ Agents initialized! Starting investigation...\n"
-        yield "*Investigation in progress...*", crew_status, version_str
-
         crew = MCPInvestigationCrew(verbose=True, session_logger=session_logger)
+        run = BackgroundInvestigation(crew, topic, depth, cancel_token).start()
+        progress = InvestigationProgress(PHASES)
+        models = [agent["model"] for agent in versions["agents"].values()]
 
-        # Phase 1: MCP Research
-        session_logger.start_phase(1, "MCP Research")
-        phase1_status = crew_status + f"""
-🔬 **Phase 1/4: MCP Research**
-**Agent:** MCP Researcher ({versions['agents']['mcp_researcher']['model']})
-**Status:** Searching web for MCP documentation and best practices...
-**Tools:** Web search, Serper API
-"""
-        yield "*Investigation in progress...*", phase1_status, version_str
-
-        # Phase 2: Technical Analysis
-        session_logger.start_phase(2, "Technical Analysis")
-        phase2_status = phase1_status + f"""
-💻 **Phase 2/4: Technical Analysis**
-**Agent:** Technical Analyst ({versions['agents']['tech_analyst']['model']})
-**Status:** Analyzing GitHub repositories and code examples...
-**Tools:** GitHub search, code analysis
-"""
-        yield "*Investigation in progress...*", phase2_status, version_str
-
-        # Phase 3: Architecture Design
-        session_logger.start_phase(3, "Architecture Design")
-        phase3_status = phase2_status + f"""
-🏗️ **Phase 3/4: Architecture Design**
-**Agent:** System Architect ({versions['agents']['architect']['model']})
-**Status:** Synthesizing research and designing optimal architecture...
-**Tools:** Analysis, design patterns
-"""
-        yield "*Investigation in progress...*", phase3_status, version_str
-
-        # Phase 4: Documentation
-        session_logger.start_phase(4, "Documentation")
-        phase4_status = phase3_status + f"""
-✍️ **Phase 4/4: Documentation**
-**Agent:** Technical Writer ({versions['agents']['technical_writer']['model']})
-**Status:** Creating comprehensive markdown report...
-**Tools:** Markdown generation, formatting
-"""
-        yield "*Investigation in progress...*", phase4_status, version_str
-
-        # Run actual investigation
-        result = crew.investigate(topic=topic, depth=depth)
+        for event in run.events():
+            if event is not None:
+                progress.update(event)
+            yield "*Investigation in progress...*", render_progress(initial_status, progress, models), version_str
 
-        # Get output file path
-        output_dir = Path("outputs")
-        latest_file = max(output_dir.glob("investigation_*.md"), key=lambda x: x.stat().st_mtime, default=None)
+        artifact = run.outcome()
 
         # Complete session logging
-        session_logger.complete_investigation(success=True, output_file=str(latest_file) if latest_file else None)
+        session_logger.complete_investigation(success=True, output_file=str(artifact.path))
 
         # Export session log
         session_log_file = session_logger.export_session_log()
 
-        # Clean result - remove markdown code fence wrapper if present
-        result_str = str(result).strip()
-        if result_str.startswith('```markdown'):
-            # Remove opening fence and closing fence
-            result_str = result_str[len('```markdown'):].strip()
-            if result_str.endswith('```'):
-                result_str = result_str[:-3].strip()
-        elif result_str.startswith('```'):
-            # Remove generic code fence
-            result_str = result_str[3:].strip()
-            if result_str.endswith('```'):
-                result_str = result_str[:-3].strip()
-
-        # Convert markdown to HTML
-        result_html = markdown.markdown(
-            result_str,
-            extensions=['extra', 'codehilite', 'tables', 'fenced_code']
-        )
+        # The crew pre-rendered the saved report, so this is served from cache
+        result_html = get_rendered(artifact.path)["html"]
 
         # Final success
         end_time = datetime.now()
@@ -148,11 +226,19 @@ def investigate_topic(topic: str, depth: str):
 **Session Log:** `{session_log_file}`
 
 🎉 Report generated successfully!
-📁 Output: `{latest_file}`
+📁 Output: `{artifact.path}`
 """
 
         yield result_html, success_msg, version_str
 
+    except InvestigationCancelled:
+        session_logger.complete_investigation(success=False)
+        cancelled_msg = f"""⏹️ **Investigation cancelled.**
+
+**Session ID:** `{session_id}`
+"""
+        yield "<p style='color: #666;'>Investigation cancelled.</p>", cancelled_msg, version_str
+
     except Exception as e:
         session_logger.complete_investigation(success=False)
         error_msg = f"""❌ Error during investigation:
@@ -165,6 +251,24 @@ def investigate_topic(topic: str, depth: str):
 """
         yield f"<p style='color: red;'>Investigation failed. See status for details.</p>", error_msg, version_str
 
+    except GeneratorExit:
+        # Gradio closes the generator when the client disconnects; stop the crew too
+        cancel_token.cancel("Client disconnected")
+        raise
+
+    finally:
+        active_tokens.pop(session, None)
+
+
+def cancel_investigation(request: gr.Request = None):
+    """Cancel the investigation running in this session."""
+    token = active_tokens.get(request.session_hash if request else None)
+    if token is None:
+        return "No investigation is running."
+
+    token.cancel("Investigation cancelled by user")
+    return "⏹️ **Cancelling...** The investigation stops at its next step."
+
 
 def get_example_topics():
     """Return example investigation topics."""
@@ -182,21 +286,17 @@ def get_example_topics():
 
 def list_recent_investigations():
     """List recent investigation reports."""
-    output_dir = Path("outputs")
-    if not output_dir.exists():
-        return "No investigations yet."
-
-    reports = sorted(output_dir.glob("investigation_*.md"), key=lambda x: x.stat().st_mtime, reverse=True)
+    reports, _ = get_report_index(OUTPUT_DIR).query(limit=10)
 
     if not reports:
         return "No investigations yet."
 
     result = "## Recent Investigations\n\n"
-    for i, report in enumerate(reports[:10], 1):
-        timestamp = datetime.fromtimestamp(report.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
-        topic = report.stem.replace("investigation_", "").replace("_", " ")
-        size = report.stat().st_size / 1024  # KB
-        result += f"{i}. **{topic}** - {timestamp} ({size:.1f} KB)\n"
+    for i, report in enumerate(reports, 1):
+        timestamp = datetime.fromisoformat(report["completed_at"]).strftime('%Y-%m-%d %H:%M')
+        size = report["size_bytes"] / 1024  # KB
+        depth = f", {report['depth']}" if report["depth"] else ""
+        result += f"{i}. **{report['topic']}** - {timestamp} ({size:.1f} KB{depth})\n"
 
     return result
 
@@ -207,7 +307,7 @@ def load_session_logs():
     if not logs_dir.exists():
         return "No session logs yet."
 
-    log_files = sorted(logs_dir.glob("session_*_events.json"), key=lambda x: x.stat().st_mtime, reverse=True)
+    log_files = sorted(logs_dir.glob("session_*_events.json*"), key=lambda x: x.stat().st_mtime, reverse=True)
 
     if not log_files:
         return "No session logs yet."
@@ -249,6 +349,7 @@ with gr.Blocks(title="MCP Investigation Tool - Enhanced") as demo:
 
             with gr.Row():
                 investigate_btn = gr.Button("🚀 Start Investigation", variant="primary", size="lg")
+                cancel_btn = gr.Button("⏹️ Cancel", variant="stop", size="lg")
                 clear_btn = gr.Button("🗑️ Clear", size="lg")
 
         with gr.Column(scale=1):
@@ -319,6 +420,11 @@ with gr.Blocks(title="MCP Investigation Tool - Enhanced") as demo:
         outputs=[report_output, status_output, session_info]
     )
 
+    cancel_btn.click(
+        fn=cancel_investigation,
+        outputs=[status_output]
+    )
+
     clear_btn.click(
         fn=lambda: ("", "comprehensive", "<p style='color: #666;'>Ready to investigate.</p>", "Ready to investigate.", format_version_info()),
         outputs=[topic_input, depth_selector, report_output, status_output, session_info]
@@ -3,6 +3,7 @@
 from crewai import Agent, LLM
 
 from ..config import ANALYSIS_MODEL
+from ..utils.llm_interceptor import LLMUsageInterceptor
 
 
 def create_architect() -> Agent:
@@ -15,7 +16,7 @@ def create_architect() -> Agent:
     Returns:
         Configured Agent instance
     """
-    llm = LLM(model=ANALYSIS_MODEL)
+    llm = LLM(model=ANALYSIS_MODEL, interceptor=LLMUsageInterceptor())
 
     return Agent(
         role="System Architect and Solution Designer",
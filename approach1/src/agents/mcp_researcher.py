@@ -4,6 +4,7 @@ from crewai import Agent, LLM
 
 from ..config import RESEARCH_MODEL
 from ..tools.web_search import web_search_tool
+from ..utils.llm_interceptor import LLMUsageInterceptor
 
 
 def create_mcp_researcher() -> Agent:
@@ -16,7 +17,7 @@ def create_mcp_researcher() -> Agent:
     Returns:
         Configured Agent instance
     """
-    llm = LLM(model=RESEARCH_MODEL)
+    llm = LLM(model=RESEARCH_MODEL, interceptor=LLMUsageInterceptor())
 
     return Agent(
         role="MCP Protocol Researcher",
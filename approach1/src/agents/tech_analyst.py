@@ -4,6 +4,7 @@ from crewai import Agent, LLM
 
 from ..config import RESEARCH_MODEL
 from ..tools.github_search import github_code_search, github_repo_search
+from ..utils.llm_interceptor import LLMUsageInterceptor
 
 
 def create_tech_analyst() -> Agent:
@@ -16,7 +17,7 @@ def create_tech_analyst() -> Agent:
     Returns:
         Configured Agent instance
     """
-    llm = LLM(model=RESEARCH_MODEL)
+    llm = LLM(model=RESEARCH_MODEL, interceptor=LLMUsageInterceptor())
 
     return Agent(
         role="Code Analyst and Technical Researcher",
@@ -3,6 +3,7 @@
 from crewai import Agent, LLM
 
 from ..config import ANALYSIS_MODEL
+from ..utils.llm_interceptor import LLMUsageInterceptor
 
 
 def create_technical_writer() -> Agent:
@@ -14,7 +15,7 @@ def create_technical_writer() -> Agent:
     Returns:
         Configured Agent instance
     """
-    llm = LLM(model=ANALYSIS_MODEL)
+    llm = LLM(model=ANALYSIS_MODEL, interceptor=LLMUsageInterceptor())
 
     return Agent(
         role="Technical Documentation Specialist",
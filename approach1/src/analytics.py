@@ -0,0 +1,116 @@
+"""Cross-session performance analytics over session logs.
+
+Usage:
+    python -m src.analytics                      # ingest logs/ and report overall
+    python -m src.analytics --by depth           # slice by depth, model or date
+    python -m src.analytics --model gpt-4o --since 2026-01-01 --json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from .storage.analytics import SessionAnalytics
+
+
+DEFAULT_LOGS_DIR = Path("logs")
+DB_FILENAME = ".analytics.db"
+
+
+def _seconds(value) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _number(value) -> str:
+    return "-" if value is None else f"{value:,.0f}"
+
+
+def _percent(value) -> str:
+    return "-" if value is None else f"{value:.0%}"
+
+
+def print_report(console: Console, groups: list, group_by: str = None):
+    """Render report groups as tables."""
+    if not groups:
+        console.print("[yellow]No sessions match.[/yellow]")
+        return
+
+    summary = Table(title="Investigations")
+    for column in (group_by or "group", "sessions", "failure rate", "p50 s", "p95 s", "p99 s",
+                   "tool calls", "prompt chars", "output chars"):
+        summary.add_column(column, justify="left" if column == (group_by or "group") else "right")
+    for group in groups:
+        duration = group["duration_seconds"]
+        summary.add_row(
+            group["group"],
+            str(group["sessions"]),
+            _percent(group["failure_rate"]),
+            _seconds(duration["p50"]),
+            _seconds(duration["p95"]),
+            _seconds(duration["p99"]),
+            _number(group["tool_calls"]),
+            _number(group["prompt_chars"]),
+            _number(group["output_chars"])
+        )
+    console.print(summary)
+
+    phases = Table(title="Phases")
+    for column in (group_by or "group", "phase", "n", "p50 s", "p95 s", "p99 s",
+                   "tool calls", "prompt chars", "output chars"):
+        phases.add_column(column, justify="left" if column in (group_by or "group", "phase") else "right")
+    for group in groups:
+        for phase in group["phases"]:
+            duration = phase["duration_seconds"]
+            phases.add_row(
+                group["group"],
+                phase["phase"],
+                str(phase["count"]),
+                _seconds(duration["p50"]),
+                _seconds(duration["p95"]),
+                _seconds(duration["p99"]),
+                _number(phase["tool_calls"]),
+                _number(phase["prompt_chars"]),
+                _number(phase["output_chars"])
+            )
+    console.print(phases)
+
+
+def main(argv=None):
+    """Ingest new session logs and print performance statistics."""
+    parser = argparse.ArgumentParser(description="Performance analytics across investigation sessions")
+    parser.add_argument("--logs-dir", type=Path, default=DEFAULT_LOGS_DIR)
+    parser.add_argument("--db", type=Path, help=f"Analytics database (default: <logs-dir>/{DB_FILENAME})")
+    parser.add_argument("--by", choices=["depth", "model", "date"], help="Slice results")
+    parser.add_argument("--depth", choices=["quick", "standard", "comprehensive"])
+    parser.add_argument("--model", help="Only sessions and phases that used this model")
+    parser.add_argument("--since", help="Only sessions started on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only sessions started before this date (YYYY-MM-DD)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--no-ingest", action="store_true", help="Report on already indexed sessions")
+    args = parser.parse_args(argv)
+
+    console = Console()
+    analytics = SessionAnalytics(args.db or args.logs_dir / DB_FILENAME)
+    if not args.no_ingest:
+        ingested = analytics.ingest(args.logs_dir)
+        if not args.json:
+            console.print(f"Indexed {ingested} new or changed session log(s) from {args.logs_dir}/")
+
+    groups = analytics.report(
+        group_by=args.by,
+        depth=args.depth,
+        model=args.model,
+        since=args.since,
+        until=args.until
+    )
+    if args.json:
+        print(json.dumps(groups, indent=2))
+    else:
+        print_report(console, groups, args.by)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Client for the investigation API's job system.
+
+The Gradio apps use it, when INVESTIGATION_API_URL is set, to run
+investigations on the API's shared queue and workers instead of starting
+crews in their own process. All front ends then share one concurrency limit,
+one queue and the API's budget checks.
+"""
+
+import time
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import requests
+
+from .storage.jobs import TERMINAL_STATUSES
+from .utils.cancellation import InvestigationCancelled
+
+
+class InvestigationAPIError(RuntimeError):
+    """The API rejected a request, failed a job or could not be reached."""
+
+
+class InvestigationAPIClient:
+    """Submits, follows and cancels jobs on the investigation API."""
+
+    def __init__(self, base_url: str, timeout: float = 10.0, poll_interval: float = 1.0):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: API root, e.g. http://api:8000
+            timeout: Seconds per HTTP request
+            poll_interval: Seconds between job status polls
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            response = self._session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise InvestigationAPIError(f"Investigation API unreachable: {e}") from e
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail")
+            except ValueError:
+                detail = response.text
+            if isinstance(detail, dict):
+                detail = detail.get("message", detail)
+            raise InvestigationAPIError(f"Investigation API returned {response.status_code}: {detail}")
+        return response.json()
+
+    def submit(self, topic: str, depth: str) -> dict:
+        """Queue an investigation and return its job status."""
+        return self._request("POST", "/api/jobs", json={"topic": topic, "depth": depth})
+
+    def get(self, job_id: str) -> dict:
+        """Return a job's current status."""
+        return self._request("GET", f"/api/jobs/{job_id}")
+
+    def cancel(self, job_id: str) -> dict:
+        """Cancel a queued or running job."""
+        return self._request("POST", f"/api/jobs/{job_id}/cancel")
+
+    def start(self, topic: str, depth: str) -> "RemoteInvestigation":
+        """Queue an investigation and return a handle to follow it."""
+        return RemoteInvestigation(self, self.submit(topic, depth))
+
+
+class RemoteInvestigation:
+    """
+    A job running on the API, followed by polling.
+
+    Mirrors BackgroundInvestigation for the Gradio apps: updates() streams
+    status while the job runs, outcome() returns the report, and cancel()
+    matches CancellationToken.cancel() so it can be stored alongside tokens.
+    """
+
+    def __init__(self, client: InvestigationAPIClient, job: dict):
+        self.client = client
+        self.job = job
+
+    @property
+    def job_id(self) -> str:
+        return self.job["job_id"]
+
+    @property
+    def done(self) -> bool:
+        """Whether the job had finished when it was last polled."""
+        return self.job["status"] in TERMINAL_STATUSES
+
+    def updates(self) -> Iterator[dict]:
+        """Yield the job's status every poll interval until it finishes."""
+        while self.job["status"] not in TERMINAL_STATUSES:
+            yield self.job
+            time.sleep(self.client.poll_interval)
+            self.job = self.client.get(self.job_id)
+
+    def outcome(self) -> str:
+        """
+        Wait for the job and return its report.
+
+        Raises:
+            InvestigationCancelled: If the job was cancelled
+            InvestigationAPIError: If the job failed
+        """
+        for _ in self.updates():
+            pass
+        if self.job["status"] == "cancelled":
+            raise InvestigationCancelled(self.job["message"])
+        if self.job["status"] != "completed":
+            raise InvestigationAPIError(self.job["message"])
+        return self.job["report"]
+
+    def cancel(self, reason: Optional[str] = None):
+        """Ask the API to cancel the job; the reason is not sent."""
+        self.job = self.client.cancel(self.job_id)
+
+
+@lru_cache(maxsize=1)
+def get_api_client() -> Optional[InvestigationAPIClient]:
+    """Return the client for INVESTIGATION_API_URL, or None to run crews in-process."""
+    from .config import INVESTIGATION_API_URL
+
+    return InvestigationAPIClient(INVESTIGATION_API_URL) if INVESTIGATION_API_URL else None
@@ -0,0 +1,266 @@
+"""Offline end-to-end benchmark of the investigation workflow.
+
+Runs MCPInvestigationCrew.investigate() against a local stub of the LLM and
+search APIs (see src.utils.stub_backend), so it needs no network access or
+API keys and its numbers reflect our orchestration code rather than model
+speed. For each investigation it reports end-to-end latency, orchestration
+overhead (latency minus the stub's simulated waits), peak Python memory and
+the memory and blocks still allocated afterwards.
+
+Save a result as a baseline and compare later runs against it to catch
+regressions, e.g. in CI; the command exits with status 1 on a regression.
+
+Usage:
+    python -m src.benchmark
+    python -m src.benchmark --runs 5 --llm-latency 0.2 --tokens-per-second 80
+    python -m src.benchmark --json > benchmarks/baseline.json
+    python -m src.benchmark --baseline benchmarks/baseline.json --max-regression 0.3
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from .utils.stub_backend import StubBackend
+
+
+TOPIC = "file system MCP tool"
+
+# Keep CrewAI from sending telemetry so runs are offline and undisturbed
+OFFLINE_ENV = {
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "CREWAI_TRACING_ENABLED": "false",
+    "OTEL_SDK_DISABLED": "true",
+}
+
+# Metrics compared against a baseline: (section, key)
+REGRESSION_METRICS = [
+    ("overhead_seconds", "median"),
+    ("memory", "peak_bytes"),
+]
+
+
+@contextmanager
+def _environment(values: dict):
+    """Set environment variables for the duration of the block."""
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _investigate(backend: StubBackend, depth: str, verbose: bool) -> dict:
+    """Run one investigation against the backend and time it."""
+    from .crew import MCPInvestigationCrew
+
+    crew = MCPInvestigationCrew(verbose=verbose, tracing=False, persist=False)
+    waited = backend.waited_seconds
+    requests = dict(backend.requests)
+    started = time.perf_counter()
+    crew.investigate(topic=TOPIC, depth=depth, profile=False)
+    latency = time.perf_counter() - started
+    return {
+        "latency_seconds": latency,
+        "overhead_seconds": latency - (backend.waited_seconds - waited),
+        "llm_calls": crew.usage["calls"],
+        "search_calls": sum(count - requests.get(kind, 0)
+                            for kind, count in backend.requests.items() if kind != "llm")
+    }
+
+
+def _measure_memory(backend: StubBackend, depth: str, verbose: bool) -> dict:
+    """Run one investigation under tracemalloc and return its memory figures."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks()
+        _investigate(backend, depth, verbose)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "peak_bytes": peak - base,
+            "retained_bytes": current - base,
+            "retained_blocks": sys.getallocatedblocks() - blocks
+        }
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def _summary(values: list) -> dict:
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4)
+    }
+
+
+def run_benchmark(
+    runs: int = 3,
+    depth: str = "standard",
+    llm_latency: float = 0.05,
+    tokens_per_second: Optional[float] = None,
+    completion_tokens: int = 300,
+    search_latency: float = 0.02,
+    warmup: bool = True,
+    memory: bool = True,
+    verbose: bool = False
+) -> dict:
+    """
+    Benchmark investigations against a local stub backend.
+
+    Args:
+        runs: Timed investigations
+        depth: Investigation depth
+        llm_latency: Stub seconds before each completion's first token
+        tokens_per_second: Stub completion throughput; None for instant
+        completion_tokens: Length of the stub's final answers
+        search_latency: Stub seconds per search request
+        warmup: Run one untimed investigation first, so imports and
+            connection setup are not counted
+        memory: Run one more investigation under tracemalloc
+        verbose: CrewAI verbose output
+
+    Returns:
+        Dict with the backend config, latency and overhead summaries
+        (median, min, max seconds), calls per investigation and memory
+    """
+    backend = StubBackend(
+        llm_latency=llm_latency,
+        tokens_per_second=tokens_per_second,
+        completion_tokens=completion_tokens,
+        search_latency=search_latency
+    )
+    environment = {"OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "stub", **OFFLINE_ENV, **backend.env()}
+    with backend, _environment(environment):
+        if warmup:
+            _investigate(backend, depth, verbose)
+        samples = [_investigate(backend, depth, verbose) for _ in range(runs)]
+        memory_usage = _measure_memory(backend, depth, verbose) if memory else None
+
+    return {
+        "config": {
+            "runs": runs,
+            "depth": depth,
+            "llm_latency": llm_latency,
+            "tokens_per_second": tokens_per_second,
+            "completion_tokens": completion_tokens,
+            "search_latency": search_latency
+        },
+        "latency_seconds": _summary([sample["latency_seconds"] for sample in samples]),
+        "overhead_seconds": _summary([sample["overhead_seconds"] for sample in samples]),
+        "llm_calls": samples[-1]["llm_calls"],
+        "search_calls": samples[-1]["search_calls"],
+        "memory": memory_usage
+    }
+
+
+def find_regressions(result: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Compare a benchmark result with a baseline.
+
+    Args:
+        result: run_benchmark() result
+        baseline: Earlier run_benchmark() result
+        max_regression: Allowed relative increase, e.g. 0.3 for 30%
+
+    Returns:
+        Descriptions of the metrics that grew by more than max_regression
+    """
+    regressions = []
+    for section, key in REGRESSION_METRICS:
+        before = (baseline.get(section) or {}).get(key)
+        after = (result.get(section) or {}).get(key)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        if change > max_regression:
+            regressions.append(f"{section}.{key}: {before:,} -> {after:,} ({change:+.1%})")
+    return regressions
+
+
+def print_result(console: Console, result: dict):
+    """Render a benchmark result as a table."""
+    config = result["config"]
+    table = Table(title=f"Investigation benchmark ({config['runs']} run(s), {config['depth']})")
+    for column in ("", "median", "min", "max"):
+        table.add_column(column, justify="left" if not column else "right")
+    for label, key in (("end-to-end s", "latency_seconds"), ("orchestration overhead s", "overhead_seconds")):
+        table.add_row(label, *(f"{result[key][stat]:.3f}" for stat in ("median", "min", "max")))
+    console.print(table)
+    console.print(f"LLM calls: {result['llm_calls']}, search calls: {result['search_calls']} per investigation")
+    memory = result["memory"]
+    if memory:
+        console.print(f"Peak Python memory: {memory['peak_bytes'] / 1e6:.1f} MB, retained: "
+                      f"{memory['retained_bytes'] / 1e6:.1f} MB in {memory['retained_blocks']:,} blocks")
+
+
+def main(argv=None):
+    """Run the benchmark and optionally compare it with a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark investigations against a local stub LLM and search backend")
+    parser.add_argument("--runs", type=int, default=3, help="Timed investigations (default 3)")
+    parser.add_argument("--depth", default="standard", choices=["quick", "standard", "comprehensive"])
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds to first token (default 0.05)")
+    parser.add_argument("--tokens-per-second", type=float, default=None,
+                        help="Completion throughput of the stub (default: instant)")
+    parser.add_argument("--completion-tokens", type=int, default=300, help="Length of stub answers (default 300)")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Seconds per search (default 0.02)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--baseline", type=Path, help="Earlier --json result to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.3,
+                        help="Allowed increase over the baseline before failing (default 0.3 = 30%%)")
+    parser.add_argument("--verbose", action="store_true", help="CrewAI verbose output")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    console = Console(stderr=args.json)
+    # Keep stdout clean for --json; crew progress output goes to stderr
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        result = run_benchmark(
+            runs=args.runs,
+            depth=args.depth,
+            llm_latency=args.llm_latency,
+            tokens_per_second=args.tokens_per_second,
+            completion_tokens=args.completion_tokens,
+            search_latency=args.search_latency,
+            memory=not args.no_memory,
+            verbose=args.verbose
+        )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(console, result)
+
+    if args.baseline:
+        regressions = find_regressions(result, json.loads(args.baseline.read_text()), args.max_regression)
+        for regression in regressions:
+            console.print(f"[bold red]Regression:[/bold red] {regression}")
+        if regressions:
+            sys.exit(1)
+        console.print("[green]No regressions against the baseline.[/green]")
+
+
+if __name__ == "__main__":
+    main()
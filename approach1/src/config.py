@@ -1,56 +1,50 @@
-"""Configuration management for the MCP Investigation Tool."""
-
-import os
-from pathlib import Path
-from typing import Optional
-
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
-
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore"
-    )
-
-    # API Keys
-    openai_api_key: str
-    serper_api_key: Optional[str] = None
-
-    # Model Configuration
-    # Using latest GPT-5.2 models (Dec 2025)
-    default_research_model: str = "gpt-5.2-instant"  # Fast for research/search tasks
-    default_analysis_model: str = "gpt-5.2-thinking"  # Reasoning for architecture/writing
-
-    # Output Settings
-    output_dir: Path = Path("outputs")
-
-    # Agent Configuration
-    max_iterations: int = 5
-    verbose: bool = True
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Create output directory if it doesn't exist
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    @property
-    def has_serper(self) -> bool:
-        """Check if Serper API key is configured."""
-        return bool(self.serper_api_key)
-
-
-# Global settings instance
-settings = Settings()
-
-
-# Export commonly used values
-OPENAI_API_KEY = settings.openai_api_key
-RESEARCH_MODEL = settings.default_research_model
-ANALYSIS_MODEL = settings.default_analysis_model
-OUTPUT_DIR = settings.output_dir
-VERBOSE = settings.verbose
+"""Configuration management for the MCP Investigation Tool.
+
+Settings are loaded on first use, not at import: importing this module reads
+no .env file, needs no OPENAI_API_KEY, creates no directories and does not
+import pydantic-settings. ``from src.config import RESEARCH_MODEL`` and
+``src.config.settings`` still work; they load the settings at that point.
+Directories are created by the code that writes to them.
+"""
+
+from functools import lru_cache
+
+
+# Module constants and the settings field each one reads
+_EXPORTS = {
+    "OPENAI_API_KEY": "openai_api_key",
+    "RESEARCH_MODEL": "default_research_model",
+    "ANALYSIS_MODEL": "default_analysis_model",
+    "OUTPUT_DIR": "output_dir",
+    "COMPRESS_REPORTS": "compress_reports",
+    "STATE_DIR": "state_dir",
+    "VERBOSE": "verbose",
+    "TRACING_ENABLED": "tracing_enabled",
+    "PROFILE_INVESTIGATIONS": "profile_investigations",
+    "MODEL_PRICES": "model_prices",
+    "INVESTIGATION_API_URL": "investigation_api_url",
+    "COMPACT_SEARCH_RESULTS": "compact_search_results",
+}
+
+
+@lru_cache(maxsize=1)
+def get_settings():
+    """Load the application settings from the environment and .env (once)."""
+    from .settings import Settings
+    return Settings()
+
+
+def __getattr__(name: str):
+    # PEP 562: resolve settings and exported constants lazily
+    if name == "settings":
+        return get_settings()
+    if name == "Settings":
+        from .settings import Settings
+        return Settings
+    if name in _EXPORTS:
+        return getattr(get_settings(), _EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), "settings", "Settings", *_EXPORTS])
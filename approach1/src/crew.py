@@ -1,24 +1,66 @@
 """Main Crew orchestration for MCP investigation."""
 
+import logging
+import uuid
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from crewai import Crew, Process
-from rich.console import Console
-from rich.panel import Panel
+from . import config
+from .storage.artifacts import ReportArtifact, get_artifact_store
+from .storage.metrics import get_metrics_store
+from .storage.report_index import get_report_index
+from .utils.report_render import prerender
+from .utils.cancellation import CancellationToken, InvestigationCancelled, cancellation_scope
+from .utils.llm_usage import llm_calls, usage_summary
+from .utils.profiling import InvestigationProfiler
+from .utils.tracing import CrewTracer, Tracer, trace_span, tracing_scope
 
-from .agents.architect import create_architect
-from .agents.mcp_researcher import create_mcp_researcher
-from .agents.tech_analyst import create_tech_analyst
-from .agents.writer import create_technical_writer
-from .config import OUTPUT_DIR, VERBOSE
-from .tasks.investigation_tasks import (
-    create_architecture_design_task,
-    create_documentation_task,
-    create_mcp_research_task,
-    create_technical_analysis_task,
-)
+
+# (phase name, agent name) in execution order
+PHASES = [
+    ("MCP Research", "MCP Researcher"),
+    ("Technical Analysis", "Technical Analyst"),
+    ("Architecture Design", "System Architect"),
+    ("Documentation", "Technical Writer"),
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _release_crewai_state(crew):
+    """
+    Drop what CrewAI's process-wide listeners keep of a finished run.
+
+    Written against crewai 1.7.2, the version pinned in requirements.txt. Its
+    EventListener maps each task to a telemetry span and only resets the
+    value to None when the task ends, so every task, and through it its
+    agent, crew, LLM clients and outputs, would stay referenced. Its
+    TraceCollectionListener buffers every event and only empties the buffer
+    when it sends the batch, which never happens with CrewAI tracing off.
+
+    These are CrewAI internals: if another version moves them, the cleanup
+    is skipped with a warning rather than failing the investigation.
+
+    Args:
+        crew: The CrewAI Crew that ran
+    """
+    try:
+        from crewai.events.event_listener import EventListener
+        from crewai.events.listeners.tracing.trace_listener import TraceCollectionListener
+        from crewai.events.listeners.tracing.utils import should_enable_tracing
+
+        spans = EventListener().execution_spans
+        for task, span in list(spans.items()):
+            # Tasks of concurrent investigations still hold their span
+            if span is None:
+                spans.pop(task, None)
+
+        if not should_enable_tracing(override=crew.tracing):
+            TraceCollectionListener().batch_manager.event_buffer.clear()
+    except (ImportError, AttributeError) as e:
+        logger.warning("Could not release CrewAI run state (written for crewai 1.7.2): %s", e)
 
 
 class MCPInvestigationCrew:
@@ -27,41 +69,141 @@ class MCPInvestigationCrew:
 
     This crew coordinates 4 agents working sequentially to investigate
     MCP tool architectures and produce comprehensive documentation.
+
+    CrewAI, Rich and the agents are loaded on first use, so constructing the
+    crew (and importing this module) stays cheap for the API and CLIs.
     """
 
-    def __init__(self, verbose: bool = VERBOSE, session_logger=None):
+    def __init__(
+        self,
+        verbose: Optional[bool] = None,
+        session_logger=None,
+        tracing: Optional[bool] = None,
+        persist: bool = True
+    ):
         """
         Initialize the investigation crew.
 
         Args:
-            verbose: Enable verbose logging
+            verbose: Enable verbose logging; defaults to the VERBOSE setting
             session_logger: Optional SessionLogger instance for detailed logging
+            tracing: Export a Chrome trace of each investigation to logs/;
+                defaults to the TRACING_ENABLED setting
+            persist: Save reports to the output directory and record metrics;
+                replays and benchmarks turn this off
         """
-        self.verbose = verbose
-        self.console = Console()
+        self.verbose = config.VERBOSE if verbose is None else verbose
         self.session_logger = session_logger
-
-        # Create agents
-        self.mcp_researcher = create_mcp_researcher()
-        self.tech_analyst = create_tech_analyst()
-        self.architect = create_architect()
-        self.writer = create_technical_writer()
+        self.tracing = config.TRACING_ENABLED if tracing is None else tracing
+        self.persist = persist
+        self.trace_file = None
+        self.usage = None
+        self.profile_files = None
+
+    @cached_property
+    def console(self):
+        from rich.console import Console
+        return Console()
+
+    # Agents are created on first access and then reused by every run
+
+    @cached_property
+    def mcp_researcher(self):
+        from .agents.mcp_researcher import create_mcp_researcher
+        return create_mcp_researcher()
+
+    @cached_property
+    def tech_analyst(self):
+        from .agents.tech_analyst import create_tech_analyst
+        return create_tech_analyst()
+
+    @cached_property
+    def architect(self):
+        from .agents.architect import create_architect
+        return create_architect()
+
+    @cached_property
+    def writer(self):
+        from .agents.writer import create_technical_writer
+        return create_technical_writer()
 
     def investigate(
         self,
         topic: str,
-        depth: str = "comprehensive"
-    ) -> str:
+        depth: str = "comprehensive",
+        cancel_token: Optional[CancellationToken] = None,
+        profile: Optional[bool] = None,
+        on_event: Optional[Callable[[dict], None]] = None
+    ) -> ReportArtifact:
         """
         Run the MCP investigation workflow.
 
         Args:
             topic: Investigation topic (e.g., "web scraping MCP tool")
             depth: Investigation depth ("quick", "standard", "comprehensive")
+            cancel_token: Optional token; once cancelled, the run stops at the
+                next phase, agent step, tool call or LLM call
+            profile: Run under the sampling profiler and save its artifacts
+                to logs/; defaults to the PROFILE_INVESTIGATIONS setting
+            on_event: Optional listener for live progress; receives phase_start,
+                phase_end, llm_call, tool_start and tool_end events (see
+                CrewTracer) on the crew's thread
 
         Returns:
-            Final investigation report as markdown string
+            The saved report artifact (path, ID and metadata); str() of it is
+            the report markdown. Without persist it has no path.
+
+        Raises:
+            InvestigationCancelled: If cancel_token was cancelled
+
+        After the run, self.usage holds LLM token, latency and retry totals
+        per agent and per phase, self.trace_file the exported trace and
+        self.profile_files the profiling artifacts of a profiled run.
         """
+        run_id = self.session_logger.session_id if self.session_logger else uuid.uuid4().hex[:8]
+        if not (config.PROFILE_INVESTIGATIONS if profile is None else profile):
+            return self._investigate(topic, depth, cancel_token, run_id, on_event)
+
+        profiler = InvestigationProfiler()
+        try:
+            with profiler:
+                return self._investigate(topic, depth, cancel_token, run_id, on_event)
+        finally:
+            self.profile_files = profiler.save(Path("logs"), run_id)
+            self.console.print(f"[cyan]Profile saved to:[/cyan] {self.profile_files['summary']}")
+            if self.session_logger:
+                self.session_logger.log_event(
+                    "profile_saved",
+                    f"Profile written to {self.profile_files['summary']}",
+                    peak_rss_bytes=profiler.peak_rss,
+                    traced_peak_bytes=profiler.traced_peak,
+                    samples=profiler.samples,
+                    **{f"{kind}_file": str(path) for kind, path in self.profile_files.items()}
+                )
+
+    def _investigate(
+        self,
+        topic: str,
+        depth: str,
+        cancel_token: Optional[CancellationToken],
+        run_id: str,
+        on_event: Optional[Callable[[dict], None]] = None
+    ) -> ReportArtifact:
+        """Run the workflow; see investigate()."""
+        from crewai import Crew, Process
+        from rich.panel import Panel
+
+        from .tasks.investigation_tasks import (
+            create_architecture_design_task,
+            create_documentation_task,
+            create_mcp_research_task,
+            create_technical_analysis_task,
+        )
+
+        start_time = datetime.now()
+        cancel_token = cancel_token or CancellationToken()
+        cancel_token.raise_if_cancelled()
+
         self.console.print(Panel.fit(
             f"[bold cyan]MCP Investigation Tool[/bold cyan]\n"
             f"Topic: {topic}\n"
@@ -114,7 +256,32 @@ class MCPInvestigationCrew:
                 {"task_id": "task4", "expected_output": task4.expected_output}
             )
 
-        # Create crew
+        # Spans are always collected for metrics; self.tracing only controls the export
+        tracer = Tracer(run_id)
+        crew_tracer = CrewTracer(tracer, [name for name, _ in PHASES], on_event=on_event)
+        outcome = "failed"
+        completed_tasks = 0
+
+        def start_phase(index: int):
+            if index >= len(PHASES):
+                return
+            name, agent = PHASES[index]
+            if self.session_logger:
+                self.session_logger.start_phase(index + 1, name)
+            crew_tracer.start_phase(agent)
+
+        def on_step(step):
+            cancel_token.raise_if_cancelled()
+            crew_tracer.end_step()
+
+        def on_task(output):
+            nonlocal completed_tasks
+            cancel_token.raise_if_cancelled()
+            completed_tasks += 1
+            crew_tracer.end_phase()
+            start_phase(completed_tasks)
+
+        # Create crew; step and task callbacks are the phase/step checkpoints
         crew = Crew(
             agents=[
                 self.mcp_researcher,
@@ -124,71 +291,198 @@ class MCPInvestigationCrew:
             ],
             tasks=[task1, task2, task3, task4],
             process=Process.sequential,
-            verbose=self.verbose
+            verbose=self.verbose,
+            step_callback=on_step,
+            task_callback=on_task
         )
 
         # Execute investigation
         self.console.print("\n[yellow]Starting investigation...[/yellow]\n")
 
         try:
-            result = crew.kickoff()
-
-            # Log task outputs if session logger is available
-            if self.session_logger:
-                # Log each task's output
-                for i, task in enumerate([task1, task2, task3, task4], 1):
-                    agent_names = ["MCP Researcher", "Technical Analyst", "System Architect", "Technical Writer"]
-                    if hasattr(task, 'output') and task.output:
-                        self.session_logger.log_agent_output(
-                            agent_names[i-1],
-                            str(task.output),
-                            {"task_id": f"task{i}", "task_name": task.description[:100]}
-                        )
-
-                        # Log stage transitions
-                        if i < 4:
-                            self.session_logger.log_stage_transition(
-                                from_stage=agent_names[i-1],
-                                to_stage=agent_names[i],
-                                data_passed=str(task.output)[:500]
+            with tracing_scope(tracer, crew_tracer), \
+                    trace_span("investigation", "investigation", topic=topic, depth=depth) as root:
+                try:
+                    with cancellation_scope(cancel_token):
+                        start_phase(0)
+                        result = crew.kickoff()
+                except Exception as e:
+                    if cancel_token.cancelled:
+                        raise InvestigationCancelled(cancel_token.reason) from e
+                    raise
+                finally:
+                    crew_tracer.end_phase()
+
+                token_usage = self._token_usage(result)
+                root.set(**token_usage)
+
+                # Log task outputs if session logger is available
+                if self.session_logger:
+                    # Log each task's output
+                    for i, task in enumerate([task1, task2, task3, task4], 1):
+                        agent_names = [agent for _, agent in PHASES]
+                        if hasattr(task, 'output') and task.output:
+                            self.session_logger.log_agent_output(
+                                agent_names[i-1],
+                                str(task.output),
+                                {"task_id": f"task{i}", "task_name": task.description[:100]}
                             )
 
-            # Save output
-            output_file = self._save_result(topic, result)
+                            # Log stage transitions
+                            if i < 4:
+                                self.session_logger.log_stage_transition(
+                                    from_stage=agent_names[i-1],
+                                    to_stage=agent_names[i],
+                                    data_passed=str(task.output)[:500]
+                                )
+
+                # Save output
+                artifact = ReportArtifact(str(result))
+                if self.persist:
+                    with trace_span("save report", "io"):
+                        artifact = self._save_result(
+                            topic,
+                            result,
+                            depth=depth,
+                            started_at=start_time,
+                            token_usage=token_usage,
+                            session_id=run_id
+                        )
 
+            outcome = "completed"
             self.console.print(Panel.fit(
                 f"[bold green]Investigation Complete![/bold green]\n"
-                f"Report saved to: {output_file}",
+                f"Report saved to: {artifact.path or 'not saved'}",
                 border_style="green"
             ))
 
-            return str(result)
+            return artifact
+
+        except InvestigationCancelled as e:
+            outcome = "cancelled"
+            self.console.print(f"[bold yellow]Investigation cancelled:[/bold yellow] {str(e)}")
+            if self.session_logger:
+                self.session_logger.log_event("investigation_cancelled", str(e))
+            raise
 
         except Exception as e:
             self.console.print(f"[bold red]Error during investigation:[/bold red] {str(e)}")
             raise
 
-    def _save_result(self, topic: str, result: str) -> Path:
+        finally:
+            _release_crewai_state(crew)
+            self._record_usage(tracer, crew_tracer.payloads)
+            if self.persist:
+                self._record_metrics(tracer, depth, outcome)
+            if self.tracing:
+                self.trace_file = tracer.export(Path("logs") / f"trace_{tracer.trace_id}.json")
+                if self.session_logger:
+                    self.session_logger.log_event(
+                        "trace_exported",
+                        f"Trace written to {self.trace_file}",
+                        trace_file=str(self.trace_file)
+                    )
+
+    def _record_usage(self, tracer: Tracer, payloads: dict):
         """
-        Save investigation result to file.
+        Aggregate per-call LLM accounting into self.usage and log LLM and tool calls.
+
+        The logged events carry full LLM responses and tool results (stored in
+        the blob store), which is what src.replay re-executes a session from.
+        """
+        calls = llm_calls(tracer, payloads)
+        self.usage = usage_summary(calls)
+        if self.session_logger:
+            for call in calls:
+                self.session_logger.log_event(
+                    "llm_call",
+                    f"{call['agent']}: {call['model']} in {call['latency_seconds']}s",
+                    **call
+                )
+            for span in tracer.spans:
+                if span.category == "tool" and span.end_ns is not None:
+                    phase = tracer.find_ancestor(span, "phase")
+                    payload = payloads.get(span.span_id, {})
+                    self.session_logger.log_tool_use(
+                        span.name,
+                        payload.get("tool_input", span.attributes.get("input", "")),
+                        f"{span.attributes.get('result_chars', 0)} chars",
+                        {
+                            "phase": phase.name if phase else None,
+                            "agent": phase.attributes.get("agent") if phase else None,
+                            "duration_seconds": round(span.duration_seconds, 3),
+                            "result": payload.get("result")
+                        }
+                    )
+            self.session_logger.log_event(
+                "llm_usage",
+                f"{self.usage['calls']} LLM calls, "
+                f"{self.usage['prompt_tokens'] + self.usage['completion_tokens']} tokens",
+                **self.usage
+            )
+
+    def _record_metrics(self, tracer: Tracer, depth: str, outcome: str):
+        """Add a finished investigation to the shared Prometheus metrics."""
+        try:
+            get_metrics_store(config.STATE_DIR / "metrics.db").record_trace(tracer, depth=depth, outcome=outcome)
+        except Exception as e:
+            # Metrics must never fail an investigation that already finished
+            self.console.print(f"[yellow]Could not record metrics:[/yellow] {str(e)}")
+
+    @staticmethod
+    def _token_usage(result) -> dict:
+        """Extract token usage totals from a CrewOutput."""
+        usage = getattr(result, "token_usage", None)
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "total_tokens": getattr(usage, "total_tokens", None)
+        }
+
+    def _save_result(
+        self,
+        topic: str,
+        result: str,
+        depth: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        token_usage: Optional[dict] = None,
+        session_id: Optional[str] = None
+    ) -> ReportArtifact:
+        """
+        Save investigation result to the artifact store, record it in the
+        report index and queue its HTML render.
 
         Args:
             topic: Investigation topic
             result: Investigation result
+            depth: Investigation depth
+            started_at: When the investigation started
+            token_usage: Token usage totals for the run
+            session_id: Session or run ID, recorded in the metadata sidecar
 
         Returns:
-            Path to saved file
+            Handle to the saved report
         """
-        # Create safe filename
-        safe_topic = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in topic)
-        safe_topic = safe_topic.strip().replace(' ', '_')[:50]
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"investigation_{safe_topic}_{timestamp}.md"
-
-        output_path = OUTPUT_DIR / filename
+        output_dir = config.OUTPUT_DIR
+        artifact = get_artifact_store(output_dir, config.COMPRESS_REPORTS).save(
+            str(result),
+            topic=topic,
+            depth=depth,
+            started_at=started_at,
+            token_usage=token_usage,
+            session_id=session_id
+        )
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(str(result))
+        get_report_index(output_dir).add(
+            artifact.path,
+            topic=topic,
+            depth=depth,
+            started_at=artifact.metadata["started_at"],
+            duration_seconds=artifact.metadata["duration_seconds"],
+            token_usage=token_usage,
+            content=artifact.content
+        )
+        # Pre-render the HTML view off this thread so report views are served from cache
+        prerender(artifact.path, output_dir)
 
-        return output_path
+        return artifact
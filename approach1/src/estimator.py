@@ -0,0 +1,265 @@
+"""Pre-flight token, cost and duration estimates for investigations.
+
+Prompt sizes come from the tasks the crew would build for the topic, counted
+with a local tokenizer. LLM calls and output tokens per phase, and each
+model's throughput, come from past sessions in logs/.
+
+Usage:
+    python -m src.estimator "web scraping MCP tool"
+    python -m src.estimator "web scraping MCP tool" --depth quick --json
+"""
+
+import argparse
+import json
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from . import config
+from .crew import PHASES
+from .storage.analytics import SessionAnalytics
+from .utils.tokenizer import count_tokens, tokenizer_name
+
+
+DEFAULT_LOGS_DIR = Path("logs")
+DB_FILENAME = ".analytics.db"
+
+# Seconds between re-indexing logs/ for new sessions
+HISTORY_REFRESH_SECONDS = 300
+
+# CrewAI's ReAct instructions added to every agent prompt
+REACT_OVERHEAD_TOKENS = 350
+
+# Used for phases and models without history
+DEFAULT_LLM_CALLS = 3
+DEFAULT_COMPLETION_TOKENS = {
+    "MCP Research": 1500,
+    "Technical Analysis": 1500,
+    "Architecture Design": 2500,
+    "Documentation": 4000,
+}
+DEFAULT_SECONDS_PER_PROMPT_TOKEN = 0.0002
+DEFAULT_SECONDS_PER_COMPLETION_TOKEN = 0.02
+
+
+@lru_cache(maxsize=1)
+def _agents() -> list:
+    """Agents in phase order; built once, they only supply prompt text and models."""
+    from .agents.architect import create_architect
+    from .agents.mcp_researcher import create_mcp_researcher
+    from .agents.tech_analyst import create_tech_analyst
+    from .agents.writer import create_technical_writer
+
+    return [create_mcp_researcher(), create_tech_analyst(), create_architect(), create_technical_writer()]
+
+
+def phase_prompts(topic: str) -> list:
+    """
+    Build the prompt text of each phase's first LLM call, without context.
+
+    Args:
+        topic: Investigation topic
+
+    Returns:
+        List of (phase, agent name, model, prompt text) in phase order
+    """
+    from .tasks.investigation_tasks import (
+        create_architecture_design_task,
+        create_documentation_task,
+        create_mcp_research_task,
+        create_technical_analysis_task,
+    )
+
+    researcher, analyst, architect, writer = _agents()
+    task1 = create_mcp_research_task(researcher, topic)
+    task2 = create_technical_analysis_task(analyst, topic, context=[task1])
+    task3 = create_architecture_design_task(architect, topic, context=[task1, task2])
+    task4 = create_documentation_task(writer, topic, context=[task1, task2, task3])
+
+    prompts = []
+    for (phase, agent_name), task in zip(PHASES, (task1, task2, task3, task4)):
+        agent = task.agent
+        parts = [agent.role, agent.goal, agent.backstory]
+        parts += [tool.description for tool in agent.tools or []]
+        parts += [task.description, task.expected_output]
+        prompts.append((phase, agent_name, getattr(agent.llm, "model", str(agent.llm)), "\n".join(parts)))
+    return prompts
+
+
+class InvestigationEstimator:
+    """
+    Predicts tokens, cost and duration per phase before an investigation runs.
+
+    Each phase is expected to make its historical number of LLM calls. Every
+    call re-sends the task prompt plus the outputs of earlier phases, and
+    calls after the first also carry the agent's scratchpad so far. Duration
+    uses per-model seconds per prompt and completion token fitted from past
+    sessions.
+    """
+
+    def __init__(self, logs_dir: Path = DEFAULT_LOGS_DIR, db_path: Optional[Path] = None):
+        """
+        Initialize the estimator.
+
+        Args:
+            logs_dir: Directory with past session logs
+            db_path: Analytics database (default: <logs_dir>/.analytics.db)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.analytics = SessionAnalytics(db_path or self.logs_dir / DB_FILENAME)
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        """Index new session logs at most every HISTORY_REFRESH_SECONDS."""
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at > HISTORY_REFRESH_SECONDS:
+                if self.logs_dir.exists():
+                    self.analytics.ingest(self.logs_dir)
+                self._refreshed_at = now
+
+    def estimate(self, topic: str, depth: str = "comprehensive") -> dict:
+        """
+        Estimate an investigation.
+
+        Args:
+            topic: Investigation topic
+            depth: Investigation depth
+
+        Returns:
+            Dict with per-phase and total prompt tokens, completion tokens,
+            duration_seconds and cost_usd (None when a model has no price)
+        """
+        self._refresh()
+        history = self.analytics.phase_history(depth) or self.analytics.phase_history()
+        rates = self.analytics.model_rates()
+        prices = config.MODEL_PRICES
+
+        phases = []
+        context_tokens = 0
+        for phase, agent, model, prompt in phase_prompts(topic):
+            past = history.get(phase)
+            calls = max(1, round(past["llm_calls"])) if past else DEFAULT_LLM_CALLS
+            completion = round(past["completion_tokens"]) if past else DEFAULT_COMPLETION_TOKENS[phase]
+            base = count_tokens(prompt, model) + REACT_OVERHEAD_TOKENS + context_tokens
+            scratchpad = (calls - 1) * completion // 2
+            prompt_tokens = calls * base + scratchpad
+
+            rate = rates.get(model, {})
+            seconds = (
+                prompt_tokens * rate.get("seconds_per_prompt_token", DEFAULT_SECONDS_PER_PROMPT_TOKEN)
+                + completion * rate.get("seconds_per_completion_token", DEFAULT_SECONDS_PER_COMPLETION_TOKEN)
+            )
+            price = prices.get(model)
+            cost = (prompt_tokens * price[0] + completion * price[1]) / 1_000_000 if price else None
+
+            phases.append({
+                "phase": phase,
+                "agent": agent,
+                "model": model,
+                "llm_calls": calls,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion,
+                "duration_seconds": round(seconds, 1),
+                "cost_usd": round(cost, 4) if cost is not None else None,
+                "basis": f"{past['sessions']} past sessions" if past else "defaults",
+                "rate_basis": f"{rate['phases']} past phases" if rate else "defaults"
+            })
+            # Later phases receive this phase's output as context
+            context_tokens += completion
+
+        costs = [phase["cost_usd"] for phase in phases]
+        return {
+            "topic": topic,
+            "depth": depth,
+            "tokenizer": tokenizer_name(phases[0]["model"]),
+            "prompt_tokens": sum(phase["prompt_tokens"] for phase in phases),
+            "completion_tokens": sum(phase["completion_tokens"] for phase in phases),
+            "duration_seconds": round(sum(phase["duration_seconds"] for phase in phases), 1),
+            "cost_usd": round(sum(costs), 4) if None not in costs else None,
+            "phases": phases
+        }
+
+
+def over_budget(
+    estimate: dict,
+    max_cost_usd: Optional[float] = None,
+    max_seconds: Optional[float] = None
+) -> Optional[str]:
+    """
+    Check an estimate against a budget.
+
+    Args:
+        estimate: Result of InvestigationEstimator.estimate()
+        max_cost_usd: Cost limit, or None for no limit
+        max_seconds: Duration limit, or None for no limit
+
+    Returns:
+        Why the estimate exceeds the budget, or None if it fits
+    """
+    cost = estimate["cost_usd"]
+    if max_cost_usd is not None and cost is not None and cost > max_cost_usd:
+        return f"Estimated cost ${cost:.4f} exceeds the budget of ${max_cost_usd:.4f}"
+    if max_seconds is not None and estimate["duration_seconds"] > max_seconds:
+        return (f"Estimated duration {estimate['duration_seconds']:.0f}s exceeds the limit "
+                f"of {max_seconds:.0f}s")
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_estimator(logs_dir: Path = DEFAULT_LOGS_DIR) -> InvestigationEstimator:
+    """Return the process-wide estimator for a logs directory."""
+    return InvestigationEstimator(logs_dir)
+
+
+def print_estimate(console: Console, estimate: dict):
+    """Render an estimate as a table."""
+    table = Table(title=f"Estimate: {estimate['topic']} ({estimate['depth']})")
+    for column in ("phase", "model", "LLM calls", "prompt tokens", "completion tokens", "seconds", "cost $", "basis"):
+        table.add_column(column, justify="left" if column in ("phase", "model", "basis") else "right")
+    for phase in estimate["phases"]:
+        table.add_row(
+            phase["phase"],
+            phase["model"],
+            str(phase["llm_calls"]),
+            f"{phase['prompt_tokens']:,}",
+            f"{phase['completion_tokens']:,}",
+            f"{phase['duration_seconds']:.0f}",
+            "-" if phase["cost_usd"] is None else f"{phase['cost_usd']:.3f}",
+            phase["basis"]
+        )
+    table.add_row(
+        "[bold]total[/bold]", "", "",
+        f"{estimate['prompt_tokens']:,}",
+        f"{estimate['completion_tokens']:,}",
+        f"{estimate['duration_seconds']:.0f}",
+        "-" if estimate["cost_usd"] is None else f"{estimate['cost_usd']:.3f}",
+        f"tokenizer: {estimate['tokenizer']}"
+    )
+    console.print(table)
+
+
+def main(argv=None):
+    """Print a pre-flight estimate for a topic and depth."""
+    parser = argparse.ArgumentParser(description="Estimate tokens, cost and duration of an investigation")
+    parser.add_argument("topic")
+    parser.add_argument("--depth", choices=["quick", "standard", "comprehensive"], default="comprehensive")
+    parser.add_argument("--logs-dir", type=Path, default=DEFAULT_LOGS_DIR)
+    parser.add_argument("--json", action="store_true", help="Print the estimate as JSON")
+    args = parser.parse_args(argv)
+
+    estimate = InvestigationEstimator(args.logs_dir).estimate(args.topic, args.depth)
+    if args.json:
+        print(json.dumps(estimate, indent=2))
+    else:
+        print_estimate(Console(), estimate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+"""Load test of the investigation API's job queue.
+
+Starts api.py under uvicorn against a local stub of the LLM and search APIs
+(see src.utils.stub_backend), with state and reports in a temporary
+directory, then drives it with closed-loop clients: each submits a job
+(POST /api/jobs), polls it to completion and submits the next. Concurrency
+is stepped through the given levels to find where throughput stops growing,
+i.e. the ceiling of the worker's thread pool.
+
+Each stage reports throughput, p50/p95/p99 latency, queue time vs run time
+and error and 429 rates; server RSS is sampled throughout. Results are
+written as JSON so runs can be compared.
+
+Usage:
+    python -m src.loadtest
+    python -m src.loadtest --concurrency 1,2,4,8,16 --duration 60 --max-concurrent 3
+    python -m src.loadtest --depths quick=3,standard=1 --topics 5 --output logs/loadtest.json
+    python -m src.loadtest --url http://localhost:8000 --server-pid 1234   # existing server
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+from .benchmark import OFFLINE_ENV
+from .storage.analytics import percentile
+from .storage.jobs import TERMINAL_STATUSES
+from .utils.stub_backend import StubBackend
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# A stage whose throughput grows less than this over the previous one is past the ceiling
+CEILING_GAIN = 1.1
+
+TOPIC_TEMPLATES = [
+    "file system MCP tool",
+    "PostgreSQL database MCP tool",
+    "web scraping MCP tool",
+    "Slack messaging MCP tool",
+    "GitHub repository MCP tool",
+]
+
+
+def _topic_pool(size: int) -> list:
+    """Topics for the clients; a small pool means many repeated topics."""
+    count = len(TOPIC_TEMPLATES)
+    return [TOPIC_TEMPLATES[i % count] + (f" #{i // count}" if i >= count else "") for i in range(size)]
+
+
+def parse_mix(text: str) -> dict:
+    """Parse a depth mix such as "quick=3,standard=1" into {depth: weight}."""
+    mix = {}
+    for part in text.split(","):
+        depth, _, weight = part.partition("=")
+        mix[depth.strip()] = float(weight or 1)
+    return mix
+
+
+def _tree_rss(pid: int) -> Optional[int]:
+    """Resident memory of a process and its children (Linux), or None."""
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        return total or None
+    return total
+
+
+class RSSSampler:
+    """Samples a server's resident memory on a background thread."""
+
+    def __init__(self, pid: Optional[int], interval: float = 1.0):
+        self.pid = pid
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def __enter__(self):
+        if self.pid:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return False
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = _tree_rss(self.pid)
+            if rss:
+                self.samples.append([round(time.perf_counter() - self.started, 2), rss])
+            self._stop.wait(self.interval)
+
+
+class LoadClient:
+    """One closed-loop client: submit a job, poll it to completion, repeat."""
+
+    def __init__(self, base_url: str, mix: dict, topics: list, poll_interval: float, seed: int):
+        self.base_url = base_url.rstrip("/")
+        self.mix = mix
+        self.topics = topics
+        self.poll_interval = poll_interval
+        self.random = random.Random(seed)
+        self.session = requests.Session()
+        self.results = []
+
+    def run(self, deadline: float):
+        """Submit jobs until the deadline; the job in flight at the deadline is finished."""
+        while time.perf_counter() < deadline:
+            depth = self.random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+            self.results.append(self._job(self.random.choice(self.topics), depth))
+            if self.results[-1]["outcome"] == "rejected":
+                # Back off like a well-behaved client when the queue is full
+                time.sleep(self.poll_interval)
+
+    def _job(self, topic: str, depth: str) -> dict:
+        result = {"depth": depth, "outcome": "error", "latency_seconds": None,
+                  "queue_seconds": None, "run_seconds": None}
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/jobs", json={"topic": topic, "depth": depth}, timeout=30
+            )
+            if response.status_code == 429:
+                result["outcome"] = "rejected"
+                return result
+            response.raise_for_status()
+            job = response.json()
+            while job["status"] not in TERMINAL_STATUSES:
+                time.sleep(self.poll_interval)
+                response = self.session.get(f"{self.base_url}/api/jobs/{job['job_id']}", timeout=30)
+                response.raise_for_status()
+                job = response.json()
+        except (requests.RequestException, ValueError, KeyError):
+            return result
+
+        result["latency_seconds"] = time.perf_counter() - started
+        result["outcome"] = job["status"]
+        created = datetime.fromisoformat(job["created_at"])
+        if job["started_at"]:
+            result["queue_seconds"] = (datetime.fromisoformat(job["started_at"]) - created).total_seconds()
+            if job["completed_at"]:
+                result["run_seconds"] = (
+                    datetime.fromisoformat(job["completed_at"]) - datetime.fromisoformat(job["started_at"])
+                ).total_seconds()
+        return result
+
+
+def _distribution(values: list) -> Optional[dict]:
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3)
+    }
+
+
+def run_stage(base_url: str, concurrency: int, duration: float, mix: dict, topics: list,
+              poll_interval: float, seed: int = 0) -> dict:
+    """
+    Drive the API with closed-loop clients for one stage.
+
+    Args:
+        base_url: API root
+        concurrency: Number of concurrent clients
+        duration: Seconds during which clients submit new jobs
+        mix: {depth: weight} to draw depths from
+        topics: Topics to draw from
+        poll_interval: Seconds between job status polls
+        seed: Random seed of the first client
+
+    Returns:
+        Stage summary: counts, rates, throughput and latency, queue and run
+        time distributions
+    """
+    clients = [LoadClient(base_url, mix, topics, poll_interval, seed + i) for i in range(concurrency)]
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=client.run, args=(started + duration,), name=f"load-client-{i}", daemon=True)
+        for i, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = [result for client in clients for result in client.results]
+    completed = [result for result in results if result["outcome"] == "completed"]
+    rejected = sum(1 for result in results if result["outcome"] == "rejected")
+    errors = len(results) - len(completed) - rejected
+    return {
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": len(results),
+        "completed": len(completed),
+        "rejected_429": rejected,
+        "errors": errors,
+        "rejected_rate": round(rejected / len(results), 4) if results else 0.0,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "throughput_per_minute": round(len(completed) / elapsed * 60, 2),
+        "latency_seconds": _distribution([result["latency_seconds"] for result in completed]),
+        "queue_seconds": _distribution([result["queue_seconds"] for result in completed]),
+        "run_seconds": _distribution([result["run_seconds"] for result in completed])
+    }
+
+
+def find_ceiling(stages: list) -> Optional[int]:
+    """Concurrency after which throughput grows by less than CEILING_GAIN, or None if it kept growing."""
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["throughput_per_minute"] < previous["throughput_per_minute"] * CEILING_GAIN:
+            return previous["concurrency"]
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: Path, backend: StubBackend, max_concurrent: int, max_queued: int,
+                 workers: int = 1, timeout: float = 60.0) -> tuple:
+    """
+    Start api.py under uvicorn against the stub backend and wait until it is healthy.
+
+    Args:
+        workdir: Directory for the server's state, reports and log
+        backend: Running stub backend
+        max_concurrent: MAX_CONCURRENT_INVESTIGATIONS per worker process
+        max_queued: MAX_QUEUED_INVESTIGATIONS before 429
+        workers: Uvicorn worker processes
+        timeout: Seconds to wait for the health check
+
+    Returns:
+        Tuple of (process, base URL)
+    """
+    port = _free_port()
+    env = {
+        **os.environ,
+        **OFFLINE_ENV,
+        **backend.env(),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "stub",
+        "STATE_DIR": str(workdir / "state"),
+        "OUTPUT_DIR": str(workdir / "outputs"),
+        "MAX_CONCURRENT_INVESTIGATIONS": str(max_concurrent),
+        "MAX_QUEUED_INVESTIGATIONS": str(max_queued),
+        "TRACING_ENABLED": "false",
+        "VERBOSE": "false",
+    }
+    env.pop("INVESTIGATION_API_URL", None)
+    with open(workdir / "server.log", "wb") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with {process.returncode}; see {workdir / 'server.log'}")
+        try:
+            if requests.get(f"{base_url}/", timeout=1).ok:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"API server did not become healthy in {timeout:.0f}s; see {workdir / 'server.log'}")
+
+
+def print_results(console: Console, results: dict):
+    """Render load test stages as a table."""
+    table = Table(title="API load test")
+    for column in ("clients", "done", "jobs/min", "p50 s", "p95 s", "p99 s",
+                   "queue p50/p95 s", "run p50/p95 s", "429 %", "errors %"):
+        table.add_column(column, justify="right")
+    for stage in results["stages"]:
+        latency = stage["latency_seconds"] or {}
+        queue = stage["queue_seconds"] or {}
+        run = stage["run_seconds"] or {}
+        table.add_row(
+            str(stage["concurrency"]), str(stage["completed"]), f"{stage['throughput_per_minute']:.1f}",
+            *(f"{latency[key]:.2f}" if latency else "-" for key in ("p50", "p95", "p99")),
+            f"{queue['p50']:.2f} / {queue['p95']:.2f}" if queue else "-",
+            f"{run['p50']:.2f} / {run['p95']:.2f}" if run else "-",
+            f"{stage['rejected_rate']:.1%}", f"{stage['error_rate']:.1%}"
+        )
+    console.print(table)
+    rss = [bytes_ for _, bytes_ in results["server_rss"]]
+    if rss:
+        console.print(f"Server RSS: {rss[0] / 1e6:.0f} MB at start, {max(rss) / 1e6:.0f} MB peak, "
+                      f"{rss[-1] / 1e6:.0f} MB at end")
+    if results["ceiling_concurrency"]:
+        console.print(f"[bold]Throughput stops growing past {results['ceiling_concurrency']} "
+                      f"concurrent clients.[/bold]")
+    else:
+        console.print("Throughput grew at every stage; try higher concurrency.")
+
+
+def main(argv=None):
+    """Run the load test and write its results."""
+    parser = argparse.ArgumentParser(description="Load test the investigation API against a stub backend")
+    parser.add_argument("--url", help="Test a running API instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="PID of the --url server, to sample its RSS")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Client counts per stage (default 1,2,4,8)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of submissions per stage (default 30)")
+    parser.add_argument("--depths", default="quick=1,standard=2,comprehensive=1",
+                        help="Depth mix as depth=weight pairs")
+    parser.add_argument("--topics", type=int, default=5, help="Distinct topics; fewer means more repeats (default 5)")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between job polls")
+    parser.add_argument("--max-concurrent", type=int, default=3, help="Server MAX_CONCURRENT_INVESTIGATIONS")
+    parser.add_argument("--max-queued", type=int, default=50, help="Server MAX_QUEUED_INVESTIGATIONS")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub seconds to first token (default 0.2)")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Stub completion throughput")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Stub seconds per search")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    console = Console(stderr=args.json)
+    mix = parse_mix(args.depths)
+    topics = _topic_pool(args.topics)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    started_at = datetime.now().isoformat()
+    backend = process = None
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        try:
+            if args.url:
+                base_url, pid = args.url, args.server_pid
+            else:
+                backend = StubBackend(
+                    llm_latency=args.llm_latency,
+                    tokens_per_second=args.tokens_per_second,
+                    search_latency=args.search_latency
+                ).start()
+                process, base_url = start_server(Path(workdir), backend, args.max_concurrent,
+                                                 args.max_queued, args.workers)
+                pid = process.pid
+
+            stages = []
+            with RSSSampler(pid) as rss:
+                for concurrency in levels:
+                    console.print(f"Stage: {concurrency} client(s) for {args.duration:.0f}s...")
+                    stages.append(run_stage(base_url, concurrency, args.duration, mix, topics, args.poll_interval))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+            if backend is not None:
+                backend.stop()
+
+    results = {
+        "started_at": started_at,
+        "config": {
+            "url": args.url,
+            "concurrency": levels,
+            "duration_seconds": args.duration,
+            "depths": mix,
+            "topics": args.topics,
+            "max_concurrent": args.max_concurrent if not args.url else None,
+            "max_queued": args.max_queued if not args.url else None,
+            "workers": args.workers if not args.url else None,
+            "llm_latency": args.llm_latency,
+            "tokens_per_second": args.tokens_per_second,
+            "search_latency": args.search_latency
+        },
+        "stages": stages,
+        "ceiling_concurrency": find_ceiling(stages),
+        "server_rss": rss.samples
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(console, results)
+        if args.output:
+            console.print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
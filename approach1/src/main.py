@@ -1,5 +1,6 @@
 """Main entry point for the MCP Investigation Tool."""
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -7,10 +8,19 @@ from rich.console import Console
 from rich.prompt import Prompt
 
 from .crew import MCPInvestigationCrew
+from .estimator import InvestigationEstimator
 
 
 def main():
     """Main CLI interface for the investigation tool."""
+    parser = argparse.ArgumentParser(description="MCP Investigation Tool")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under the sampling profiler and save flamegraph, speedscope and summary files to logs/"
+    )
+    args = parser.parse_args()
+
     console = Console()
 
     # Print banner
@@ -43,12 +53,20 @@ def main():
         default="comprehensive"
     )
 
+    estimate = InvestigationEstimator().estimate(topic, depth)
+    cost = "unknown cost" if estimate["cost_usd"] is None else f"~${estimate['cost_usd']:.2f}"
+    console.print(
+        f"\n[dim]Estimate: ~{estimate['duration_seconds'] / 60:.0f} min, "
+        f"{estimate['prompt_tokens'] + estimate['completion_tokens']:,} tokens, {cost} "
+        f"(python -m src.estimator for details)[/dim]"
+    )
+
     console.print()
 
     # Run investigation
     try:
         crew = MCPInvestigationCrew(verbose=True)
-        crew.investigate(topic=topic, depth=depth)
+        crew.investigate(topic=topic, depth=depth, profile=args.profile or None)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Investigation cancelled by user[/yellow]")
@@ -0,0 +1,366 @@
+"""Offline replay of recorded investigations for benchmarking orchestration changes.
+
+Re-executes an investigation from its session log with the recorded tool
+results (and, by default, the recorded LLM responses) substituted, sleeping
+for the recorded latencies. Compares wall-clock time and token volume of the
+replay with the original run, without network access or API spend.
+
+Usage:
+    python -m src.replay logs/session_<id>_events.jsonl
+    python -m src.replay <events file> --latency-scale 0      # no simulated waits
+    python -m src.replay <events file> --live-llm             # real LLM, recorded tools
+    python -m src.replay <events file> --runs 5 --json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from rich.console import Console
+from rich.table import Table
+
+from .crew import PHASES, MCPInvestigationCrew
+from .utils.llm_usage import usage_summary
+from .utils.logging_config import read_session_events
+from .utils.tokenizer import count_tokens
+from .utils.tracing import message_chars
+
+
+class ReplayExhausted(RuntimeError):
+    """The replayed run made more LLM calls than were recorded."""
+
+
+class SessionRecording:
+    """The replayable parts of a session log: topic, LLM calls and tool calls."""
+
+    def __init__(self, events: list):
+        """
+        Initialize from session events.
+
+        Args:
+            events: Events as returned by read_session_events(with_payloads=True)
+        """
+        self.session_id = None
+        self.topic = None
+        self.depth = None
+        self.duration_seconds = None
+        self.llm_calls = []
+        self.tool_calls = []
+        for event in events:
+            kind = event.get("event_type")
+            self.session_id = self.session_id or event.get("session_id")
+            if kind == "investigation_start":
+                self.topic = event.get("topic")
+                self.depth = event.get("depth")
+            elif kind == "llm_call":
+                self.llm_calls.append(event)
+            elif kind == "tool_use":
+                self.tool_calls.append(event)
+            elif kind == "investigation_complete":
+                self.duration_seconds = event.get("duration_seconds")
+
+        if self.topic is None:
+            raise ValueError("Session log has no investigation_start event")
+
+    @classmethod
+    def load(cls, events_file: Path) -> "SessionRecording":
+        """Load a recording from a session_*_events.jsonl file."""
+        return cls(list(read_session_events(events_file, with_payloads=True)))
+
+    @property
+    def has_llm_responses(self) -> bool:
+        """Whether every recorded LLM call kept its response."""
+        return bool(self.llm_calls) and all(call.get("response") is not None for call in self.llm_calls)
+
+    @property
+    def missing_tool_results(self) -> int:
+        """Recorded tool calls without a stored result (sessions logged before results were kept)."""
+        return sum(1 for call in self.tool_calls if call.get("result") is None)
+
+
+class ReplayLLM(BaseLLM):
+    """
+    LLM that answers an agent's calls with its recorded responses, in order.
+
+    Completion tokens are the recorded ones. Prompt tokens are the recorded
+    count scaled by how much the replayed prompt grew or shrank, so changes
+    to prompts and context passing show up in the token volume.
+    """
+
+    def __init__(self, model: str, calls: list, latency_scale: float = 1.0):
+        """
+        Initialize the replay LLM.
+
+        Args:
+            model: Model name reported to hooks and usage accounting
+            calls: This agent's recorded llm_call events, in call order
+            latency_scale: Multiplier for the recorded latencies (0 disables waits)
+        """
+        super().__init__(model=model)
+        self.calls = deque(calls)
+        self.latency_scale = latency_scale
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None) -> Any:
+        if not self.calls:
+            raise ReplayExhausted(f"No recorded LLM responses left for model {self.model}")
+        recorded = self.calls.popleft()
+
+        delay = (recorded.get("latency_seconds") or 0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+        chars = message_chars(messages)
+        recorded_tokens = recorded.get("prompt_tokens") or 0
+        if recorded.get("prompt_chars") and recorded_tokens:
+            prompt_tokens = round(recorded_tokens * chars / recorded["prompt_chars"])
+        elif isinstance(messages, str):
+            prompt_tokens = count_tokens(messages, self.model)
+        else:
+            prompt_tokens = sum(
+                count_tokens(str(message.get("content") or ""), self.model) for message in messages
+            )
+        self._track_token_usage_internal({
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": recorded.get("completion_tokens") or 0,
+            "cached_prompt_tokens": recorded.get("cached_prompt_tokens") or 0
+        })
+        return recorded["response"]
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+class ToolReplayer:
+    """
+    Serves recorded tool results.
+
+    Calls are matched on tool name and exact input first, then on tool name
+    alone in recorded order, so a replay whose agents search differently
+    still gets plausible results.
+    """
+
+    def __init__(self, tool_calls: list, latency_scale: float = 1.0):
+        """
+        Initialize the tool replayer.
+
+        Args:
+            tool_calls: Recorded tool_use events
+            latency_scale: Multiplier for the recorded durations (0 disables waits)
+        """
+        self.latency_scale = latency_scale
+        self.by_input = defaultdict(deque)
+        self.by_tool = defaultdict(deque)
+        for call in tool_calls:
+            self.by_input[(call["tool"], call.get("query"))].append(call)
+            self.by_tool[call["tool"]].append(call)
+        self.calls = 0
+        self.misses = 0
+
+    def _take(self, tool: str, tool_input: str) -> Optional[dict]:
+        exact = bool(self.by_input.get((tool, tool_input)))
+        queue = self.by_input[(tool, tool_input)] if exact else self.by_tool.get(tool)
+        if not queue:
+            return None
+        call = queue.popleft()
+        # Keep the other index consistent so no recorded call is served twice
+        other = self.by_tool[tool] if exact else self.by_input[(tool, call.get("query"))]
+        for index, candidate in enumerate(other):
+            if candidate is call:
+                del other[index]
+                break
+        return call
+
+    def run(self, tool: str, tool_input: str) -> str:
+        """Return the recorded result of a tool call, after its recorded duration."""
+        self.calls += 1
+        recorded = self._take(tool, tool_input)
+        if recorded is None or recorded.get("result") is None:
+            self.misses += 1
+            return f"No recorded result for {tool} with input {tool_input}."
+        delay = (recorded.get("duration_seconds") or 0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return recorded["result"]
+
+    def wrap(self, tool):
+        """Copy a CrewAI tool (same name, description and schema) that replays instead of running."""
+        def replay(**kwargs):
+            return self.run(tool.name, str(kwargs))
+        return tool.model_copy(update={"func": replay})
+
+
+def replay_session(
+    recording: SessionRecording,
+    replay_llm: bool = True,
+    latency_scale: float = 1.0,
+    verbose: bool = False,
+    tracing: bool = False
+) -> dict:
+    """
+    Re-execute a recorded investigation with the current orchestration code.
+
+    Args:
+        recording: Session to replay
+        replay_llm: Answer LLM calls from the recording; False calls the real
+            models (tools are always replayed)
+        latency_scale: Multiplier for recorded LLM and tool latencies
+        verbose: CrewAI verbose output
+        tracing: Export a Chrome trace of the replay to logs/
+
+    Returns:
+        Dict with wall-clock seconds, LLM usage and tool-call counts of the replay
+
+    Raises:
+        ValueError: If replay_llm is set but the session kept no LLM responses
+        ReplayExhausted: If the replay needs more LLM calls than were recorded
+    """
+    if replay_llm and not recording.has_llm_responses:
+        raise ValueError(
+            f"Session {recording.session_id} has no recorded LLM responses; replay it with live LLMs"
+        )
+
+    crew = MCPInvestigationCrew(verbose=verbose, tracing=tracing, persist=False)
+    agents = [crew.mcp_researcher, crew.tech_analyst, crew.architect, crew.writer]
+    tools = ToolReplayer(recording.tool_calls, latency_scale)
+    for agent, (_, agent_name) in zip(agents, PHASES):
+        agent.tools = [tools.wrap(tool) for tool in agent.tools or []]
+        if replay_llm:
+            calls = [call for call in recording.llm_calls if call.get("agent") == agent_name]
+            agent.llm = ReplayLLM(getattr(agent.llm, "model", "replay"), calls, latency_scale)
+
+    started = time.perf_counter()
+    crew.investigate(topic=recording.topic, depth=recording.depth, profile=False)
+    return {
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "usage": crew.usage,
+        "tool_calls": tools.calls,
+        "tool_misses": tools.misses,
+        "trace_file": str(crew.trace_file) if crew.trace_file else None
+    }
+
+
+def compare(recording: SessionRecording, runs: list) -> dict:
+    """
+    Compare replay runs with the recorded session.
+
+    Args:
+        recording: The replayed session
+        runs: Results of replay_session()
+
+    Returns:
+        Dict with "recorded" and "replay" totals and per-phase LLM usage
+    """
+    recorded_usage = usage_summary(recording.llm_calls)
+    durations = [run["duration_seconds"] for run in runs]
+    last = runs[-1]["usage"]
+    return {
+        "session_id": recording.session_id,
+        "topic": recording.topic,
+        "depth": recording.depth,
+        "recorded": {
+            "duration_seconds": recording.duration_seconds,
+            "llm_calls": recorded_usage["calls"],
+            "tool_calls": len(recording.tool_calls),
+            "prompt_tokens": recorded_usage["prompt_tokens"],
+            "completion_tokens": recorded_usage["completion_tokens"],
+            "by_phase": recorded_usage["by_phase"]
+        },
+        "replay": {
+            "runs": len(runs),
+            "duration_seconds": statistics.median(durations),
+            "duration_seconds_min": min(durations),
+            "duration_seconds_max": max(durations),
+            "llm_calls": last["calls"],
+            "tool_calls": runs[-1]["tool_calls"],
+            "tool_misses": runs[-1]["tool_misses"],
+            "prompt_tokens": last["prompt_tokens"],
+            "completion_tokens": last["completion_tokens"],
+            "by_phase": last["by_phase"]
+        }
+    }
+
+
+def _delta(recorded, replayed) -> str:
+    if not recorded or replayed is None:
+        return "-"
+    return f"{(replayed - recorded) / recorded:+.1%}"
+
+
+def print_comparison(console: Console, result: dict):
+    """Render a replay comparison as tables."""
+    recorded, replay = result["recorded"], result["replay"]
+    totals = Table(title=f"Replay of session {result['session_id']} ({replay['runs']} run(s), median)")
+    for column in ("", "recorded", "replay", "change"):
+        totals.add_column(column, justify="left" if not column else "right")
+    for label, key in (("wall-clock s", "duration_seconds"), ("LLM calls", "llm_calls"),
+                       ("tool calls", "tool_calls"), ("prompt tokens", "prompt_tokens"),
+                       ("completion tokens", "completion_tokens")):
+        before, after = recorded[key], replay[key]
+        totals.add_row(label, "-" if before is None else f"{before:,.1f}".removesuffix(".0"),
+                       f"{after:,.1f}".removesuffix(".0"), _delta(before, after))
+    console.print(totals)
+
+    phases = Table(title="LLM usage by phase (recorded -> replay)")
+    for column in ("phase", "calls", "prompt tokens", "completion tokens", "LLM seconds"):
+        phases.add_column(column, justify="left" if column == "phase" else "right")
+    for phase, _ in PHASES:
+        before = recorded["by_phase"].get(phase, {})
+        after = replay["by_phase"].get(phase, {})
+        phases.add_row(phase, *(
+            f"{before.get(key, 0):,} -> {after.get(key, 0):,}"
+            for key in ("calls", "prompt_tokens", "completion_tokens", "latency_seconds")
+        ))
+    console.print(phases)
+    if replay["tool_misses"]:
+        console.print(f"[yellow]{replay['tool_misses']} tool call(s) had no recorded result.[/yellow]")
+
+
+def main(argv=None):
+    """Replay a recorded session and compare it with the original run."""
+    parser = argparse.ArgumentParser(description="Replay a recorded investigation offline")
+    parser.add_argument("events_file", type=Path, help="Session log (logs/session_<id>_events.jsonl)")
+    parser.add_argument("--live-llm", action="store_true",
+                        help="Call the configured models instead of replaying recorded responses")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier for recorded latencies (default 1.0; 0 for no waits)")
+    parser.add_argument("--runs", type=int, default=1, help="Number of replays to take the median of")
+    parser.add_argument("--trace", action="store_true", help="Export a Chrome trace of each replay to logs/")
+    parser.add_argument("--verbose", action="store_true", help="CrewAI verbose output")
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    console = Console(stderr=args.json)
+    recording = SessionRecording.load(args.events_file)
+    if recording.missing_tool_results:
+        console.print(f"[yellow]{recording.missing_tool_results} recorded tool call(s) have no stored "
+                      f"result; they replay as empty results.[/yellow]")
+
+    # Keep stdout clean for --json; crew progress output goes to stderr
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        runs = [
+            replay_session(
+                recording,
+                replay_llm=not args.live_llm,
+                latency_scale=args.latency_scale,
+                verbose=args.verbose,
+                tracing=args.trace
+            )
+            for _ in range(args.runs)
+        ]
+    result = compare(recording, runs)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_comparison(console, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Microbenchmark of search result parsing and formatting.
+
+Times how long the search tools take to parse a search API response and
+format it into tool output, and how many prompt tokens that output costs,
+in the full and compact (COMPACT_SEARCH_RESULTS) layouts. Inputs are the
+payloads in benchmarks/fixtures, scaled to:
+
+    small       one result
+    typical     the payload as stored
+    large       100 results
+    very-large  100 results with 10x longer text fields
+
+Runs without network access or API keys.
+
+Usage:
+    python -m src.search_benchmark
+    python -m src.search_benchmark --iterations 500 --json > benchmarks/search.json
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from .tools.formatting import format_code_results, format_ddg_results, format_repo_results, format_serper_results
+from .utils.tokenizer import count_tokens, tokenizer_name
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+# Tool -> (fixture file, formatter)
+TOOLS = {
+    "serper": ("serper_search.json", format_serper_results),
+    "duckduckgo": ("ddg_text.json", format_ddg_results),
+    "github_code": ("github_code_search.json", format_code_results),
+    "github_repos": ("github_repo_search.json", format_repo_results),
+}
+
+SIZES = ["small", "typical", "large", "very-large"]
+
+LARGE_RESULTS = 100
+
+# Text fields lengthened for the very-large payloads
+LONG_TEXT_FIELDS = ("snippet", "body", "description")
+LONG_TEXT_FACTOR = 10
+
+
+def _results(payload):
+    """Return the result list of a payload (DuckDuckGo payloads are the list)."""
+    if isinstance(payload, list):
+        return payload
+    return payload["organic"] if "organic" in payload else payload["items"]
+
+
+def _lengthen(value):
+    """Repeat the text fields of a result, including nested ones, LONG_TEXT_FACTOR times."""
+    if isinstance(value, dict):
+        return {
+            key: " ".join([item] * LONG_TEXT_FACTOR) if key in LONG_TEXT_FIELDS and isinstance(item, str)
+            else _lengthen(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_lengthen(item) for item in value]
+    return value
+
+
+def scale_payload(payload, size: str):
+    """
+    Build a payload of the given size from a stored fixture.
+
+    Args:
+        payload: Parsed fixture
+        size: One of SIZES
+
+    Returns:
+        New payload; the fixture is left unchanged
+    """
+    payload = copy.deepcopy(payload)
+    results = _results(payload)
+    if size == "small":
+        scaled = results[:1]
+    elif size == "typical":
+        scaled = results
+    elif size in ("large", "very-large"):
+        scaled = [copy.deepcopy(results[i % len(results)]) for i in range(LARGE_RESULTS)]
+        if size == "very-large":
+            scaled = _lengthen(scaled)
+    else:
+        raise ValueError(f"Unknown size: {size}")
+    results[:] = scaled
+    return payload
+
+
+def load_payloads(fixtures_dir: Path = FIXTURES_DIR) -> dict:
+    """Load the raw JSON text of every tool's payload at every size: {tool: {size: text}}."""
+    payloads = {}
+    for tool, (filename, _) in TOOLS.items():
+        fixture = json.loads((fixtures_dir / filename).read_text())
+        payloads[tool] = {size: json.dumps(scale_payload(fixture, size)) for size in SIZES}
+    return payloads
+
+
+def _median_seconds(function: Callable[[], object], iterations: int) -> float:
+    """Median wall time of a call over several iterations."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run_search_benchmark(
+    iterations: int = 200,
+    fixtures_dir: Path = FIXTURES_DIR,
+    model: Optional[str] = None
+) -> dict:
+    """
+    Benchmark parsing and formatting of every search tool's payloads.
+
+    Args:
+        iterations: Timed repetitions per measurement; the median is reported
+        fixtures_dir: Directory with the recorded payloads
+        model: Model whose tokenizer counts the output tokens
+
+    Returns:
+        Dict with the tokenizer name and one row per tool and size: payload
+        bytes and result count, parse time, and per layout (full, compact)
+        the format time in microseconds and output characters and tokens
+    """
+    rows = []
+    for tool, sizes in load_payloads(fixtures_dir).items():
+        formatter = TOOLS[tool][1]
+        for size, text in sizes.items():
+            data = json.loads(text)
+            row = {
+                "tool": tool,
+                "size": size,
+                "payload_bytes": len(text.encode()),
+                "results": len(_results(data)),
+                "parse_us": round(_median_seconds(lambda: json.loads(text), iterations) * 1e6, 2)
+            }
+            for layout, compact in (("full", False), ("compact", True)):
+                output = formatter(data, compact=compact)
+                row[layout] = {
+                    "format_us": round(_median_seconds(lambda: formatter(data, compact=compact), iterations) * 1e6, 2),
+                    "chars": len(output),
+                    "tokens": count_tokens(output, model)
+                }
+            rows.append(row)
+    return {
+        "iterations": iterations,
+        "tokenizer": tokenizer_name(model),
+        "rows": rows
+    }
+
+
+def token_savings(row: dict) -> float:
+    """Fraction of output tokens the compact layout saves for a row."""
+    full = row["full"]["tokens"]
+    return 1 - row["compact"]["tokens"] / full if full else 0.0
+
+
+def print_result(console: Console, result: dict):
+    """Render a search benchmark result as a table."""
+    table = Table(title=f"Search result formatting ({result['iterations']} iterations, times in µs, "
+                        f"tokens via {result['tokenizer']})")
+    for column in ("tool", "size", "KB", "n", "parse", "fmt", "fmt/c", "tok", "tok/c", "saved"):
+        table.add_column(column, justify="left" if column in ("tool", "size") else "right")
+    for row in result["rows"]:
+        table.add_row(
+            row["tool"],
+            row["size"],
+            f"{row['payload_bytes'] / 1024:.1f}",
+            str(row["results"]),
+            f"{row['parse_us']:.1f}",
+            f"{row['full']['format_us']:.1f}",
+            f"{row['compact']['format_us']:.1f}",
+            str(row["full"]["tokens"]),
+            str(row["compact"]["tokens"]),
+            f"{token_savings(row):.0%}"
+        )
+    console.print(table)
+    console.print("/c: compact layout (COMPACT_SEARCH_RESULTS=true)")
+
+
+def main(argv=None):
+    """Run the search microbenchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark parsing and formatting of search API responses")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed repetitions per measurement (default 200)")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Directory with the recorded payloads")
+    parser.add_argument("--model", help="Model whose tokenizer counts output tokens")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_search_benchmark(iterations=args.iterations, fixtures_dir=args.fixtures, model=args.model)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(Console(), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Settings schema for the MCP Investigation Tool.
+
+Import settings through src.config, which loads them on first use.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+    # API Keys
+    openai_api_key: str
+    serper_api_key: Optional[str] = None
+
+    # Model Configuration
+    # Using latest GPT-5.2 models (Dec 2025)
+    default_research_model: str = "gpt-5.2-instant"  # Fast for research/search tasks
+    default_analysis_model: str = "gpt-5.2-thinking"  # Reasoning for architecture/writing
+
+    # Output Settings
+    output_dir: Path = Path("outputs")  # Reports are saved under outputs/YYYY/MM/DD/
+    compress_reports: bool = False  # Store reports gzip-compressed (.md.gz)
+
+    # Agent Configuration
+    max_iterations: int = 5
+    verbose: bool = True
+    compact_search_results: bool = False  # One line per search result; fewer prompt tokens
+
+    # API Deployment
+    api_workers: int = 1  # >1 runs uvicorn in multi-process production mode
+    max_concurrent_investigations: int = 3  # Per worker process
+    max_queued_investigations: int = 50  # Queued jobs across all workers before 429
+    state_dir: Path = Path("state")  # Shared SQLite state for all worker processes
+    job_poll_interval: float = 0.5
+    job_lease_seconds: int = 60  # Running jobs without a heartbeat are marked failed
+    shutdown_timeout_seconds: int = 600  # Graceful drain window on shutdown
+    investigation_api_url: Optional[str] = None  # Gradio apps submit jobs here instead of running crews
+
+    # Cost and time budget
+    # USD per 1M input / output tokens, for the pre-flight estimator (JSON in MODEL_PRICES)
+    model_prices: dict = {
+        "gpt-5.2-instant": [1.75, 14.0],
+        "gpt-5.2-thinking": [1.75, 14.0],
+    }
+    max_request_cost_usd: Optional[float] = None  # Reject requests estimated above this
+    max_request_seconds: Optional[float] = None  # Reject requests estimated to run longer
+
+    # Observability
+    tracing_enabled: bool = True  # Write a Chrome trace per investigation to logs/
+    profile_investigations: bool = False  # Sampling profiler per run; artifacts in logs/
+
+    @property
+    def has_serper(self) -> bool:
+        """Check if Serper API key is configured."""
+        return bool(self.serper_api_key)
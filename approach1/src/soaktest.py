@@ -0,0 +1,408 @@
+"""Soak test of a long-running API process for memory and resource leaks.
+
+Runs hundreds of investigations, one after another, through the API's job
+worker (src.worker) in this process, against a local stub of the LLM and
+search APIs (see src.utils.stub_backend). Reports, logs and the job database
+go to a temporary working directory.
+
+After every --sample-every investigations it records RSS, memory traced by
+tracemalloc, open file descriptors, threads, loggers and logging handlers.
+The first --warmup investigations fill caches and are excluded. Over the
+rest it estimates growth per investigation and fails if any metric grows
+faster than its threshold. It also lists the allocation sites that grew
+most between the first and last sample.
+
+Usage:
+    python -m src.soaktest
+    python -m src.soaktest --investigations 500 --sample-every 25 --output logs/soak.json
+    python -m src.soaktest --max-rss-growth 200000 --max-traced-growth 50000
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from .benchmark import OFFLINE_ENV, TOPIC, _environment
+from .storage.jobs import TERMINAL_STATUSES
+from .utils.stub_backend import StubBackend
+
+
+# Allowed growth per investigation, by metric. Bounded caches (Rich's cell
+# widths, report hashes) still fill for a few hundred runs and stay below these.
+DEFAULT_THRESHOLDS = {
+    "rss_bytes": 100_000,
+    "traced_bytes": 20_000,
+    "open_fds": 0.02,
+    "threads": 0.02,
+    "loggers": 0.02,
+    "handlers": 0.02,
+}
+
+# Allocation sites reported
+TOP_SITES = 10
+
+# Frames of the harness and interpreter internals, left out of the allocation sites
+_IGNORED_SITES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def process_rss() -> Optional[int]:
+    """Resident memory of this process in bytes (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def open_fds() -> Optional[int]:
+    """Number of open file descriptors of this process, or None if unknown."""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def logging_counts() -> tuple:
+    """Number of registered loggers and of handlers attached to them."""
+    loggers = [logging.getLogger()] + [
+        logger for logger in list(logging.Logger.manager.loggerDict.values())
+        if isinstance(logger, logging.Logger)
+    ]
+    return len(loggers) - 1, sum(len(logger.handlers) for logger in loggers)
+
+
+def take_sample(investigations: int) -> dict:
+    """Collect garbage, then measure the process's memory and resources."""
+    gc.collect()
+    loggers, handlers = logging_counts()
+    return {
+        "investigations": investigations,
+        "rss_bytes": process_rss(),
+        "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+        "open_fds": open_fds(),
+        "threads": threading.active_count(),
+        "loggers": loggers,
+        "handlers": handlers,
+    }
+
+
+def _slope(points: list) -> float:
+    """
+    Theil-Sen slope: the median of the slopes between every pair of points.
+
+    Unlike a least-squares fit it ignores a few outliers, such as threads and
+    connections briefly left open while CrewAI's event handlers catch up.
+    """
+    return statistics.median(
+        (y2 - y1) / (x2 - x1)
+        for i, (x1, y1) in enumerate(points)
+        for x2, y2 in points[i + 1:]
+        if x2 != x1
+    )
+
+
+def growth_rates(samples: list) -> dict:
+    """
+    Estimate each metric's growth per investigation over a series of samples.
+
+    Args:
+        samples: take_sample() results in order
+
+    Returns:
+        {metric: growth per investigation}; metrics that were not measured
+        or have fewer than two samples are left out
+    """
+    rates = {}
+    for metric in DEFAULT_THRESHOLDS:
+        points = [(s["investigations"], s[metric]) for s in samples if s.get(metric) is not None]
+        if len({x for x, _ in points}) < 2:
+            continue
+        rates[metric] = round(_slope(points), 4)
+    return rates
+
+
+def find_leaks(rates: dict, thresholds: dict) -> list:
+    """Describe the metrics that grew faster per investigation than allowed."""
+    return [
+        f"{metric}: {rate:+,.2f} per investigation (limit {thresholds[metric]:,})"
+        for metric, rate in rates.items()
+        if metric in thresholds and rate > thresholds[metric]
+    ]
+
+
+def _site_name(filename: str) -> str:
+    """Shorten a source path to its module path, e.g. crewai/task.py."""
+    prefixes = [path for path in sys.path if path and filename.startswith(path.rstrip(os.sep) + os.sep)]
+    return os.path.relpath(filename, max(prefixes, key=len)) if prefixes else filename
+
+
+def top_growth(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int = TOP_SITES) -> list:
+    """The allocation sites whose traced memory grew most between two snapshots."""
+    stats = after.filter_traces(_IGNORED_SITES).compare_to(before.filter_traces(_IGNORED_SITES), "lineno")
+    return [
+        {
+            "site": f"{_site_name(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_diff_bytes": stat.size_diff,
+            "count_diff": stat.count_diff,
+        }
+        for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[:limit]
+        if stat.size_diff > 0
+    ]
+
+
+@contextmanager
+def _working_directory(path: Path):
+    """Change the working directory for the duration of the block."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _clear_cached_stores():
+    """
+    Forget the settings and the process-wide stores.
+
+    Stores are cached by path, and OUTPUT_DIR, STATE_DIR and logs/ are
+    relative, so stores opened before the working directory changed would
+    be served for the soak's directory (and the soak's after it is deleted).
+    """
+    from .config import get_settings
+    from .estimator import get_estimator
+    from .storage.artifacts import get_artifact_store
+    from .storage.blobs import get_blob_store
+    from .storage.metrics import get_metrics_store
+    from .storage.report_index import get_report_index
+
+    for cached in (get_settings, get_estimator, get_artifact_store, get_blob_store,
+                   get_metrics_store, get_report_index):
+        cached.cache_clear()
+
+
+def _wait(store, job_id: str, timeout: float) -> dict:
+    """Poll a job until it reaches a terminal status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] in TERMINAL_STATUSES:
+            return job
+        time.sleep(0.01)
+    raise TimeoutError(f"Job {job_id} did not finish within {timeout:.0f}s")
+
+
+def run_soak(
+    investigations: int = 200,
+    warmup: int = 20,
+    sample_every: int = 10,
+    depth: str = "quick",
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    trace_memory: bool = True,
+    job_timeout: float = 120.0,
+    thresholds: Optional[dict] = None,
+    on_sample=None
+) -> dict:
+    """
+    Run investigations back to back through the job worker and track growth.
+
+    Args:
+        investigations: Investigations after the warm-up
+        warmup: Untracked investigations run first to fill caches
+        sample_every: Investigations between samples
+        depth: Investigation depth
+        llm_latency: Stub seconds before each completion
+        search_latency: Stub seconds per search request
+        trace_memory: Track Python allocations with tracemalloc; slower, but
+            measures traced_bytes and finds the growing allocation sites
+        job_timeout: Seconds to wait for each investigation
+        thresholds: Allowed growth per investigation by metric; defaults to
+            DEFAULT_THRESHOLDS
+        on_sample: Called with each sample as it is taken
+
+    Returns:
+        Dict with the config, samples, growth per investigation, leaks (the
+        metrics above their threshold), top growing allocation sites and
+        failed job count
+    """
+    from .storage.jobs import JobStore
+    from .worker import InvestigationWorker
+
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    backend = StubBackend(llm_latency=llm_latency, search_latency=search_latency)
+    environment = {
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "stub",
+        # CrewAI keys its user data by working directory name; keep this project's
+        "CREWAI_STORAGE_DIR": os.environ.get("CREWAI_STORAGE_DIR") or Path.cwd().name,
+        "MAX_CONCURRENT_INVESTIGATIONS": "1",
+        "JOB_POLL_INTERVAL": "0.01",
+        **OFFLINE_ENV,
+        **backend.env()
+    }
+    samples = []
+    failed = 0
+    first_snapshot = last_snapshot = None
+
+    with tempfile.TemporaryDirectory(prefix="soak-") as workdir, backend, \
+            _environment(environment), _working_directory(Path(workdir)):
+        _clear_cached_stores()
+        store = JobStore(Path("state") / "jobs.db")
+        worker = InvestigationWorker(store)
+        worker.start()
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        try:
+            for number in range(1, warmup + investigations + 1):
+                job = _wait(store, store.submit(TOPIC, depth)["id"], job_timeout)
+                if job["status"] != "completed":
+                    failed += 1
+
+                done = number - warmup
+                if done == 0 and started_tracing:
+                    tracemalloc.start()
+                if done < 0 or done % sample_every and done != investigations:
+                    continue
+                sample = take_sample(done)
+                samples.append(sample)
+                if on_sample:
+                    on_sample(sample)
+                if tracemalloc.is_tracing():
+                    last_snapshot = tracemalloc.take_snapshot()
+                    first_snapshot = first_snapshot or last_snapshot
+        finally:
+            worker.drain()
+            if started_tracing:
+                tracemalloc.stop()
+            _clear_cached_stores()
+
+    rates = growth_rates(samples)
+    return {
+        "config": {
+            "investigations": investigations,
+            "warmup": warmup,
+            "sample_every": sample_every,
+            "depth": depth,
+            "llm_latency": llm_latency,
+            "search_latency": search_latency,
+            "trace_memory": trace_memory,
+            "thresholds": thresholds
+        },
+        "samples": samples,
+        "growth_per_investigation": rates,
+        "leaks": find_leaks(rates, thresholds),
+        "top_growth": top_growth(first_snapshot, last_snapshot) if first_snapshot else [],
+        "failed_jobs": failed
+    }
+
+
+def print_result(console: Console, result: dict):
+    """Render a soak test result: samples, growth rates and allocation sites."""
+    config = result["config"]
+    table = Table(title=f"Soak test ({config['investigations']} {config['depth']} investigations "
+                        f"after {config['warmup']} warm-up)")
+    for column in ("investigations", "RSS MB", "traced MB", "fds", "threads", "loggers", "handlers"):
+        table.add_column(column, justify="right")
+    for sample in result["samples"]:
+        table.add_row(
+            str(sample["investigations"]),
+            f"{sample['rss_bytes'] / 1e6:.1f}" if sample["rss_bytes"] is not None else "-",
+            f"{sample['traced_bytes'] / 1e6:.2f}" if sample["traced_bytes"] is not None else "-",
+            *(str(sample[key]) if sample[key] is not None else "-"
+              for key in ("open_fds", "threads", "loggers", "handlers"))
+        )
+    console.print(table)
+
+    thresholds = config["thresholds"]
+    console.print("Growth per investigation: " + ", ".join(
+        f"{metric} {rate:+,.2f} (limit {thresholds[metric]:,})"
+        for metric, rate in result["growth_per_investigation"].items()
+    ))
+    if result["top_growth"]:
+        sites = Table(title="Top growing allocation sites")
+        for column in ("site", "bytes", "blocks"):
+            sites.add_column(column, justify="left" if column == "site" else "right")
+        for site in result["top_growth"]:
+            sites.add_row(site["site"], f"{site['size_diff_bytes']:+,}", f"{site['count_diff']:+,}")
+        console.print(sites)
+    if result["failed_jobs"]:
+        console.print(f"[yellow]{result['failed_jobs']} investigation(s) did not complete[/yellow]")
+
+
+def main(argv=None):
+    """Run the soak test and exit with status 1 if a metric grows too fast."""
+    parser = argparse.ArgumentParser(description="Soak test the job worker for memory and resource leaks")
+    parser.add_argument("--investigations", type=int, default=200, help="Tracked investigations (default 200)")
+    parser.add_argument("--warmup", type=int, default=20, help="Untracked investigations first (default 20)")
+    parser.add_argument("--sample-every", type=int, default=10, help="Investigations between samples (default 10)")
+    parser.add_argument("--depth", default="quick", choices=["quick", "standard", "comprehensive"])
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub seconds per completion (default 0)")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Stub seconds per search (default 0)")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="Skip allocation tracing: faster, but no traced memory or allocation sites")
+    for metric, default in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--max-{metric.replace('_bytes', '').replace('_', '-')}-growth", dest=metric,
+                            type=float, default=default, metavar="N",
+                            help=f"Allowed {metric} growth per investigation (default {default:,})")
+    parser.add_argument("--output", type=Path, help="Also write the result as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    console = Console(stderr=args.json)
+
+    def on_sample(sample: dict):
+        console.print(f"{sample['investigations']} investigations: "
+                      f"RSS {(sample['rss_bytes'] or 0) / 1e6:.1f} MB, {sample['open_fds']} fds, "
+                      f"{sample['handlers']} handlers", highlight=False)
+
+    # Keep stdout clean for --json; crew progress output goes to stderr
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        result = run_soak(
+            investigations=args.investigations,
+            warmup=args.warmup,
+            sample_every=args.sample_every,
+            depth=args.depth,
+            llm_latency=args.llm_latency,
+            search_latency=args.search_latency,
+            trace_memory=not args.no_tracemalloc,
+            thresholds={metric: getattr(args, metric) for metric in DEFAULT_THRESHOLDS},
+            on_sample=None if args.json else on_sample
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_result(console, result)
+
+    for leak in result["leaks"]:
+        console.print(f"[bold red]Leak:[/bold red] {leak}")
+    if result["leaks"]:
+        sys.exit(1)
+    console.print("[green]No growth above the thresholds.[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""Indexed store of session log metrics for cross-session performance analytics."""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..utils.logging_config import read_session_events
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    topic TEXT,
+    depth TEXT,
+    date TEXT,
+    started_at TEXT,
+    status TEXT NOT NULL,
+    duration_seconds REAL,
+    tool_calls INTEGER NOT NULL,
+    llm_calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    prompt_chars INTEGER NOT NULL,
+    output_chars INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_depth_date ON sessions (depth, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date);
+CREATE TABLE IF NOT EXISTS phases (
+    session_id TEXT NOT NULL,
+    phase_num INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    model TEXT,
+    duration_seconds REAL,
+    tool_calls INTEGER NOT NULL,
+    llm_calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    prompt_chars INTEGER NOT NULL,
+    output_chars INTEGER NOT NULL,
+    PRIMARY KEY (session_id, phase_num)
+);
+CREATE INDEX IF NOT EXISTS idx_phases_model ON phases (model);
+"""
+
+def summarize_session(events: list) -> Optional[dict]:
+    """
+    Reduce a session's events to per-session and per-phase metrics.
+
+    Phases run from their phase_start event to the next phase start or the
+    end of the investigation.
+
+    Args:
+        events: Events of one session in logged order
+
+    Returns:
+        Dict with the session row and a "phases" list, or None for an empty log
+    """
+    if not events:
+        return None
+
+    session = {
+        "session_id": events[0].get("session_id"),
+        "topic": None,
+        "depth": None,
+        "started_at": events[0].get("timestamp"),
+        "status": "incomplete",
+        "duration_seconds": None,
+        "tool_calls": 0,
+        "llm_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "prompt_chars": 0,
+        "output_chars": 0
+    }
+    phases = {}
+    end_time = None
+
+    # phase_start events name the phases; LLM and tool events refer to them by name
+    names_by_num = {}
+    for event in events:
+        if event.get("event_type") == "phase_start":
+            names_by_num[event["phase"]] = event["phase_name"]
+    names = {name: num for num, name in names_by_num.items()}
+
+    def phase_for(num: Optional[int] = None, name: Optional[str] = None) -> Optional[dict]:
+        if num is None and name is not None:
+            num = names.get(name)
+        if num is None:
+            return None
+        return phases.setdefault(num, {
+            "phase_num": num,
+            "phase": names_by_num.get(num, f"Phase {num}"),
+            "models": set(),
+            "start": None,
+            "tool_calls": 0,
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "prompt_chars": 0,
+            "output_chars": 0
+        })
+
+    for event in events:
+        kind = event.get("event_type")
+        if kind == "investigation_start":
+            session["topic"] = event.get("topic")
+            session["depth"] = event.get("depth")
+            session["started_at"] = event.get("timestamp")
+        elif kind == "phase_start":
+            phase_for(event["phase"])["start"] = event["timestamp"]
+        elif kind in ("agent_prompt", "agent_output"):
+            task_id = str(event.get("task_id", ""))
+            phase = phase_for(int(task_id[4:])) if task_id[4:].isdigit() else None
+            key, length = (
+                ("prompt_chars", event.get("prompt_length", 0)) if kind == "agent_prompt"
+                else ("output_chars", event.get("output_length", 0))
+            )
+            session[key] += length
+            if phase:
+                phase[key] += length
+        elif kind == "tool_use":
+            session["tool_calls"] += 1
+            phase = phase_for(name=event.get("phase"))
+            if phase:
+                phase["tool_calls"] += 1
+        elif kind == "llm_call":
+            session["llm_calls"] += 1
+            session["prompt_tokens"] += event.get("prompt_tokens", 0)
+            session["completion_tokens"] += event.get("completion_tokens", 0)
+            phase = phase_for(name=event.get("phase"))
+            if phase:
+                phase["llm_calls"] += 1
+                phase["prompt_tokens"] += event.get("prompt_tokens", 0)
+                phase["completion_tokens"] += event.get("completion_tokens", 0)
+                if event.get("model"):
+                    phase["models"].add(event["model"])
+        elif kind == "investigation_cancelled":
+            session["status"] = "cancelled"
+            end_time = end_time or event["timestamp"]
+        elif kind == "investigation_complete":
+            if session["status"] != "cancelled":
+                session["status"] = "completed" if event.get("success") else "failed"
+            session["duration_seconds"] = event.get("duration_seconds")
+            end_time = end_time or event["timestamp"]
+
+    end_time = end_time or events[-1].get("timestamp")
+    ordered = sorted(phases.values(), key=lambda p: p["phase_num"])
+    for phase, following in zip(ordered, ordered[1:] + [None]):
+        phase_end = following["start"] if following and following["start"] else end_time
+        phase["duration_seconds"] = (
+            _seconds_between(phase["start"], phase_end) if phase["start"] and phase_end else None
+        )
+        phase["model"] = ",".join(sorted(phase.pop("models"))) or None
+        del phase["start"]
+
+    if session["duration_seconds"] is None and session["status"] != "incomplete":
+        session["duration_seconds"] = _seconds_between(session["started_at"], end_time)
+    session["date"] = session["started_at"][:10] if session["started_at"] else None
+    session["phases"] = ordered
+    return session
+
+
+def _seconds_between(start: str, end: str) -> float:
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def percentile(values: list, q: float) -> Optional[float]:
+    """Linearly interpolated percentile (q in 0..100) of a list of numbers."""
+    if not values:
+        return None
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+class SessionAnalytics:
+    """
+    Local index of session logs for performance analytics.
+
+    ingest() only parses session files that are new or changed since the
+    last run, so re-running it over a large logs/ directory is cheap.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the analytics store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def ingest(self, logs_dir: Path) -> int:
+        """
+        Index new and changed session logs.
+
+        Args:
+            logs_dir: Directory containing session_*_events.jsonl files
+
+        Returns:
+            Number of session files (re)indexed
+        """
+        conn = self._connect()
+        known = {
+            row["path"]: (row["size"], row["mtime_ns"])
+            for row in conn.execute("SELECT * FROM ingested_files")
+        }
+        ingested = 0
+        for path in sorted(Path(logs_dir).glob("session_*_events.json*")):
+            stat = path.stat()
+            if known.get(str(path)) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            session = summarize_session(list(read_session_events(path)))
+            self._store(path, stat, session)
+            ingested += 1
+        return ingested
+
+    def _store(self, path: Path, stat, session: Optional[dict]) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if session and session["session_id"]:
+                conn.execute("DELETE FROM phases WHERE session_id = ?", (session["session_id"],))
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, path, topic, depth, date, started_at, "
+                    "status, duration_seconds, tool_calls, llm_calls, prompt_tokens, completion_tokens, "
+                    "prompt_chars, output_chars) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        session["session_id"], str(path), session["topic"], session["depth"],
+                        session["date"], session["started_at"], session["status"],
+                        session["duration_seconds"], session["tool_calls"], session["llm_calls"],
+                        session["prompt_tokens"], session["completion_tokens"],
+                        session["prompt_chars"], session["output_chars"]
+                    )
+                )
+                conn.executemany(
+                    "INSERT INTO phases (session_id, phase_num, phase, model, duration_seconds, "
+                    "tool_calls, llm_calls, prompt_tokens, completion_tokens, prompt_chars, output_chars) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            session["session_id"], p["phase_num"], p["phase"], p["model"],
+                            p["duration_seconds"], p["tool_calls"], p["llm_calls"], p["prompt_tokens"],
+                            p["completion_tokens"], p["prompt_chars"], p["output_chars"]
+                        )
+                        for p in session["phases"]
+                    ]
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def report(
+        self,
+        group_by: Optional[str] = None,
+        depth: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> list:
+        """
+        Aggregate indexed sessions into duration percentiles and rates.
+
+        Args:
+            group_by: Slice results by "depth", "model" or "date"
+            depth: Only sessions of this depth
+            model: Only sessions (and phases) that used this model
+            since: Only sessions started on or after this date (YYYY-MM-DD)
+            until: Only sessions started before this date (YYYY-MM-DD)
+
+        Returns:
+            One dict per group with session and per-phase statistics
+        """
+        clauses = []
+        params = []
+        if depth:
+            clauses.append("s.depth = ?")
+            params.append(depth)
+        if since:
+            clauses.append("s.date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("s.date < ?")
+            params.append(until)
+        if model:
+            clauses.append("s.session_id IN (SELECT session_id FROM phases WHERE model LIKE ?)")
+            params.append(f"%{model}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connect()
+        sessions = [dict(row) for row in conn.execute(f"SELECT s.* FROM sessions s {where}", params)]
+        phase_rows = [
+            dict(row) for row in conn.execute(
+                f"SELECT p.*, s.depth, s.date FROM phases p JOIN sessions s USING (session_id) {where} "
+                "ORDER BY p.phase_num",
+                params
+            )
+        ]
+        if model:
+            phase_rows = [row for row in phase_rows if model in (row["model"] or "")]
+
+        def key(row):
+            return (row.get(group_by) or "unknown") if group_by else "all"
+
+        groups = {}
+        if group_by == "model":
+            # A session belongs to every model it used
+            models_by_session = {}
+            for row in phase_rows:
+                for name in (row["model"] or "unknown").split(","):
+                    models_by_session.setdefault(row["session_id"], set()).add(name)
+            for session in sessions:
+                for name in models_by_session.get(session["session_id"], {"unknown"}):
+                    groups.setdefault(name, ([], []))[0].append(session)
+            for row in phase_rows:
+                for name in (row["model"] or "unknown").split(","):
+                    groups.setdefault(name, ([], []))[1].append(row)
+        else:
+            for session in sessions:
+                groups.setdefault(key(session), ([], []))[0].append(session)
+            for row in phase_rows:
+                groups.setdefault(key(row), ([], []))[1].append(row)
+
+        return [
+            _group_stats(name, group_sessions, group_phases)
+            for name, (group_sessions, group_phases) in sorted(groups.items())
+        ]
+
+
+    def phase_history(self, depth: Optional[str] = None) -> dict:
+        """
+        Mean LLM calls, tokens and duration per phase over completed sessions.
+
+        Args:
+            depth: Only sessions of this depth
+
+        Returns:
+            Dict of phase name -> {"sessions", "llm_calls", "prompt_tokens",
+            "completion_tokens", "duration_seconds"}
+        """
+        where = "WHERE s.status = 'completed' AND p.llm_calls > 0"
+        params = []
+        if depth:
+            where += " AND s.depth = ?"
+            params.append(depth)
+        rows = self._connect().execute(
+            "SELECT p.phase, COUNT(*) AS sessions, AVG(p.llm_calls) AS llm_calls, "
+            "AVG(p.prompt_tokens) AS prompt_tokens, AVG(p.completion_tokens) AS completion_tokens, "
+            "AVG(p.duration_seconds) AS duration_seconds "
+            f"FROM phases p JOIN sessions s USING (session_id) {where} GROUP BY p.phase",
+            params
+        ).fetchall()
+        return {row["phase"]: dict(row) for row in rows}
+
+    def model_rates(self) -> dict:
+        """
+        Per-model throughput fitted over the phases of completed sessions.
+
+        Fits phase duration = a * prompt tokens + b * completion tokens by
+        least squares over phases that used a single model, so a and b
+        include the tool and framework time that comes with those tokens.
+
+        Returns:
+            Dict of model -> {"phases", "seconds_per_prompt_token",
+            "seconds_per_completion_token"}; models without a usable fit
+            are left out
+        """
+        rows = self._connect().execute(
+            "SELECT p.model, p.prompt_tokens, p.completion_tokens, p.duration_seconds "
+            "FROM phases p JOIN sessions s USING (session_id) "
+            "WHERE s.status = 'completed' AND p.model IS NOT NULL AND p.model NOT LIKE '%,%' "
+            "AND p.duration_seconds > 0 AND p.completion_tokens > 0"
+        ).fetchall()
+        by_model = {}
+        for row in rows:
+            by_model.setdefault(row["model"], []).append(
+                (row["prompt_tokens"], row["completion_tokens"], row["duration_seconds"])
+            )
+
+        rates = {}
+        for model, samples in by_model.items():
+            pp = sum(p * p for p, _, _ in samples)
+            pc = sum(p * c for p, c, _ in samples)
+            cc = sum(c * c for _, c, _ in samples)
+            pd = sum(p * d for p, _, d in samples)
+            cd = sum(c * d for _, c, d in samples)
+            det = pp * cc - pc * pc
+            a = (pd * cc - cd * pc) / det if det else 0.0
+            b = (pp * cd - pc * pd) / det if det else 0.0
+            if a < 0 or b <= 0:
+                # Too few or collinear samples; attribute all time to output tokens
+                a = 0.0
+                b = sum(d for _, _, d in samples) / sum(c for _, c, _ in samples)
+            rates[model] = {
+                "phases": len(samples),
+                "seconds_per_prompt_token": a,
+                "seconds_per_completion_token": b
+            }
+        return rates
+
+
+def _distribution(values: list) -> dict:
+    values = [v for v in values if v is not None]
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99)
+    }
+
+
+def _mean(values: list) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def _group_stats(name: str, sessions: list, phases: list) -> dict:
+    finished = [s for s in sessions if s["status"] != "incomplete"]
+    failed = [s for s in finished if s["status"] == "failed"]
+    by_phase = {}
+    for row in phases:
+        by_phase.setdefault((row["phase_num"], row["phase"]), []).append(row)
+
+    return {
+        "group": name,
+        "sessions": len(sessions),
+        "completed": sum(1 for s in sessions if s["status"] == "completed"),
+        "cancelled": sum(1 for s in sessions if s["status"] == "cancelled"),
+        "failure_rate": len(failed) / len(finished) if finished else None,
+        "duration_seconds": _distribution([s["duration_seconds"] for s in sessions if s["status"] == "completed"]),
+        "tool_calls": _mean([s["tool_calls"] for s in sessions]),
+        "prompt_chars": _mean([s["prompt_chars"] for s in sessions]),
+        "output_chars": _mean([s["output_chars"] for s in sessions]),
+        "phases": [
+            {
+                "phase": phase,
+                "count": len(rows),
+                "duration_seconds": _distribution([r["duration_seconds"] for r in rows]),
+                "tool_calls": _mean([r["tool_calls"] for r in rows]),
+                "prompt_chars": _mean([r["prompt_chars"] for r in rows]),
+                "output_chars": _mean([r["output_chars"] for r in rows])
+            }
+            for (_, phase), rows in sorted(by_phase.items())
+        ]
+    }
@@ -0,0 +1,161 @@
+"""Report artifact store: uniquely named, atomically written reports with metadata sidecars."""
+
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+METADATA_SUFFIX = ".meta.json"
+
+
+def read_report(path: Path) -> str:
+    """Return the text of a report file, decompressing .gz artifacts."""
+    data = Path(path).read_bytes()
+    if Path(path).suffix == ".gz":
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="replace")
+
+
+def _write_atomic(path: Path, data: bytes):
+    # Write-then-rename so readers never see a partial file
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ReportArtifact:
+    """
+    A saved report: its text, where it was written and its metadata.
+
+    str() of an artifact is the report text, so callers that only need the
+    markdown can treat the return value of investigate() as before. Reports
+    that were not persisted (replays, benchmarks) have no path or metadata.
+    """
+
+    def __init__(self, content: str, path: Optional[Path] = None, metadata: Optional[dict] = None):
+        self.content = content
+        self.path = path
+        self.metadata = metadata or {}
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.metadata.get("id")
+
+    @property
+    def filename(self) -> Optional[str]:
+        """Path relative to the output directory, as used by the report index and API."""
+        return self.metadata.get("filename")
+
+    @property
+    def metadata_path(self) -> Optional[Path]:
+        return self.path.with_name(f"{self.id}{METADATA_SUFFIX}") if self.path else None
+
+    def __str__(self) -> str:
+        return self.content
+
+    def __repr__(self) -> str:
+        return f"ReportArtifact(id={self.id!r}, path={self.path!r})"
+
+
+class ArtifactStore:
+    """
+    Reports saved under <output_dir>/YYYY/MM/DD/ with a JSON sidecar each.
+
+    Every report gets a unique ID (topic, second and a random suffix), so
+    concurrent runs on the same topic never overwrite each other. The report
+    is written before its sidecar, both with write-then-rename: a sidecar
+    only exists for a complete report.
+    """
+
+    def __init__(self, output_dir: Path, compress: bool = False):
+        """
+        Initialize the artifact store.
+
+        Args:
+            output_dir: Root directory of the reports
+            compress: Store reports gzip-compressed (.md.gz)
+        """
+        self.output_dir = Path(output_dir)
+        self.compress = compress
+
+    @staticmethod
+    def new_id(topic: str, when: datetime) -> str:
+        """Return a unique artifact ID: investigation_<topic>_<YYYYmmdd_HHMMSS>_<random>."""
+        safe_topic = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in topic)
+        safe_topic = safe_topic.strip().replace(' ', '_')[:50]
+        return f"investigation_{safe_topic}_{when:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+
+    def save(
+        self,
+        content: str,
+        topic: str,
+        depth: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        token_usage: Optional[dict] = None,
+        session_id: Optional[str] = None
+    ) -> ReportArtifact:
+        """
+        Save a report and its metadata sidecar.
+
+        Args:
+            content: Report markdown
+            topic: Investigation topic
+            depth: Investigation depth
+            started_at: When the investigation started
+            token_usage: Token usage totals for the run
+            session_id: Session (or run) ID of the investigation
+
+        Returns:
+            Handle to the saved report
+        """
+        completed_at = datetime.now()
+        artifact_id = self.new_id(topic, completed_at)
+        shard = self.output_dir / f"{completed_at:%Y}" / f"{completed_at:%m}" / f"{completed_at:%d}"
+        shard.mkdir(parents=True, exist_ok=True)
+
+        data = content.encode("utf-8")
+        path = shard / f"{artifact_id}.md"
+        if self.compress:
+            path = path.with_name(f"{path.name}.gz")
+            _write_atomic(path, gzip.compress(data, compresslevel=6, mtime=0))
+        else:
+            _write_atomic(path, data)
+
+        metadata = {
+            "id": artifact_id,
+            "filename": path.relative_to(self.output_dir).as_posix(),
+            "topic": topic,
+            "depth": depth,
+            "session_id": session_id,
+            "started_at": started_at.isoformat() if started_at else None,
+            "completed_at": completed_at.isoformat(),
+            "duration_seconds": (completed_at - started_at).total_seconds() if started_at else None,
+            "token_usage": token_usage or {},
+            "size_bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "compressed": self.compress
+        }
+        artifact = ReportArtifact(content, path, metadata)
+        _write_atomic(artifact.metadata_path, json.dumps(metadata, indent=2).encode("utf-8"))
+        return artifact
+
+    def artifacts(self) -> Iterator[ReportArtifact]:
+        """Yield the saved artifacts (metadata only; content is not read)."""
+        for sidecar in self.output_dir.glob(f"*/*/*/*{METADATA_SUFFIX}"):
+            try:
+                metadata = json.loads(sidecar.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            yield ReportArtifact("", self.output_dir / metadata["filename"], metadata)
+
+
+@lru_cache(maxsize=None)
+def get_artifact_store(output_dir: Path, compress: bool = False) -> ArtifactStore:
+    """Return the process-wide artifact store for an output directory."""
+    return ArtifactStore(output_dir, compress=compress)
@@ -0,0 +1,105 @@
+"""Compressed, content-addressed store for large logged payloads."""
+
+import gzip
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+# Digests remembered as stored per store, so repeated payloads skip the disk check
+KNOWN_DIGESTS = 4096
+
+
+def blob_digest(text: str) -> str:
+    """Return the content address (sha256 hex) of a payload."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """
+    Payloads stored once per distinct content, compressed.
+
+    Blobs live at <root>/<first two hex digits>/<sha256>.zst (or .gz when
+    zstandard is not installed), so identical prompts and outputs logged by
+    many events or sessions take the disk space of one.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the blob store.
+
+        Args:
+            root: Directory holding the blobs
+        """
+        self.root = Path(root)
+        self._known = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.{suffix}"
+
+    def put(self, text: str, digest: Optional[str] = None) -> str:
+        """
+        Store a payload unless it is already present.
+
+        Args:
+            text: Payload to store
+            digest: Precomputed blob_digest(text)
+
+        Returns:
+            Content address of the payload
+        """
+        digest = digest or blob_digest(text)
+        with self._lock:
+            if digest in self._known:
+                self._known.move_to_end(digest)
+                return digest
+
+        suffix = "zst" if zstandard else "gz"
+        path = self._path(digest, suffix)
+        if not path.exists() and not self._path(digest, "gz").exists():
+            data = text.encode("utf-8")
+            if zstandard:
+                compressed = zstandard.ZstdCompressor(level=10).compress(data)
+            else:
+                compressed = gzip.compress(data, compresslevel=6, mtime=0)
+
+            # Write-then-rename so readers never see a partial blob
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+
+        with self._lock:
+            self._known[digest] = None
+            if len(self._known) > KNOWN_DIGESTS:
+                self._known.popitem(last=False)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """Return a stored payload, or None if it is missing."""
+        path = self._path(digest, "zst")
+        if path.exists():
+            if zstandard is None:
+                raise RuntimeError(f"Blob {digest} is zstd-compressed; install zstandard to read it")
+            return zstandard.ZstdDecompressor().decompress(path.read_bytes()).decode("utf-8")
+        path = self._path(digest, "gz")
+        if path.exists():
+            return gzip.decompress(path.read_bytes()).decode("utf-8")
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_blob_store(root: Path) -> BlobStore:
+    """Return the process-wide blob store for a directory."""
+    return BlobStore(root)
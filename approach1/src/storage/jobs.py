@@ -0,0 +1,380 @@
+"""SQLite-backed job store shared by all API worker processes."""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    depth TEXT NOT NULL,
+    status TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    message TEXT NOT NULL,
+    worker_id TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    duration_seconds REAL,
+    heartbeat_at REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    profile INTEGER NOT NULL DEFAULT 0,
+    estimated_seconds REAL,
+    report TEXT,
+    usage TEXT,
+    progress TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_topic_created ON jobs (topic, created_at);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    active INTEGER NOT NULL,
+    capacity INTEGER NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+def _job(row: Optional[sqlite3.Row]) -> Optional[dict]:
+    """Convert a jobs row to a record, decoding its JSON columns."""
+    if row is None:
+        return None
+    job = dict(row)
+    job["usage"] = json.loads(job["usage"]) if job["usage"] else None
+    job["progress"] = json.loads(job["progress"]) if job["progress"] else None
+    return job
+
+
+class JobStore:
+    """
+    Durable investigation queue and status table.
+
+    Every API worker process opens the same database file, so job status,
+    results and the queue itself are visible to all of them. Any process can
+    accept a request; whichever process has a free slot claims the job.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add columns introduced after a database was created."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "cancel_requested" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+        if "usage" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN usage TEXT")
+        if "profile" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN profile INTEGER NOT NULL DEFAULT 0")
+        if "estimated_seconds" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN estimated_seconds REAL")
+        if "progress" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(
+        self,
+        topic: str,
+        depth: str,
+        profile: bool = False,
+        estimated_seconds: Optional[float] = None
+    ) -> dict:
+        """
+        Queue a new investigation.
+
+        Args:
+            topic: Investigation topic
+            depth: Investigation depth
+            profile: Run the investigation under the sampling profiler
+            estimated_seconds: Pre-flight duration estimate, used for queue ETAs
+
+        Returns:
+            The newly created job record
+        """
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, topic, depth, status, phase, message, created_at, profile, "
+            "estimated_seconds) VALUES (?, ?, ?, 'queued', 'queued', 'Waiting for a free worker...', ?, ?, ?)",
+            (job_id, topic, depth, datetime.now().isoformat(), int(profile), estimated_seconds)
+        )
+        return self.get(job_id)
+
+    def claim(self, worker_id: str) -> Optional[dict]:
+        """
+        Atomically take the oldest queued job for a worker.
+
+        Args:
+            worker_id: Identifier of the claiming worker process
+
+        Returns:
+            The claimed job record, or None if the queue is empty
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', phase = 'initializing', "
+                "message = 'Starting investigation...', worker_id = ?, started_at = ?, "
+                "heartbeat_at = ? WHERE id = ?",
+                (worker_id, datetime.now().isoformat(), time.time(), row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def update(self, job_id: str, **fields) -> None:
+        """Update arbitrary columns of a job."""
+        if not fields:
+            return
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(
+            f"UPDATE jobs SET {columns} WHERE id = ?",
+            (*fields.values(), job_id)
+        )
+
+    def report_progress(self, job_id: str, progress: dict, **fields) -> None:
+        """
+        Store a running job's live progress for clients polling its status.
+
+        Args:
+            job_id: Running job
+            progress: InvestigationProgress snapshot
+            **fields: Other columns to update, e.g. phase and message
+        """
+        self._update_running(job_id, progress=json.dumps(progress), **fields)
+
+    def _update_running(self, job_id: str, **fields) -> None:
+        """Update columns of a job only while it is running, so finished jobs are left as they ended."""
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(
+            f"UPDATE jobs SET {columns} WHERE id = ? AND status = 'running'",
+            (*fields.values(), job_id)
+        )
+
+    def _finish(self, job_id: str, **fields) -> None:
+        """Record the outcome of a running job unless it was cancelled meanwhile."""
+        self._update_running(job_id, **fields)
+
+    def complete(
+        self,
+        job_id: str,
+        report: str,
+        duration_seconds: float,
+        usage: Optional[dict] = None
+    ) -> None:
+        """Mark a job as completed and store its report and LLM usage."""
+        self._finish(
+            job_id,
+            status="completed",
+            phase="finished",
+            message="Investigation complete!",
+            report=report,
+            usage=json.dumps(usage) if usage is not None else None,
+            completed_at=datetime.now().isoformat(),
+            duration_seconds=duration_seconds
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as failed."""
+        self._finish(
+            job_id,
+            status="failed",
+            phase="error",
+            message=error,
+            error=error,
+            completed_at=datetime.now().isoformat()
+        )
+
+    def request_cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a job.
+
+        Queued jobs are cancelled immediately. Running jobs are flagged; the
+        worker that owns them stops the crew and frees its slot.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            The updated job record, or None if it does not exist
+        """
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET status = 'cancelled', phase = 'cancelled', "
+            "message = 'Investigation cancelled', completed_at = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (datetime.now().isoformat(), job_id)
+        )
+        conn.execute(
+            "UPDATE jobs SET cancel_requested = 1, message = 'Cancelling...' "
+            "WHERE id = ? AND status = 'running'",
+            (job_id,)
+        )
+        return self.get(job_id)
+
+    def cancel_requests(self, worker_id: str) -> list:
+        """Return IDs of a worker's running jobs that have a pending cancel."""
+        rows = self._connect().execute(
+            "SELECT id FROM jobs WHERE worker_id = ? AND status = 'running' AND cancel_requested = 1",
+            (worker_id,)
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def mark_cancelled(self, job_id: str) -> None:
+        """Mark a running job as cancelled."""
+        self._finish(
+            job_id,
+            status="cancelled",
+            phase="cancelled",
+            message="Investigation cancelled",
+            completed_at=datetime.now().isoformat()
+        )
+
+    def latest_active_for_topic(self, topic: str) -> Optional[dict]:
+        """Return the newest queued or running job for a topic."""
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE topic = ? AND status IN ('queued', 'running') "
+            "ORDER BY created_at DESC LIMIT 1",
+            (topic,)
+        ).fetchone()
+        return _job(row)
+
+    def heartbeat(self, worker_id: str, active: int = 0, capacity: int = 0) -> None:
+        """
+        Refresh the lease on every job a worker is running and its own liveness.
+
+        Args:
+            worker_id: Identifier of the worker process
+            active: Investigations the worker is running
+            capacity: Investigations the worker can run at once
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ? AND status = 'running'",
+            (now, worker_id)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO workers (worker_id, active, capacity, heartbeat_at) "
+            "VALUES (?, ?, ?, ?)",
+            (worker_id, active, capacity, now)
+        )
+
+    def remove_worker(self, worker_id: str) -> None:
+        """Forget a worker that shut down cleanly."""
+        self._connect().execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def live_workers(self, lease_seconds: float) -> list:
+        """Return worker processes that sent a heartbeat within the lease."""
+        rows = self._connect().execute(
+            "SELECT * FROM workers WHERE heartbeat_at >= ? ORDER BY worker_id",
+            (time.time() - lease_seconds,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def fail_stale(self, lease_seconds: float) -> int:
+        """
+        Fail running jobs whose worker stopped sending heartbeats.
+
+        Args:
+            lease_seconds: Heartbeat age after which a worker is considered gone
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'failed', phase = 'error', "
+            "message = 'Worker exited before the investigation finished', "
+            "error = 'worker lost', completed_at = ? "
+            "WHERE status = 'running' AND heartbeat_at < ?",
+            (datetime.now().isoformat(), time.time() - lease_seconds)
+        )
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job record by ID."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row)
+
+    def latest_for_topic(self, topic: str) -> Optional[dict]:
+        """Return the most recently submitted job for a topic."""
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE topic = ? ORDER BY created_at DESC LIMIT 1",
+            (topic,)
+        ).fetchone()
+        return _job(row)
+
+    def pending_seconds(self, before: Optional[str] = None, default_seconds: float = 0.0) -> float:
+        """
+        Estimated work queued ahead of a point in the queue.
+
+        Running jobs count with the part of their estimate not yet used.
+
+        Args:
+            before: Only queued jobs created before this timestamp (a job's
+                created_at); None counts the whole queue
+            default_seconds: Estimate for jobs submitted without one
+
+        Returns:
+            Estimated seconds of investigation work
+        """
+        conn = self._connect()
+        queued = conn.execute(
+            "SELECT COALESCE(SUM(COALESCE(estimated_seconds, ?)), 0) AS seconds FROM jobs "
+            "WHERE status = 'queued' AND (? IS NULL OR created_at < ?)",
+            (default_seconds, before, before)
+        ).fetchone()["seconds"]
+        running = 0.0
+        now = datetime.now()
+        for row in conn.execute("SELECT estimated_seconds, started_at FROM jobs WHERE status = 'running'"):
+            elapsed = (now - datetime.fromisoformat(row["started_at"])).total_seconds()
+            running += max((row["estimated_seconds"] or default_seconds) - elapsed, 0.0)
+        return queued + running
+
+    def count_by_status(self) -> dict:
+        """Return the number of jobs in each status."""
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
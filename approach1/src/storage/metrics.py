@@ -0,0 +1,226 @@
+"""Prometheus metrics shared by all API worker processes."""
+
+import math
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+
+INVESTIGATION_BUCKETS = (30, 60, 120, 300, 600, 900, 1200, 1800, 3600)
+PHASE_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1200)
+CALL_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "investigations_total": (
+        "counter", "Finished investigations by depth and outcome", None),
+    "investigation_duration_seconds": (
+        "histogram", "Investigation wall time by depth and outcome", INVESTIGATION_BUCKETS),
+    "investigation_phase_duration_seconds": (
+        "histogram", "Crew phase wall time by depth and phase", PHASE_BUCKETS),
+    "investigation_tool_call_duration_seconds": (
+        "histogram", "Agent tool call latency by tool", CALL_BUCKETS),
+    "investigation_backend_requests_total": (
+        "counter", "Search backend requests by backend and outcome", None),
+    "investigation_backend_request_duration_seconds": (
+        "histogram", "Search backend request latency by backend", CALL_BUCKETS),
+    "investigation_llm_calls_total": (
+        "counter", "LLM calls by model", None),
+    "investigation_llm_tokens_total": (
+        "counter", "LLM tokens by model and type (prompt, completion, cached_prompt)", None),
+    "report_cache_requests_total": (
+        "counter", "Report cache lookups by cache (conditional, compressed, rendered) and result", None),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    le REAL NOT NULL DEFAULT 0,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels, le)
+);
+"""
+
+_UPSERT = (
+    "INSERT INTO samples (name, labels, le, value) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (name, labels, le) DO UPDATE SET value = value + excluded.value"
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    """Render labels in a canonical order so equal label sets share a row."""
+    return ",".join(f'{key}="{_escape(labels[key])}"' for key in sorted(labels))
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsStore:
+    """
+    Counters and histograms accumulated in a SQLite file.
+
+    Every API worker process (and the Gradio apps) writes to the same file,
+    so a scrape of any worker reports totals for the whole deployment
+    instead of whichever process happened to answer.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the metrics store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, rows: list) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_UPSERT, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _counter_rows(name: str, labels: dict, amount: float = 1) -> list:
+        return [(name, _labels(labels), 0, amount)]
+
+    @staticmethod
+    def _histogram_rows(name: str, labels: dict, value: float) -> list:
+        key = _labels(labels)
+        rows = [
+            (f"{name}_bucket", key, le, 1 if value <= le else 0)
+            for le in (*METRICS[name][2], math.inf)
+        ]
+        rows.append((f"{name}_sum", key, 0, value))
+        rows.append((f"{name}_count", key, 0, 1))
+        return rows
+
+    def inc(self, name: str, labels: Optional[dict] = None, amount: float = 1) -> None:
+        """Increment a counter."""
+        self._write(self._counter_rows(name, labels or {}, amount))
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        """Record a histogram observation."""
+        self._write(self._histogram_rows(name, labels or {}, value))
+
+    def record_trace(self, tracer, depth: str, outcome: str) -> None:
+        """
+        Record an investigation's metrics from its trace in one transaction.
+
+        Args:
+            tracer: Tracer of the finished investigation
+            depth: Investigation depth
+            outcome: "completed", "failed" or "cancelled"
+        """
+        rows = self._counter_rows("investigations_total", {"depth": depth, "outcome": outcome})
+        for span in tracer.spans:
+            duration = span.duration_seconds
+            if duration is None:
+                continue
+            attrs = span.attributes
+            if span.category == "investigation":
+                rows += self._histogram_rows(
+                    "investigation_duration_seconds", {"depth": depth, "outcome": outcome}, duration)
+            elif span.category == "phase":
+                rows += self._histogram_rows(
+                    "investigation_phase_duration_seconds", {"depth": depth, "phase": span.name}, duration)
+            elif span.category == "tool":
+                rows += self._histogram_rows(
+                    "investigation_tool_call_duration_seconds", {"tool": span.name}, duration)
+            elif span.category == "http":
+                backend = attrs.get("backend") or urlparse(attrs.get("url", "")).hostname or span.name
+                failed = "error" in attrs or attrs.get("status_code", 0) >= 400
+                rows += self._counter_rows(
+                    "investigation_backend_requests_total",
+                    {"backend": backend, "outcome": "error" if failed else "ok"})
+                rows += self._histogram_rows(
+                    "investigation_backend_request_duration_seconds", {"backend": backend}, duration)
+            elif span.category == "llm":
+                model = attrs.get("model", "unknown")
+                rows += self._counter_rows("investigation_llm_calls_total", {"model": model})
+                for kind in ("prompt", "completion", "cached_prompt"):
+                    tokens = attrs.get(f"{kind}_tokens")
+                    if tokens:
+                        rows += self._counter_rows(
+                            "investigation_llm_tokens_total", {"model": model, "type": kind}, tokens)
+        self._write(rows)
+
+    def render(self, gauges: Optional[list] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            gauges: Point-in-time gauges as (name, help, [(labels, value), ...])
+
+        Returns:
+            Exposition text
+        """
+        rows = self._connect().execute(
+            "SELECT name, labels, le, value FROM samples ORDER BY name, labels, le"
+        ).fetchall()
+        by_metric = {}
+        for row in rows:
+            base = row["name"]
+            for suffix in ("_bucket", "_sum", "_count"):
+                if base.endswith(suffix) and base[:-len(suffix)] in METRICS:
+                    base = base[:-len(suffix)]
+                    break
+            by_metric.setdefault(base, []).append(row)
+
+        lines = []
+        for name, help_text, samples in gauges or []:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                key = _labels(labels)
+                lines.append(f"{name}{{{key}}} {_number(value)}" if key else f"{name} {_number(value)}")
+
+        for name, (kind, help_text, _) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for row in by_metric.get(name, []):
+                key = row["labels"]
+                if row["name"].endswith("_bucket"):
+                    le = f'le="{_number(row["le"])}"'
+                    key = f"{key},{le}" if key else le
+                sample = f"{row['name']}{{{key}}}" if key else row["name"]
+                lines.append(f"{sample} {_number(row['value'])}")
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def get_metrics_store(db_path: Path) -> MetricsStore:
+    """Return the process-wide metrics store for a database file."""
+    return MetricsStore(db_path)
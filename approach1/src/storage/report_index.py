@@ -0,0 +1,283 @@
+"""SQLite index and full-text search over saved investigation reports."""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .artifacts import get_artifact_store, read_report
+
+INDEX_FILENAME = ".reports.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    filename TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    depth TEXT,
+    started_at TEXT,
+    completed_at TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    duration_seconds REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_reports_completed ON reports (completed_at);
+CREATE INDEX IF NOT EXISTS idx_reports_depth_completed ON reports (depth, completed_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5 (
+    filename UNINDEXED,
+    topic,
+    content,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 column weights for (filename, topic, content): topic matches rank higher
+_BM25 = "bm25(reports_fts, 0.0, 5.0, 1.0)"
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# investigation_<topic>_<YYYYmmdd>_<HHMMSS>.md
+_LEGACY_NAME = re.compile(r"^investigation_(?P<topic>.*?)(?:_\d{8}_\d{6})?$")
+
+
+class ReportIndex:
+    """
+    Maintained index of reports in the output directory.
+
+    Rows are added by MCPInvestigationCrew when a report is saved, so listing
+    and searching reports are indexed queries instead of directory scans.
+    Reports written before the index existed are picked up by backfill().
+    """
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize the report index.
+
+        Args:
+            output_dir: Directory containing the reports
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.output_dir / INDEX_FILENAME
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(
+        self,
+        path: Path,
+        topic: str,
+        depth: Optional[str] = None,
+        started_at: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        token_usage: Optional[dict] = None,
+        content: Optional[str] = None
+    ) -> None:
+        """
+        Record a saved report and add it to the full-text index.
+
+        Args:
+            path: Path of the saved report
+            topic: Investigation topic
+            depth: Investigation depth
+            started_at: ISO timestamp when the investigation started
+            duration_seconds: Investigation duration
+            token_usage: Dict with prompt_tokens, completion_tokens, total_tokens
+            content: Report text, read from path if not given
+        """
+        path = Path(path)
+        stat = path.stat()
+        usage = token_usage or {}
+        filename = path.relative_to(self.output_dir).as_posix()
+        if content is None:
+            content = read_report(path)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Search rows share the report's rowid so updates never scan the FTS table
+            existing = conn.execute(
+                "SELECT rowid FROM reports WHERE filename = ?", (filename,)
+            ).fetchone()
+            if existing:
+                conn.execute("DELETE FROM reports_fts WHERE rowid = ?", (existing[0],))
+            cursor = conn.execute(
+                "INSERT OR REPLACE INTO reports (filename, topic, depth, started_at, completed_at, "
+                "size_bytes, duration_seconds, prompt_tokens, completion_tokens, total_tokens) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    filename,
+                    topic,
+                    depth,
+                    started_at,
+                    datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    stat.st_size,
+                    duration_seconds,
+                    usage.get("prompt_tokens"),
+                    usage.get("completion_tokens"),
+                    usage.get("total_tokens")
+                )
+            )
+            conn.execute(
+                "INSERT INTO reports_fts (rowid, filename, topic, content) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, filename, topic, content)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def backfill(self) -> int:
+        """
+        Index reports on disk that are not in the index yet.
+
+        Artifacts in the dated directories are indexed from their metadata
+        sidecars. Topics of legacy reports at the top level are recovered
+        from the filename. Reports listed before full-text search existed
+        are added to the search index.
+
+        Returns:
+            Number of reports added
+        """
+        conn = self._connect()
+        known = {row["filename"]: row for row in conn.execute("SELECT rowid, * FROM reports")}
+        searchable = {row[0] for row in conn.execute("SELECT rowid FROM reports_fts")}
+        added = 0
+        for artifact in get_artifact_store(self.output_dir).artifacts():
+            row = known.get(artifact.filename)
+            if (row is not None and row["rowid"] in searchable) or not artifact.path.is_file():
+                continue
+            metadata = artifact.metadata
+            self.add(
+                artifact.path,
+                topic=metadata["topic"],
+                depth=metadata.get("depth"),
+                started_at=metadata.get("started_at"),
+                duration_seconds=metadata.get("duration_seconds"),
+                token_usage=metadata.get("token_usage")
+            )
+            added += 1
+        for path in self.output_dir.glob("investigation_*.md"):
+            row = known.get(path.name)
+            if row is None:
+                topic = _LEGACY_NAME.match(path.stem).group("topic").replace("_", " ")
+                self.add(path, topic=topic)
+            elif row["rowid"] not in searchable:
+                self.add(
+                    path,
+                    topic=row["topic"],
+                    depth=row["depth"],
+                    started_at=row["started_at"],
+                    duration_seconds=row["duration_seconds"],
+                    token_usage=dict(row)
+                )
+            else:
+                continue
+            added += 1
+        return added
+
+    def query(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        depth: Optional[str] = None,
+        topic: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> tuple:
+        """
+        List reports, newest first.
+
+        Args:
+            limit: Maximum number of reports to return
+            offset: Number of reports to skip
+            depth: Only reports of this depth
+            topic: Only reports whose topic contains this text
+            since: Only reports completed at or after this ISO timestamp
+            until: Only reports completed before this ISO timestamp
+
+        Returns:
+            Tuple of (list of report dicts, total matching count)
+        """
+        clauses = []
+        params = []
+        if depth:
+            clauses.append("depth = ?")
+            params.append(depth)
+        if topic:
+            # Match the text literally: % and _ in a topic are not wildcards
+            escaped = topic.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("topic LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if since:
+            clauses.append("completed_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("completed_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM reports {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM reports {where} ORDER BY completed_at DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> tuple:
+        """
+        Full-text search over report topics and content, best match first.
+
+        Every word in the query must match; the last word also matches as
+        a prefix so partially typed queries find results.
+
+        Args:
+            query: Free-text search query
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (list of report dicts with score and snippet, total match count)
+        """
+        terms = _TERM.findall(query)
+        if not terms:
+            return [], 0
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+
+        conn = self._connect()
+        total = conn.execute(
+            "SELECT COUNT(*) FROM reports_fts WHERE reports_fts MATCH ?", (match,)
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT r.*, {_BM25} AS score, "
+            "snippet(reports_fts, 2, '**', '**', '…', 24) AS snippet "
+            "FROM reports_fts JOIN reports r ON r.rowid = reports_fts.rowid "
+            f"WHERE reports_fts MATCH ? ORDER BY {_BM25} LIMIT ? OFFSET ?",
+            (match, limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows], total
+
+
+@lru_cache(maxsize=None)
+def get_report_index(output_dir: Path) -> ReportIndex:
+    """Return the process-wide index for an output directory, backfilled once."""
+    index = ReportIndex(output_dir)
+    index.backfill()
+    return index
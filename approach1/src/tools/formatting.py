@@ -0,0 +1,118 @@
+"""Formatting of search API responses into tool output for agent prompts.
+
+Kept free of CrewAI imports so the formatters can be tested and
+microbenchmarked on their own (see src.search_benchmark).
+
+Each formatter has two modes. The full mode is the original labelled
+layout. The compact mode puts one result on a line, drops fields the
+other fields already contain (a GitHub code URL names the repository and
+path) and shortens long snippets, so results cost fewer prompt tokens.
+"""
+
+from typing import Optional
+
+
+# Results kept per search
+MAX_RESULTS = 5
+
+# Snippets longer than this are shortened in compact mode
+SNIPPET_CHARS = 300
+
+
+def _snippet(text: Optional[str]) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS - 1].rstrip() + "…"
+
+
+def format_web_results(results: list, title_key: str, link_key: str, snippet_key: str,
+                       compact: bool = False) -> str:
+    """
+    Format web search results (Serper "organic" entries or DuckDuckGo results).
+
+    Args:
+        results: Result dicts
+        title_key: Key of the result title
+        link_key: Key of the result URL ("link" for Serper, "href" for DuckDuckGo)
+        snippet_key: Key of the result snippet ("snippet" for Serper, "body" for DuckDuckGo)
+        compact: One numbered result per line with shortened snippets
+
+    Returns:
+        Formatted results; empty if there are none
+    """
+    results = results[:MAX_RESULTS]
+    if compact:
+        return "\n".join(
+            f"{i}. {r.get(title_key, 'N/A')} | {r.get(link_key, 'N/A')}\n   {_snippet(r.get(snippet_key))}"
+            for i, r in enumerate(results, 1)
+        )
+    return "\n---\n".join(
+        f"Title: {r.get(title_key, 'N/A')}\n"
+        f"Link: {r.get(link_key, 'N/A')}\n"
+        f"Snippet: {r.get(snippet_key, 'N/A')}\n"
+        for r in results
+    )
+
+
+def format_serper_results(data: dict, compact: bool = False) -> str:
+    """Format a Serper search response; empty if it has no organic results."""
+    return format_web_results(data.get("organic") or [], "title", "link", "snippet", compact)
+
+
+def format_ddg_results(results: list, compact: bool = False) -> str:
+    """Format DuckDuckGo text search results."""
+    return format_web_results(results, "title", "href", "body", compact)
+
+
+def format_code_results(data: dict, compact: bool = False) -> str:
+    """
+    Format a GitHub code search response.
+
+    Args:
+        data: Response of GET /search/code
+        compact: One URL per result; it names the repository and path
+
+    Returns:
+        Formatted results; empty if there are none
+    """
+    items = data.get("items", [])[:MAX_RESULTS]
+    if compact:
+        return "\n".join(f"- {item['html_url']}" for item in items)
+    return "\n---\n".join(
+        f"""
+Repository: {item['repository']['full_name']}
+File: {item['name']}
+Path: {item['path']}
+URL: {item['html_url']}
+"""
+        for item in items
+    )
+
+
+def format_repo_results(data: dict, compact: bool = False) -> str:
+    """
+    Format a GitHub repository search response.
+
+    Args:
+        data: Response of GET /search/repositories
+        compact: One line per repository, led by its URL, which names it
+
+    Returns:
+        Formatted results; empty if there are none
+    """
+    items = data.get("items", [])[:MAX_RESULTS]
+    if compact:
+        return "\n".join(
+            f"- {repo['html_url']} ({repo.get('language') or 'n/a'}, {repo['stargazers_count']} stars, "
+            f"{repo['forks_count']} forks): {_snippet(repo.get('description')) or 'No description'}"
+            for repo in items
+        )
+    return "\n---\n".join(
+        f"""
+Repository: {repo['full_name']}
+Description: {repo.get('description', 'No description')}
+Stars: {repo['stargazers_count']} | Forks: {repo['forks_count']}
+Language: {repo.get('language', 'N/A')}
+URL: {repo['html_url']}
+"""
+        for repo in items
+    )
@@ -1,10 +1,23 @@
 """GitHub search and code analysis tools."""
 
+import os
 from typing import Optional
 
 import requests
 from crewai.tools import tool
 
+from .. import config
+from ..utils.tracing import trace_span
+from .formatting import MAX_RESULTS, format_code_results, format_repo_results
+
+
+# Overridable with GITHUB_API_URL, e.g. for GitHub Enterprise or a local stub
+GITHUB_API_URL = "https://api.github.com"
+
+
+def _api_url(path: str) -> str:
+    return f"{os.getenv('GITHUB_API_URL', GITHUB_API_URL).rstrip('/')}{path}"
+
 
 @tool("github_code_search")
 def github_code_search(query: str, language: Optional[str] = None) -> str:
@@ -24,12 +37,12 @@ def github_code_search(query: str, language: Optional[str] = None) -> str:
         search_query += f" language:{language}"
 
     # GitHub Code Search API
-    url = "https://api.github.com/search/code"
+    url = _api_url("/search/code")
     params = {
         "q": search_query,
         "sort": "indexed",
         "order": "desc",
-        "per_page": 5
+        "per_page": MAX_RESULTS
     }
 
     headers = {
@@ -37,25 +50,16 @@ def github_code_search(query: str, language: Optional[str] = None) -> str:
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        with trace_span(f"GET {url}", "http", backend="github", method="GET", url=url) as span:
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            span.set(status_code=response.status_code, response_bytes=len(response.content))
         response.raise_for_status()
         data = response.json()
 
         if data.get("total_count", 0) == 0:
             return f"No code results found for: {query}"
 
-        # Format results
-        results = []
-        for item in data.get("items", [])[:5]:
-            result = f"""
-Repository: {item['repository']['full_name']}
-File: {item['name']}
-Path: {item['path']}
-URL: {item['html_url']}
-"""
-            results.append(result)
-
-        return "\n---\n".join(results)
+        return format_code_results(data, compact=config.COMPACT_SEARCH_RESULTS)
 
     except requests.exceptions.RequestException as e:
         return f"Error searching GitHub: {str(e)}"
@@ -72,12 +76,12 @@ def github_repo_search(query: str) -> str:
     Returns:
         Formatted list of repositories with descriptions and stats
     """
-    url = "https://api.github.com/search/repositories"
+    url = _api_url("/search/repositories")
     params = {
         "q": query,
         "sort": "stars",
         "order": "desc",
-        "per_page": 5
+        "per_page": MAX_RESULTS
     }
 
     headers = {
@@ -85,26 +89,16 @@ def github_repo_search(query: str) -> str:
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        with trace_span(f"GET {url}", "http", backend="github", method="GET", url=url) as span:
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            span.set(status_code=response.status_code, response_bytes=len(response.content))
         response.raise_for_status()
         data = response.json()
 
         if data.get("total_count", 0) == 0:
             return f"No repositories found for: {query}"
 
-        # Format results
-        results = []
-        for repo in data.get("items", [])[:5]:
-            result = f"""
-Repository: {repo['full_name']}
-Description: {repo.get('description', 'No description')}
-Stars: {repo['stargazers_count']} | Forks: {repo['forks_count']}
-Language: {repo.get('language', 'N/A')}
-URL: {repo['html_url']}
-"""
-            results.append(result)
-
-        return "\n---\n".join(results)
+        return format_repo_results(data, compact=config.COMPACT_SEARCH_RESULTS)
 
     except requests.exceptions.RequestException as e:
         return f"Error searching GitHub: {str(e)}"
@@ -3,6 +3,14 @@
 import os
 from crewai.tools import tool
 
+from .. import config
+from ..utils.tracing import trace_span
+from .formatting import MAX_RESULTS, format_ddg_results, format_serper_results
+
+
+# Overridable with SERPER_API_URL, e.g. to point benchmarks at a local stub
+SERPER_API_URL = "https://google.serper.dev"
+
 
 @tool("web_search")
 def web_search_tool(query: str) -> str:
@@ -22,24 +30,22 @@ def web_search_tool(query: str) -> str:
         try:
             import requests
 
-            url = "https://google.serper.dev/search"
+            url = f"{os.getenv('SERPER_API_URL', SERPER_API_URL).rstrip('/')}/search"
             headers = {
                 "X-API-KEY": serper_key,
                 "Content-Type": "application/json"
             }
             data = {"q": query}
 
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            with trace_span(f"POST {url}", "http", backend="serper", method="POST", url=url) as span:
+                response = requests.post(url, json=data, headers=headers, timeout=10)
+                span.set(status_code=response.status_code, response_bytes=len(response.content))
             response.raise_for_status()
             results = response.json()
 
-            if "organic" in results and results["organic"]:
-                formatted = []
-                for r in results["organic"][:5]:
-                    formatted.append(f"Title: {r.get('title', 'N/A')}\n"
-                                   f"Link: {r.get('link', 'N/A')}\n"
-                                   f"Snippet: {r.get('snippet', 'N/A')}\n")
-                return "\n---\n".join(formatted)
+            formatted = format_serper_results(results, compact=config.COMPACT_SEARCH_RESULTS)
+            if formatted:
+                return formatted
         except Exception as e:
             # Fall back to DuckDuckGo
             pass
@@ -48,19 +54,15 @@ def web_search_tool(query: str) -> str:
     try:
         from duckduckgo_search import DDGS
 
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=5))
+        with trace_span("duckduckgo text search", "http", backend="duckduckgo") as span:
+            with DDGS() as ddgs:
+                results = list(ddgs.text(query, max_results=MAX_RESULTS))
+            span.set(results=len(results))
 
         if not results:
             return f"No results found for: {query}"
 
-        formatted = []
-        for r in results:
-            formatted.append(f"Title: {r.get('title', 'N/A')}\n"
-                           f"Link: {r.get('href', 'N/A')}\n"
-                           f"Snippet: {r.get('body', 'N/A')}\n")
-
-        return "\n---\n".join(formatted)
+        return format_ddg_results(results, compact=config.COMPACT_SEARCH_RESULTS)
 
     except Exception as e:
         return f"Search error: {str(e)}"
@@ -0,0 +1,81 @@
+"""Cooperative cancellation of running investigations."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class InvestigationCancelled(Exception):
+    """Raised inside an investigation once its cancellation token is set."""
+
+
+class CancellationToken:
+    """Flag shared between the code requesting a cancel and the running crew."""
+
+    def __init__(self):
+        """Initialize an un-cancelled token."""
+        self._event = threading.Event()
+        self.reason = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Investigation cancelled"):
+        """Request cancellation; the crew stops at its next checkpoint."""
+        self.reason = reason
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        """Raise InvestigationCancelled if cancellation was requested."""
+        if self.cancelled:
+            raise InvestigationCancelled(self.reason)
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Return the token of the investigation running in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken]):
+    """
+    Make a token visible to the CrewAI hooks for the code inside the block.
+
+    CrewAI runs a sequential crew's LLM and tool calls on the thread that
+    called kickoff(), so the hooks find the token through a context variable.
+    """
+    _install_hooks()
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def _block_if_cancelled(context) -> Optional[bool]:
+    """CrewAI before-call hook: returning False blocks the LLM or tool call."""
+    token = _current_token.get()
+    if token is not None and token.cancelled:
+        return False
+    return None
+
+
+def _install_hooks():
+    """Register the LLM and tool call checkpoints with CrewAI once per process."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        from crewai.hooks import register_before_llm_call_hook, register_before_tool_call_hook
+
+        register_before_llm_call_hook(_block_if_cancelled)
+        register_before_tool_call_hook(_block_if_cancelled)
+        _hooks_installed = True
@@ -0,0 +1,63 @@
+"""HTTP transport interceptor that feeds per-call LLM accounting.
+
+Kept apart from llm_usage so that aggregating usage does not import httpx or
+CrewAI; only the agents' LLM clients need this module.
+"""
+
+import time
+
+import httpx
+from crewai.llms.hooks.base import BaseInterceptor
+
+from .tracing import current_crew_tracer
+
+
+class LLMUsageInterceptor(BaseInterceptor[httpx.Request, httpx.Response]):
+    """
+    Transport interceptor that times each HTTP attempt of an LLM call.
+
+    The OpenAI client retries failed requests itself, so every outbound
+    request inside one CrewAI LLM call after the first is a retry. The first
+    body byte of the final attempt gives the time to first token.
+    """
+
+    def on_outbound(self, message: httpx.Request) -> httpx.Request:
+        crew_tracer = current_crew_tracer()
+        if crew_tracer is not None:
+            crew_tracer.llm_attempt()
+        return message
+
+    def on_inbound(self, message: httpx.Response) -> httpx.Response:
+        crew_tracer = current_crew_tracer()
+        if crew_tracer is not None:
+            crew_tracer.llm_response(message.status_code)
+            message.stream = _FirstByteStream(message.stream, crew_tracer.llm_first_byte)
+        return message
+
+    async def aon_outbound(self, message: httpx.Request) -> httpx.Request:
+        return self.on_outbound(message)
+
+    async def aon_inbound(self, message: httpx.Response) -> httpx.Response:
+        crew_tracer = current_crew_tracer()
+        if crew_tracer is not None:
+            crew_tracer.llm_response(message.status_code)
+        return message
+
+
+class _FirstByteStream(httpx.SyncByteStream):
+    """Response body stream that reports when its first chunk arrives."""
+
+    def __init__(self, stream, on_first_byte):
+        self._stream = stream
+        self._on_first_byte = on_first_byte
+
+    def __iter__(self):
+        first = True
+        for chunk in self._stream:
+            if first and chunk:
+                first = False
+                self._on_first_byte(time.perf_counter_ns())
+            yield chunk
+
+    def close(self):
+        self._stream.close()
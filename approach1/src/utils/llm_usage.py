@@ -0,0 +1,77 @@
+"""Per-call LLM accounting: tokens, latency, time to first token and retries."""
+
+from typing import Optional
+
+
+_TOTALS = ("prompt_tokens", "completion_tokens", "cached_prompt_tokens", "latency_seconds", "retries")
+
+
+def llm_calls(tracer, payloads: Optional[dict] = None) -> list:
+    """
+    List an investigation's LLM calls with the agent and phase that made them.
+
+    Args:
+        tracer: Tracer of the investigation
+        payloads: CrewTracer.payloads; adds each call's full response
+
+    Returns:
+        One dict per LLM call, in call order
+    """
+    calls = []
+    for span in tracer.spans:
+        if span.category != "llm" or span.end_ns is None:
+            continue
+        phase = tracer.find_ancestor(span, "phase")
+        attrs = span.attributes
+        calls.append({
+            "agent": phase.attributes.get("agent") if phase else None,
+            "phase": phase.name if phase else None,
+            "model": attrs.get("model"),
+            "status": attrs.get("status", "error"),
+            "prompt_tokens": attrs.get("prompt_tokens", 0),
+            "completion_tokens": attrs.get("completion_tokens", 0),
+            "cached_prompt_tokens": attrs.get("cached_prompt_tokens", 0),
+            "prompt_chars": attrs.get("prompt_chars"),
+            "latency_seconds": round(span.duration_seconds, 3),
+            "ttft_seconds": attrs.get("ttft_seconds"),
+            "retries": attrs.get("retries", 0),
+            **(payloads or {}).get(span.span_id, {})
+        })
+    return calls
+
+
+def _aggregate(calls: list) -> dict:
+    totals = {key: 0 for key in _TOTALS}
+    ttfts = []
+    for call in calls:
+        for key in _TOTALS:
+            totals[key] += call[key] or 0
+        if call["ttft_seconds"] is not None:
+            ttfts.append(call["ttft_seconds"])
+    totals["latency_seconds"] = round(totals["latency_seconds"], 3)
+    totals["calls"] = len(calls)
+    totals["errors"] = sum(1 for call in calls if call["status"] != "ok")
+    totals["models"] = sorted({call["model"] for call in calls if call["model"]})
+    totals["mean_ttft_seconds"] = round(sum(ttfts) / len(ttfts), 3) if ttfts else None
+    return totals
+
+
+def usage_summary(calls: list) -> dict:
+    """
+    Aggregate LLM calls for the whole run, per agent and per phase.
+
+    Args:
+        calls: Calls as returned by llm_calls()
+
+    Returns:
+        Dict with run totals plus "by_agent" and "by_phase" breakdowns
+    """
+    by_agent = {}
+    by_phase = {}
+    for call in calls:
+        by_agent.setdefault(call["agent"] or "unknown", []).append(call)
+        by_phase.setdefault(call["phase"] or "unknown", []).append(call)
+    summary = _aggregate(calls)
+    summary["by_agent"] = {agent: _aggregate(group) for agent, group in by_agent.items()}
+    summary["by_phase"] = {phase: _aggregate(group) for phase, group in by_phase.items()}
+    return summary
@@ -1,15 +1,268 @@
 """Logging configuration with session tracking for MCP Investigation Tool."""
 
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import json
 
+from ..storage.blobs import blob_digest, get_blob_store
+
+
+# Records buffered for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = 10000
+
+# Upper bound on session log files held open by the writer thread
+MAX_OPEN_SESSION_FILES = 64
+
+# Seconds between fsyncs of a session's event file
+EVENT_FSYNC_INTERVAL = 1.0
+
+# Payload fields stored in the blob store; events keep <field>_sha256 and <field>_length
+PAYLOAD_FIELDS = ("prompt", "output", "data_passed", "response", "result")
+
+# Payloads shorter than this stay inline in the event; a blob would cost more than it saves
+BLOB_MIN_CHARS = 1024
+
+LOGGER_NAME = "mcp_investigation"
+
+_FORMAT = '[%(asctime)s] [SESSION:%(session_id)s] [%(levelname)s] %(message)s'
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class _SessionFileHandler(logging.Handler):
+    """
+    Route records to their session's log file.
+
+    Runs only on the writer thread. Files are opened on a session's first
+    record and closed when the session ends.
+    """
+
+    path_attr = "session_log_file"
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self._files = OrderedDict()
+
+    def render(self, record: logging.LogRecord) -> Optional[str]:
+        """Return the line to write for a record, or None to skip it."""
+        return self.format(record)
+
+    def emit(self, record: logging.LogRecord):
+        path = getattr(record, self.path_attr, None)
+        if path is None:
+            return
+
+        if getattr(record, "close_session", False):
+            log_file = self._files.pop(path, None)
+            if log_file:
+                self._close_file(log_file)
+            return
+
+        try:
+            line = self.render(record)
+            if line is None:
+                return
+
+            log_file = self._files.get(path)
+            if log_file is None:
+                if len(self._files) >= MAX_OPEN_SESSION_FILES:
+                    _, oldest = self._files.popitem(last=False)
+                    self._close_file(oldest)
+                log_file = open(path, 'a', encoding='utf-8', buffering=1)
+                self._files[path] = log_file
+            else:
+                self._files.move_to_end(path)
+
+            log_file.write(line + "\n")
+            self._written(log_file)
+        except Exception:
+            self.handleError(record)
+
+    def _written(self, log_file):
+        """Hook called after each line is written."""
+
+    def _close_file(self, log_file):
+        log_file.close()
+
+    def close(self):
+        for log_file in self._files.values():
+            self._close_file(log_file)
+        self._files.clear()
+        super().close()
+
+
+class _SessionEventHandler(_SessionFileHandler):
+    """
+    Append each session event as one JSON line, fsyncing periodically.
+
+    A crash loses at most the last EVENT_FSYNC_INTERVAL seconds of events.
+    """
+
+    path_attr = "session_events_file"
+
+    def __init__(self):
+        super().__init__()
+        self._last_sync = {}
+
+    def render(self, record: logging.LogRecord) -> Optional[str]:
+        event = getattr(record, "event", None)
+        if event is None:
+            return None
+        # Blobs are written before the event that references them
+        blobs = getattr(record, "blobs", None)
+        if blobs:
+            store = get_blob_store(Path(record.session_blobs_dir))
+            for digest, text in blobs.items():
+                store.put(text, digest)
+        return json.dumps(event, default=str)
+
+    def _written(self, log_file):
+        now = time.monotonic()
+        if now - self._last_sync.get(log_file, 0.0) >= EVENT_FSYNC_INTERVAL:
+            os.fsync(log_file.fileno())
+            self._last_sync[log_file] = now
+
+    def _close_file(self, log_file):
+        self._last_sync.pop(log_file, None)
+        log_file.flush()
+        os.fsync(log_file.fileno())
+        log_file.close()
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    Queue records for the writer thread.
+
+    Plain records are dropped when the buffer is full so logging never blocks
+    the caller. Session events and close markers wait for room instead: losing
+    them would corrupt the session log or leave its files open.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting and JSON encoding happen on the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if getattr(record, "close_session", False) or hasattr(record, "event"):
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _JsonArg:
+    """Log argument JSON-encoded only when the record is formatted."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, default=str)
+
+
+class _SessionConsoleFilter(logging.Filter):
+    """Keep session close markers off the console."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not getattr(record, "close_session", False)
+
+
+_writer_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+
+
+def _get_logger() -> logging.Logger:
+    """Return the shared session logger, starting the writer thread on first use."""
+    global _queue_handler, _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    with _writer_lock:
+        if _listener is None:
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            formatter = logging.Formatter(_FORMAT, datefmt=_DATE_FORMAT)
+
+            file_handler = _SessionFileHandler()
+            file_handler.setFormatter(formatter)
+            event_handler = _SessionEventHandler()
+
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            console_handler.addFilter(_SessionConsoleFilter())
+
+            _queue_handler = _BoundedQueueHandler(log_queue)
+            _listener = QueueListener(
+                log_queue,
+                file_handler,
+                event_handler,
+                console_handler,
+                respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(shutdown_logging)
+
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+            logger.addHandler(_queue_handler)
+    return logger
+
+
+def flush_logs():
+    """Block until the writer thread has handled every queued record."""
+    if _listener is not None:
+        _listener.queue.join()
+
+
+def shutdown_logging():
+    """Flush queued records, stop the writer thread and close all session files."""
+    global _queue_handler, _listener
+    with _writer_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger(LOGGER_NAME).removeHandler(_queue_handler)
+        _queue_handler = None
+        _listener = None
+
+
+def dropped_log_records() -> int:
+    """Number of records dropped because the writer thread fell behind."""
+    return _queue_handler.dropped if _queue_handler else 0
+
 
 class SessionLogger:
-    """Logger with session ID tracking for detailed flow analysis."""
+    """
+    Logger with session ID tracking for detailed flow analysis.
+
+    All sessions share one logger whose records are written by a single
+    background thread, so logging never does file or console I/O on the
+    caller's thread and creates no per-session loggers or handlers.
+
+    Events are appended to a JSONL file as they happen rather than kept in
+    memory, so memory per session stays constant and a crash keeps the log.
+    Large prompts and outputs are stored once in a compressed,
+    content-addressed blob store under logs/blobs/; events and log lines keep
+    only their hash and length. Payloads under BLOB_MIN_CHARS stay inline.
+    """
 
     def __init__(self, session_id: Optional[str] = None):
         """
@@ -25,34 +278,18 @@ class SessionLogger:
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
 
-        # Setup logger
-        self.logger = logging.getLogger(f"mcp_investigation.{self.session_id}")
-        self.logger.setLevel(logging.DEBUG)
-
-        # File handler for this session
-        log_file = self.logs_dir / f"session_{self.session_id}_{self.start_time.strftime('%Y%m%d_%H%M%S')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-
-        # Formatter
-        formatter = logging.Formatter(
-            f'[%(asctime)s] [SESSION:{self.session_id}] [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        # Add handlers
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-
-        self.log_file = log_file
-        self.events = []
+        # Session file is opened by the writer thread on the first record
+        self.log_file = self.logs_dir / f"session_{self.session_id}_{self.start_time.strftime('%Y%m%d_%H%M%S')}.log"
+        self.events_file = self.logs_dir / f"session_{self.session_id}_events.jsonl"
+        self.logger = _get_logger()
+        self.blobs_dir = self.logs_dir / "blobs"
+        self._extra = {
+            "session_id": self.session_id,
+            "session_log_file": str(self.log_file),
+            "session_events_file": str(self.events_file),
+            "session_blobs_dir": str(self.blobs_dir)
+        }
+        self.events_count = 0
 
     def log_event(self, event_type: str, message: str, **kwargs):
         """
@@ -63,6 +300,17 @@ class SessionLogger:
             message: Event message
             **kwargs: Additional metadata
         """
+        # Large payloads are stored once in the blob store, by content hash
+        blobs = {}
+        for field in PAYLOAD_FIELDS:
+            text = kwargs.get(field)
+            if isinstance(text, str) and len(text) >= BLOB_MIN_CHARS:
+                digest = blob_digest(text)
+                blobs[digest] = text
+                del kwargs[field]
+                kwargs[f"{field}_sha256"] = digest
+                kwargs.setdefault(f"{field}_length", len(text))
+
         event = {
             "timestamp": datetime.now().isoformat(),
             "session_id": self.session_id,
@@ -70,10 +318,16 @@ class SessionLogger:
             "message": message,
             **kwargs
         }
-        self.events.append(event)
+        self.events_count += 1
 
-        # Log to file with structured data
-        self.logger.info(f"{event_type.upper()}: {message} | Metadata: {json.dumps(kwargs)}")
+        # Log line, JSONL event and blobs are all written by the writer thread
+        self.logger.info(
+            "%s: %s | Metadata: %s",
+            event_type.upper(),
+            message,
+            _JsonArg(kwargs),
+            extra={**self._extra, "event": event, "blobs": blobs}
+        )
 
     def start_investigation(self, topic: str, depth: str):
         """Log investigation start."""
@@ -136,14 +390,15 @@ class SessionLogger:
             data_length=len(data_passed) if data_passed else 0
         )
 
-    def log_tool_use(self, tool_name: str, query: str, result_summary: str):
+    def log_tool_use(self, tool_name: str, query: str, result_summary: str, metadata: Optional[dict] = None):
         """Log tool usage."""
         self.log_event(
             "tool_use",
             f"Tool '{tool_name}' executed",
             tool=tool_name,
             query=query,
-            result_summary=result_summary
+            result_summary=result_summary,
+            **(metadata or {})
         )
 
     def complete_investigation(self, success: bool, output_file: Optional[str] = None):
@@ -156,6 +411,12 @@ class SessionLogger:
             duration_seconds=duration,
             output_file=output_file
         )
+        self.log_event("session_summary", "Session closed", **self.get_session_summary())
+        self.close()
+
+    def close(self):
+        """Close this session's log file once its queued records are written."""
+        self.logger.info("", extra={**self._extra, "close_session": True})
 
     def get_session_summary(self) -> dict:
         """Get summary of session."""
@@ -163,16 +424,96 @@ class SessionLogger:
             "session_id": self.session_id,
             "start_time": self.start_time.isoformat(),
             "duration_seconds": (datetime.now() - self.start_time).total_seconds(),
-            "events_count": len(self.events),
-            "log_file": str(self.log_file)
+            "events_count": self.events_count,
+            "log_file": str(self.log_file),
+            "events_file": str(self.events_file)
         }
 
     def export_session_log(self) -> Path:
-        """Export session events as JSON."""
-        json_file = self.logs_dir / f"session_{self.session_id}_events.json"
-        with open(json_file, 'w') as f:
-            json.dump({
-                "session_summary": self.get_session_summary(),
-                "events": self.events
-            }, f, indent=2)
-        return json_file
+        """Wait until this session's events are written and return the JSONL file."""
+        flush_logs()
+        return self.events_file
+
+
+def read_session_events(events_file: Path, with_payloads: bool = False) -> Iterator[dict]:
+    """
+    Read the events of a session log.
+
+    Args:
+        events_file: Path to a session_*_events.jsonl file (or a legacy
+            session_*_events.json export)
+        with_payloads: Load prompts and outputs back from the blob store
+            into their original fields
+
+    Yields:
+        Event dicts in the order they were logged
+    """
+    events_file = Path(events_file)
+    if events_file.suffix == ".json":
+        with open(events_file, encoding='utf-8') as f:
+            yield from json.load(f)["events"]
+        return
+
+    store = get_blob_store(events_file.parent / "blobs") if with_payloads else None
+    with open(events_file, encoding='utf-8') as f:
+        for line in f:
+            if line.endswith("\n"):
+                event = json.loads(line)
+                if store:
+                    for field in PAYLOAD_FIELDS:
+                        digest = event.get(f"{field}_sha256")
+                        if digest:
+                            event[field] = store.get(digest)
+                yield event
+
+
+def tail_session_events(
+    events_file: Path,
+    follow: bool = True,
+    poll_interval: float = 0.5,
+    timeout: Optional[float] = None
+) -> Iterator[dict]:
+    """
+    Yield a session's events, optionally following the file while it grows.
+
+    Only complete lines are parsed, so a line still being written is picked
+    up on the next poll. Following stops after the session_summary event.
+
+    Args:
+        events_file: Path to a session_*_events.jsonl file
+        follow: Keep waiting for new events until the session ends
+        poll_interval: Seconds between checks for new data
+        timeout: Stop following after this many seconds without new events
+
+    Yields:
+        Event dicts as they are appended
+    """
+    events_file = Path(events_file)
+    position = 0
+    buffer = b""
+    idle_since = time.monotonic()
+
+    while True:
+        if events_file.exists():
+            with open(events_file, 'rb') as f:
+                f.seek(position)
+                chunk = f.read()
+                position = f.tell()
+
+            if chunk:
+                idle_since = time.monotonic()
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    yield event
+                    if event.get("event_type") == "session_summary":
+                        return
+
+        if not follow:
+            return
+        if timeout is not None and time.monotonic() - idle_since > timeout:
+            return
+        time.sleep(poll_interval)
@@ -0,0 +1,302 @@
+"""Opt-in sampling profiler for investigations."""
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Frames kept per sampled stack, innermost first
+MAX_STACK_DEPTH = 128
+
+TOP_N = 25
+
+# Concurrent profiled runs share tracemalloc; the last one out stops it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_started = False
+
+
+def _thread_cpu_clock(thread_id: int) -> Optional[int]:
+    """Return the CPU clock of another thread, where the platform supports it."""
+    try:
+        return time.pthread_getcpuclockid(thread_id)
+    except (AttributeError, OSError):
+        return None
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class InvestigationProfiler:
+    """
+    Samples every thread's Python stack while an investigation runs.
+
+    Each sample is weighted by the wall time since the previous sample and
+    by the CPU time the thread used meanwhile (per-thread CPU clocks), so one
+    pass yields both wall-time and CPU profiles. Resident memory is polled for
+    its peak and tracemalloc records where Python memory was allocated.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between stack samples
+        """
+        self.interval = interval
+        self.target_thread = None
+        self.wall = defaultdict(float)  # (thread name, stack) -> seconds
+        self.cpu = defaultdict(float)
+        self.samples = 0
+        self.peak_rss = _rss_bytes()
+        self.started_at = None
+        self.duration = None
+        self.snapshot = None
+        self.traced_peak = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._cpu_clocks = {}
+        self._cpu_last = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def start(self):
+        """Start sampling; the calling thread is the investigation thread."""
+        global _tracemalloc_users, _tracemalloc_started
+        self.target_thread = threading.get_ident()
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_started = True
+            _tracemalloc_users += 1
+            tracemalloc.reset_peak()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and take the allocation snapshot."""
+        global _tracemalloc_users, _tracemalloc_started
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        with _tracemalloc_lock:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.traced_peak = tracemalloc.get_traced_memory()[1]
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0 and _tracemalloc_started:
+                tracemalloc.stop()
+                _tracemalloc_started = False
+
+    def _run(self):
+        names = {}
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in frames.items():
+                if thread_id == self._thread.ident:
+                    continue
+                name = "investigation" if thread_id == self.target_thread else names.get(thread_id, str(thread_id))
+                key = (name, self._stack(frame))
+                self.wall[key] += elapsed
+                cpu = self._cpu_delta(thread_id)
+                if cpu:
+                    self.cpu[key] += cpu
+            self.samples += 1
+
+            if self.samples % 20 == 0:
+                rss = _rss_bytes()
+                if rss and rss > (self.peak_rss or 0):
+                    self.peak_rss = rss
+
+    def _cpu_delta(self, thread_id: int) -> Optional[float]:
+        if thread_id not in self._cpu_clocks:
+            self._cpu_clocks[thread_id] = _thread_cpu_clock(thread_id)
+        clock = self._cpu_clocks[thread_id]
+        if clock is None:
+            return None
+        try:
+            now = time.clock_gettime(clock)
+        except OSError:
+            return None
+        previous = self._cpu_last.get(thread_id, now)
+        self._cpu_last[thread_id] = now
+        return now - previous
+
+    @staticmethod
+    def _stack(frame) -> tuple:
+        """Stack as (function, file, first line) tuples, outermost first."""
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def top_functions(self, weights: dict, thread: Optional[str] = None, n: int = TOP_N) -> list:
+        """
+        Rank functions by self and inclusive time.
+
+        Args:
+            weights: self.wall or self.cpu
+            thread: Only this thread's samples (e.g. "investigation")
+            n: Number of functions to return
+
+        Returns:
+            List of (function label, self seconds, total seconds), by self time
+        """
+        own = defaultdict(float)
+        total = defaultdict(float)
+        for (name, stack), seconds in weights.items():
+            if (thread and name != thread) or not stack:
+                continue
+            own[stack[-1]] += seconds
+            for frame in set(stack):
+                total[frame] += seconds
+        ranked = sorted(own, key=own.get, reverse=True)[:n]
+        return [(f"{func} ({_short(file)}:{line})", own[(func, file, line)], total[(func, file, line)])
+                for func, file, line in ranked]
+
+    def summary(self, n: int = TOP_N) -> str:
+        """Render a text report of the hottest functions, memory peaks and allocations."""
+        lines = [
+            f"Duration: {self.duration:.1f}s, {self.samples} samples every {self.interval * 1000:.0f}ms",
+            f"Peak RSS during run: {_mb(self.peak_rss)} (process peak: {_mb(_process_peak_rss())})",
+            f"Peak traced Python memory: {_mb(self.traced_peak)}",
+            "",
+        ]
+        for title, weights, thread in (
+            ("CPU time, investigation thread", self.cpu, "investigation"),
+            ("Wall time, investigation thread", self.wall, "investigation"),
+            ("CPU time, all threads", self.cpu, None),
+        ):
+            lines.append(f"== Top {n} by {title} (self / total seconds) ==")
+            for label, own, total in self.top_functions(weights, thread, n):
+                lines.append(f"{own:9.3f} {total:9.3f}  {label}")
+            lines.append("")
+
+        lines.append(f"== Top {n} allocations still held (tracemalloc) ==")
+        for stat in self.snapshot.statistics("lineno")[:n]:
+            frame = stat.traceback[0]
+            lines.append(f"{_mb(stat.size):>10} {stat.count:8} blocks  {_short(frame.filename)}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> dict:
+        """Render wall and CPU profiles per thread in speedscope's file format."""
+        frames = []
+        index = {}
+        profiles = []
+        threads = sorted({thread for thread, _ in self.wall}, key=lambda t: (t != "investigation", t))
+        for thread in threads:
+            for kind, weights in (("wall", self.wall), ("cpu", self.cpu)):
+                samples, sample_weights = [], []
+                for (sample_thread, stack), seconds in weights.items():
+                    if sample_thread != thread or seconds <= 0:
+                        continue
+                    ids = []
+                    for frame in stack:
+                        if frame not in index:
+                            index[frame] = len(frames)
+                            frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                        ids.append(index[frame])
+                    samples.append(ids)
+                    sample_weights.append(seconds)
+                if samples:
+                    profiles.append({
+                        "type": "sampled",
+                        "name": f"{thread} ({kind})",
+                        "unit": "seconds",
+                        "startValue": 0,
+                        "endValue": sum(sample_weights),
+                        "samples": samples,
+                        "weights": sample_weights
+                    })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "mcp-investigation-profiler",
+            "shared": {"frames": frames},
+            "profiles": profiles
+        }
+
+    def collapsed(self) -> str:
+        """Render wall-time stacks in the collapsed format used by flamegraph.pl."""
+        lines = []
+        for (thread, stack), seconds in sorted(self.wall.items()):
+            micros = int(seconds * 1_000_000)
+            if micros:
+                frames = ";".join(func for func, _, _ in stack)
+                lines.append(f"{thread};{frames} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, output_dir: Path, run_id: str) -> dict:
+        """
+        Write the profiling artifacts.
+
+        Args:
+            output_dir: Directory for the artifacts (the session log directory)
+            run_id: Session or trace ID used in the file names
+
+        Returns:
+            Dict of artifact kind -> path
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        files = {
+            "speedscope": output_dir / f"profile_{run_id}.speedscope.json",
+            "collapsed": output_dir / f"profile_{run_id}.collapsed.txt",
+            "summary": output_dir / f"profile_{run_id}.txt"
+        }
+        with open(files["speedscope"], 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(f"investigation {run_id}"), f)
+        files["collapsed"].write_text(self.collapsed(), encoding='utf-8')
+        files["summary"].write_text(self.summary(), encoding='utf-8')
+        return files
+
+
+def _short(filename: str) -> str:
+    """Shorten a source path to its package-relative part."""
+    if "site-packages/" in filename:
+        return filename.split("site-packages/", 1)[1]
+    try:
+        return os.path.relpath(filename)
+    except ValueError:
+        return filename
+
+
+def _mb(size: Optional[int]) -> str:
+    return "n/a" if size is None else f"{size / 1024 / 1024:.1f} MB"
+
+
+def _process_peak_rss() -> int:
+    """Process-wide peak RSS in bytes since the process started."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
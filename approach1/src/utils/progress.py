@@ -0,0 +1,165 @@
+"""Live investigation progress: a background runner and an event aggregator."""
+
+import queue
+import threading
+import time
+from typing import Iterator, Optional
+
+from .cancellation import CancellationToken
+
+
+_DONE = object()
+
+# Tool calls kept for display
+RECENT_TOOLS = 5
+
+
+class BackgroundInvestigation:
+    """
+    Runs MCPInvestigationCrew.investigate() on a worker thread.
+
+    The crew's progress events (see CrewTracer) are queued for the caller,
+    which can render them as they arrive instead of blocking for the whole
+    run, e.g. from a Gradio generator.
+    """
+
+    def __init__(self, crew, topic: str, depth: str, cancel_token: Optional[CancellationToken] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            crew: MCPInvestigationCrew to run
+            topic: Investigation topic
+            depth: Investigation depth
+            cancel_token: Optional token passed to the crew
+        """
+        self.crew = crew
+        self.topic = topic
+        self.depth = depth
+        self.cancel_token = cancel_token
+        self.result = None
+        self.error = None
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="investigation-progress", daemon=True)
+
+    def start(self) -> "BackgroundInvestigation":
+        """Start the investigation thread."""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.crew.investigate(
+                topic=self.topic,
+                depth=self.depth,
+                cancel_token=self.cancel_token,
+                on_event=self._events.put
+            )
+        except Exception as e:
+            self.error = e
+        finally:
+            self._events.put(_DONE)
+
+    def events(self, timeout: float = 1.0) -> Iterator[Optional[dict]]:
+        """
+        Yield progress events until the investigation ends.
+
+        Args:
+            timeout: Seconds to wait for an event before yielding None, so the
+                caller can refresh elapsed times
+
+        Yields:
+            Progress event dicts, or None after timeout seconds without one
+        """
+        while True:
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if event is _DONE:
+                return
+            yield event
+
+    def outcome(self):
+        """Wait for the investigation and return its report artifact, re-raising its error."""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class InvestigationProgress:
+    """Folds progress events into per-phase status and running totals for display."""
+
+    def __init__(self, phases: list):
+        """
+        Initialize the progress state.
+
+        Args:
+            phases: (phase name, agent name) pairs in execution order
+        """
+        self.phases = {
+            name: {"agent": agent, "status": "pending", "started": None, "duration_seconds": None,
+                   "steps": 0, "llm_calls": 0, "tool_calls": 0}
+            for name, agent in phases
+        }
+        self.current = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self.recent_tools = []
+
+    def update(self, event: dict):
+        """Apply one progress event."""
+        phase = self.phases.get(event.get("phase"))
+        kind = event["type"]
+        if phase is None:
+            return
+        if kind == "phase_start":
+            phase.update(status="running", started=event["time"])
+            self.current = event["phase"]
+        elif kind == "phase_end":
+            phase.update(status="done", steps=event["steps"], duration_seconds=event["duration_seconds"])
+            self.current = None
+        elif kind == "llm_call":
+            phase["llm_calls"] += 1
+            self.llm_calls += 1
+            self.prompt_tokens += event.get("prompt_tokens") or 0
+            self.completion_tokens += event.get("completion_tokens") or 0
+        elif kind == "tool_start":
+            phase["tool_calls"] += 1
+            self.recent_tools.append({"tool": event["tool"], "input": event["input"], "duration_seconds": None})
+            del self.recent_tools[:-RECENT_TOOLS]
+        elif kind == "tool_end" and self.recent_tools:
+            self.recent_tools[-1]["duration_seconds"] = event["duration_seconds"]
+
+    def to_dict(self) -> dict:
+        """JSON-serializable snapshot, e.g. for the job store."""
+        return {
+            "phases": self.phases,
+            "current": self.current,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "llm_calls": self.llm_calls,
+            "recent_tools": self.recent_tools
+        }
+
+    @classmethod
+    def from_dict(cls, snapshot: dict) -> "InvestigationProgress":
+        """Rebuild progress from a to_dict() snapshot."""
+        progress = cls([])
+        progress.phases = snapshot["phases"]
+        progress.current = snapshot["current"]
+        progress.prompt_tokens = snapshot["prompt_tokens"]
+        progress.completion_tokens = snapshot["completion_tokens"]
+        progress.llm_calls = snapshot["llm_calls"]
+        progress.recent_tools = snapshot["recent_tools"]
+        return progress
+
+    def elapsed(self, name: str) -> Optional[float]:
+        """Seconds a phase has been running, or its final duration."""
+        phase = self.phases[name]
+        if phase["duration_seconds"] is not None:
+            return phase["duration_seconds"]
+        return time.time() - phase["started"] if phase["started"] else None
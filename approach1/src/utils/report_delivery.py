@@ -0,0 +1,234 @@
+"""HTTP delivery helpers for saved reports: validators, negotiation and compressed variants."""
+
+import gzip
+import hashlib
+import os
+import re
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+
+# Reports smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+CACHE_DIRNAME = ".cache"
+
+# Files served as reports; sidecars, caches, the index and partial writes are not
+REPORT_SUFFIXES = (".md", ".md.gz")
+
+
+def resolve_report_path(output_dir: Path, filename: str) -> Optional[Path]:
+    """
+    Resolve a requested report name to a report file inside the output directory.
+
+    Args:
+        output_dir: Directory containing the reports
+        filename: Requested report filename
+
+    Returns:
+        Resolved path, or None if it does not exist, escapes output_dir, is
+        not a report (.md or .md.gz) or lies under a hidden (dot) name
+    """
+    root = Path(output_dir).resolve()
+    path = (root / filename).resolve()
+    if root not in path.parents or not path.is_file():
+        return None
+    if not path.name.endswith(REPORT_SUFFIXES):
+        return None
+    if any(part.startswith(".") for part in path.relative_to(root).parts):
+        return None
+    return path
+
+
+@lru_cache(maxsize=4096)
+def _content_hash(path: str, size: int, mtime_ns: int) -> str:
+    """Hash file content; cached until the file's size or mtime changes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def content_hash(path: Path) -> str:
+    """Return the content hash of a file."""
+    stat = path.stat()
+    return _content_hash(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def validators(path: Path, encoding: Optional[str] = None) -> dict:
+    """
+    Build validator headers for a report representation.
+
+    Args:
+        path: Report path
+        encoding: Content coding of the representation, if compressed
+
+    Returns:
+        Dict with a strong ETag and Last-Modified header
+    """
+    tag = content_hash(path)
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return {
+        "etag": f'"{tag}"',
+        "last-modified": formatdate(path.stat().st_mtime, usegmt=True)
+    }
+
+
+def is_not_modified(request_headers, response_headers: dict) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against a representation.
+
+    Args:
+        request_headers: Incoming request headers
+        response_headers: Validators from validators()
+
+    Returns:
+        True if the client's cached copy is current (send 304)
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = response_headers["etag"]
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(response_headers["last-modified"])
+        except (TypeError, ValueError):
+            return False
+        return modified <= since
+
+    return False
+
+
+def byte_range(range_header: Optional[str], size: int) -> Optional[tuple]:
+    """
+    Parse a single-range Range header against a representation's length.
+
+    Args:
+        range_header: Value of the Range header
+        size: Length of the representation in bytes
+
+    Returns:
+        Inclusive (first, last) byte positions, or None if the header is
+        absent, malformed or asks for several ranges (serve the whole body)
+
+    Raises:
+        ValueError: If the range lies beyond the end (answer 416)
+    """
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", range_header or "", re.IGNORECASE)
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(f"Unsatisfiable range: {range_header}")
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Unsatisfiable range: {range_header}")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _encoding_weights(accept_encoding: str) -> dict:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    return weights
+
+
+def accepts_encoding(accept_encoding: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows a content coding."""
+    if not accept_encoding:
+        return False
+    weights = _encoding_weights(accept_encoding)
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "br", "gzip", or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    weights = _encoding_weights(accept_encoding)
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [
+        (weights.get(coding, weights.get("*", 0.0)), -rank, coding)
+        for rank, coding in enumerate(supported)
+    ]
+    q, _, coding = max(candidates)
+    return coding if q > 0 else None
+
+
+def variant_path(path: Path, encoding: str) -> Path:
+    """Return where the compressed copy of a report is cached."""
+    suffix = "gz" if encoding == "gzip" else "br"
+    return path.parent / CACHE_DIRNAME / f"{content_hash(path)}.{suffix}"
+
+
+def compressed_variant(path: Path, encoding: str) -> Path:
+    """
+    Return a compressed copy of a report, creating it on first use.
+
+    Variants are keyed by content hash, so a rewritten report never serves
+    a stale variant.
+
+    Args:
+        path: Report path
+        encoding: "gzip" or "br"
+
+    Returns:
+        Path of the compressed file
+    """
+    variant = variant_path(path, encoding)
+    if variant.exists():
+        return variant
+
+    variant.parent.mkdir(parents=True, exist_ok=True)
+    data = path.read_bytes()
+    if encoding == "gzip":
+        compressed = gzip.compress(data, compresslevel=6, mtime=0)
+    else:
+        compressed = brotli.compress(data, quality=9)
+
+    # Write-then-rename so concurrent requests never see a partial file
+    tmp = variant.with_name(f"{variant.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(compressed)
+    os.replace(tmp, variant)
+    return variant
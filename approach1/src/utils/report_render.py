@@ -0,0 +1,162 @@
+"""Cached HTML rendering of reports, with a table of contents and section index.
+
+Renders are keyed by the hash of the report's markdown and stored in the
+output directory's .cache/, so every view of the same report, saved in
+any date shard and compressed or not, or passed in as text, serves one
+render. The crew pre-renders each report in the background when it saves it.
+"""
+
+import hashlib
+import html
+import json
+import os
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+try:
+    import markdown
+except ImportError:  # Optional dependency
+    markdown = None
+
+from .. import config
+from ..storage.artifacts import read_report
+from .report_delivery import CACHE_DIRNAME
+
+
+# Bump when the rendering changes so old renders are not served
+RENDER_VERSION = 1
+
+EXTENSIONS = ["extra", "codehilite", "tables", "fenced_code", "toc"]
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-render")
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a markdown code fence wrapping a whole report, as LLMs sometimes add."""
+    text = str(text).strip()
+    if text.startswith('```markdown'):
+        text = text[len('```markdown'):].strip()
+        if text.endswith('```'):
+            text = text[:-3].strip()
+    elif text.startswith('```'):
+        text = text[3:].strip()
+        if text.endswith('```'):
+            text = text[:-3].strip()
+    return text
+
+
+def _sections(tokens: list) -> list:
+    """Flatten markdown's nested TOC tokens into a heading index."""
+    sections = []
+    for token in tokens:
+        sections.append({"level": token["level"], "id": token["id"], "title": token["name"]})
+        sections.extend(_sections(token["children"]))
+    return sections
+
+
+def render_markdown(text: str) -> dict:
+    """
+    Render report markdown.
+
+    Args:
+        text: Report markdown
+
+    Returns:
+        Dict with html, toc (HTML list of headings) and sections (level, id
+        and title of each heading, in document order)
+    """
+    text = strip_code_fence(text)
+    if markdown is None:
+        return {"html": f"<pre>{html.escape(text)}</pre>", "toc": "", "sections": []}
+
+    # Markdown instances keep per-document state, so each render gets its own
+    md = markdown.Markdown(extensions=EXTENSIONS)
+    body = md.convert(text)
+    return {"html": body, "toc": md.toc, "sections": _sections(md.toc_tokens)}
+
+
+def _text_hash(text: str) -> str:
+    """Hash of report markdown; the key of its render."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+@lru_cache(maxsize=4096)
+def _report_hash(path: str, size: int, mtime_ns: int) -> str:
+    """Hash a report file's markdown; cached until its size or mtime changes."""
+    return _text_hash(read_report(Path(path)))
+
+
+def report_hash(path: Path) -> str:
+    """Return the render key of a report file, decompressing .md.gz reports."""
+    stat = path.stat()
+    return _report_hash(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def rendered_path(output_dir: Path, key: str) -> Path:
+    """Return where the render of the report with content hash key is cached."""
+    return Path(output_dir) / CACHE_DIRNAME / f"{key}.render-v{RENDER_VERSION}.json"
+
+
+@lru_cache(maxsize=64)
+def _load(path: str) -> dict:
+    """Read a cached render; renders never change once written."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _rendered(output_dir: Path, key: str, text: str) -> dict:
+    cached = rendered_path(output_dir, key)
+    if cached.exists():
+        return _load(str(cached))
+
+    rendered = {"content_hash": key, **render_markdown(text)}
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so concurrent readers never see a partial file
+    tmp = cached.with_name(f"{cached.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(rendered), encoding="utf-8")
+    os.replace(tmp, cached)
+    return rendered
+
+
+def is_rendered(path: Path, output_dir: Optional[Path] = None) -> bool:
+    """Whether a report file's render is already cached."""
+    return rendered_path(output_dir or config.OUTPUT_DIR, report_hash(path)).exists()
+
+
+def get_rendered(path: Path, output_dir: Optional[Path] = None) -> dict:
+    """
+    Return the render of a report file, rendering it on first use.
+
+    Args:
+        path: Report path inside the output directory
+        output_dir: Output directory whose cache to use; defaults to OUTPUT_DIR
+
+    Returns:
+        Dict with content_hash, html, toc and sections
+    """
+    return _rendered(output_dir or config.OUTPUT_DIR, report_hash(path), read_report(path))
+
+
+def render_text(text: str, output_dir: Optional[Path] = None) -> dict:
+    """
+    Return the render of report text, sharing the cache with saved reports.
+
+    A report saved under output_dir with the same markdown hits the same entry.
+
+    Args:
+        text: Report markdown
+        output_dir: Output directory whose cache to use; defaults to OUTPUT_DIR
+
+    Returns:
+        Dict with content_hash, html, toc and sections
+    """
+    text = str(text)
+    return _rendered(output_dir or config.OUTPUT_DIR, _text_hash(text), text)
+
+
+def prerender(path: Path, output_dir: Optional[Path] = None) -> Future:
+    """Render a newly saved report in the background so its first view is served from cache."""
+    return _executor.submit(get_rendered, Path(path), output_dir)
@@ -0,0 +1,222 @@
+"""Local stand-ins for the LLM and search APIs, for offline benchmarks and tests.
+
+One HTTP server answers OpenAI-compatible chat completions (plain and
+streamed), Serper web search (POST /search) and GitHub search (GET
+/search/code, /search/repositories). Latency and token throughput are
+configurable, and the time spent in simulated waits is recorded so callers
+can separate backend time from the orchestration overhead around it.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse
+
+
+_TOOL_NAME = re.compile(r"Tool Name: (\w+)")
+
+# Share of completion tokens sent per streamed chunk
+STREAM_CHUNKS = 8
+
+
+def _report(tokens: int) -> str:
+    """Markdown report of roughly the given number of tokens."""
+    sentence = "The MCP server exposes tools over JSON-RPC with typed schemas."
+    sections = []
+    words = 0
+    while words < tokens:
+        sections.append(f"## Section {len(sections) + 1}\n\n{' '.join([sentence] * 4)}\n")
+        words += 44
+    return "# Investigation Report\n\n" + "\n".join(sections)
+
+
+class StubBackend:
+    """
+    Threaded HTTP server imitating the OpenAI, Serper and GitHub APIs.
+
+    Agents with tools first get a ReAct tool call for their first tool, then
+    (once the conversation holds an answer and its observation) a final
+    answer; agents without tools answer directly.
+    """
+
+    def __init__(
+        self,
+        llm_latency: float = 0.05,
+        tokens_per_second: Optional[float] = None,
+        completion_tokens: int = 300,
+        search_latency: float = 0.02,
+        port: int = 0
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            llm_latency: Seconds before the first token of each completion
+            tokens_per_second: Completion throughput; None sends tokens instantly
+            completion_tokens: Length of final answers
+            search_latency: Seconds per search request
+            port: Port to listen on; 0 picks a free one
+        """
+        self.llm_latency = llm_latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.search_latency = search_latency
+        self.answer = _report(completion_tokens)
+        self.requests = Counter()
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubBackend":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def env(self) -> dict:
+        """Environment variables that point the LLM client and search tools at this backend."""
+        return {
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+            "OPENAI_API_BASE": f"{self.url}/v1",
+            "SERPER_API_URL": self.url,
+            "SERPER_API_KEY": "stub",
+            "GITHUB_API_URL": self.url,
+        }
+
+    def _wait(self, seconds: float, kind: Optional[str] = None):
+        """Sleep for a simulated wait and count it (and the request, if kind is given)."""
+        if seconds > 0:
+            time.sleep(seconds)
+        with self._lock:
+            self.waited_seconds += max(seconds, 0.0)
+            if kind:
+                self.requests[kind] += 1
+
+    def _completion(self, body: dict) -> tuple:
+        """Return (content, prompt_tokens, completion_tokens) for a chat request."""
+        messages = body.get("messages") or []
+        text = " ".join(str(message.get("content") or "") for message in messages)
+        tool = _TOOL_NAME.search(text)
+        answered = any(message.get("role") == "assistant" for message in messages)
+        if tool and not answered:
+            content = (f"Thought: I should search for this\nAction: {tool.group(1)}\n"
+                       f'Action Input: {{"query": "model context protocol"}}')
+            completion_tokens = 30
+        else:
+            content = f"Thought: I now can give a great answer\nFinal Answer: {self.answer}"
+            completion_tokens = self.completion_tokens
+        return content, len(text) // 4, completion_tokens
+
+    def _generation_seconds(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _search_results(self, path: str) -> dict:
+        if path == "/search":
+            return {"organic": [
+                {"title": f"MCP result {i}", "link": f"https://example.com/mcp/{i}",
+                 "snippet": "Model Context Protocol servers expose tools, resources and prompts."}
+                for i in range(5)
+            ]}
+        if path == "/search/code":
+            return {"total_count": 5, "items": [
+                {"name": "server.py", "path": f"src/server_{i}.py", "html_url": f"https://github.com/example/mcp-{i}",
+                 "repository": {"full_name": f"example/mcp-{i}"}}
+                for i in range(5)
+            ]}
+        return {"total_count": 5, "items": [
+            {"full_name": f"example/mcp-{i}", "description": "An MCP server", "stargazers_count": 100 * i,
+             "forks_count": 10 * i, "language": "Python", "html_url": f"https://github.com/example/mcp-{i}"}
+            for i in range(5)
+        ]}
+
+    def _handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path not in ("/search/code", "/search/repositories"):
+                    self.send_error(404)
+                    return
+                backend._wait(backend.search_latency, "github")
+                self._send_json(backend._search_results(path))
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if path == "/search":
+                    backend._wait(backend.search_latency, "serper")
+                    self._send_json(backend._search_results(path))
+                elif path.endswith("/chat/completions"):
+                    self._chat(body)
+                else:
+                    self.send_error(404)
+
+            def _chat(self, body: dict):
+                content, prompt_tokens, completion_tokens = backend._completion(body)
+                usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                         "total_tokens": prompt_tokens + completion_tokens}
+                base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": body.get("model")}
+                generation = backend._generation_seconds(completion_tokens)
+                if not body.get("stream"):
+                    backend._wait(backend.llm_latency + generation, "llm")
+                    self._send_json({**base, "object": "chat.completion", "usage": usage, "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                    ]})
+                    return
+
+                backend._wait(backend.llm_latency, "llm")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                step = -(-len(content) // STREAM_CHUNKS)
+                for start in range(0, len(content), step):
+                    backend._wait(generation / STREAM_CHUNKS)
+                    chunk = {**base, "object": "chat.completion.chunk", "choices": [
+                        {"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}
+                    ]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                final = {**base, "object": "chat.completion.chunk", "usage": usage,
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                self.close_connection = True
+
+        return Handler
@@ -0,0 +1,56 @@
+"""Local token counting for prompt size estimates."""
+
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency
+    tiktoken = None
+
+
+# Characters per token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+DEFAULT_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: Optional[str]):
+    """Return the tiktoken encoding for a model, or None if it cannot be loaded."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+    except KeyError:
+        # Model unknown to this tiktoken version
+        return _encoding(None) if model else None
+    except Exception:
+        # Encoding files are fetched once and cached; offline hosts may not have them
+        return None
+
+
+def tokenizer_name(model: Optional[str] = None) -> str:
+    """Describe the tokenizer count_tokens() uses for a model."""
+    encoding = _encoding(model)
+    return f"tiktoken:{encoding.name}" if encoding else f"chars/{CHARS_PER_TOKEN}"
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text for a model.
+
+    Uses tiktoken when it is installed and falls back to a characters per
+    token heuristic otherwise.
+
+    Args:
+        text: Text to count
+        model: Model name used to pick the encoding
+
+    Returns:
+        Number of tokens
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,442 @@
+"""Span-based tracing of investigations, exported in Chrome trace format."""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class Span:
+    """A timed operation with attributes, nested under a parent span."""
+
+    __slots__ = ("span_id", "parent_id", "name", "category", "start_ns", "end_ns", "thread_id", "attributes")
+
+    def __init__(self, name: str, category: str, parent_id: Optional[str] = None, **attributes):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.thread_id = threading.get_ident()
+        self.attributes = attributes
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        """Span duration, or None while it is still open."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def end(self, **attributes):
+        """Close the span (idempotent)."""
+        self.attributes.update(attributes)
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+
+
+class Tracer:
+    """
+    Collects the spans of one investigation.
+
+    Spans nest investigation -> phase -> agent step -> tool / LLM call ->
+    HTTP request. export() writes a Chrome trace (JSON object format) that
+    opens offline in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            trace_id: Optional trace ID, generates new one if not provided
+        """
+        self.trace_id = trace_id or uuid.uuid4().hex[:8]
+        self.spans = []
+        self._origin_ns = time.perf_counter_ns()
+        self._wall_origin = time.time()
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, category: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        Open a span without making it current.
+
+        Args:
+            name: Span name
+            category: Span category (investigation, phase, agent_step, tool, llm, http)
+            parent: Parent span; defaults to the current span
+            **attributes: Initial span attributes
+
+        Returns:
+            The open span; call end() on it
+        """
+        parent = parent or _current_span.get()
+        span = Span(name, category, parent.span_id if parent else None, **attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, category: str, **attributes):
+        """Context manager that opens a span and makes it current."""
+        span = self.start_span(name, category, **attributes)
+        reset = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(reset)
+            span.end()
+
+    def find_ancestor(self, span: Span, category: str) -> Optional[Span]:
+        """Return the closest enclosing span of a category, e.g. a tool call's phase."""
+        spans = {s.span_id: s for s in self.spans}
+        parent = spans.get(span.parent_id)
+        while parent is not None and parent.category != category:
+            parent = spans.get(parent.parent_id)
+        return parent
+
+    def to_chrome_trace(self) -> dict:
+        """Render spans as a Chrome trace document."""
+        now_ns = time.perf_counter_ns()
+        events = []
+        for span in self.spans:
+            end_ns = span.end_ns if span.end_ns is not None else now_ns
+            args = dict(span.attributes, span_id=span.span_id, parent_id=span.parent_id)
+            if span.end_ns is None:
+                args["unfinished"] = True
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_ns) / 1000,
+                "dur": (end_ns - span.start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+                "args": args
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self.trace_id, "start_time": self._wall_origin}
+        }
+
+    def export(self, path: Path) -> Path:
+        """
+        Write the trace to a file.
+
+        Args:
+            path: Destination .json file
+
+        Returns:
+            Path to the written trace
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        return path
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+_current_crew_tracer: ContextVar[Optional["CrewTracer"]] = ContextVar("crew_tracer", default=None)
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Return the tracer of the investigation running in this context, if any."""
+    return _current_tracer.get()
+
+
+def current_crew_tracer() -> Optional["CrewTracer"]:
+    """Return the crew tracer of the investigation running in this context, if any."""
+    return _current_crew_tracer.get()
+
+
+@contextmanager
+def trace_span(name: str, category: str, **attributes):
+    """
+    Open a span under the current tracer; a no-op outside a traced investigation.
+
+    Tools use this to time outbound requests, e.g.
+    ``with trace_span("GET api.github.com", "http") as span: ... span.set(status=...)``.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield Span(name, category, **attributes)
+        return
+    with tracer.span(name, category, **attributes) as span:
+        yield span
+
+
+@contextmanager
+def tracing_scope(tracer: Optional[Tracer], crew_tracer: Optional["CrewTracer"] = None):
+    """
+    Make a tracer current for the code inside the block.
+
+    With a crew_tracer, CrewAI's LLM and tool call hooks also record spans
+    for the crew kicked off inside the block.
+    """
+    if crew_tracer is not None:
+        _install_hooks()
+    reset_tracer = _current_tracer.set(tracer)
+    reset_crew = _current_crew_tracer.set(crew_tracer)
+    try:
+        yield tracer
+    finally:
+        _current_crew_tracer.reset(reset_crew)
+        _current_tracer.reset(reset_tracer)
+
+
+class CrewTracer:
+    """
+    Builds phase, agent-step, LLM-call and tool-call spans for a sequential crew.
+
+    CrewAI has no task-start hook, so each phase runs from the end of the
+    previous one (or kickoff) to its task callback, and each agent step runs
+    from its first LLM call to the step callback. LLM and tool spans come
+    from CrewAI's before/after call hooks, which run on the crew's thread.
+    Full LLM responses and tool results are kept in payloads, outside the
+    span attributes, so they reach the session log but not the trace file.
+
+    An optional on_event listener receives a small dict as each phase, LLM
+    call and tool call starts or ends, for live progress displays.
+    """
+
+    def __init__(self, tracer: Tracer, phases: list, on_event: Optional[Callable[[dict], None]] = None):
+        """
+        Initialize the crew tracer.
+
+        Args:
+            tracer: Tracer receiving the spans
+            phases: Phase names in execution order
+            on_event: Called on the crew's thread with progress events; must not block
+        """
+        self.tracer = tracer
+        self.phases = phases
+        self.on_event = on_event
+        self.phase_index = -1
+        self.phase_span = None
+        self.step_span = None
+        self.llm_span = None
+        self.tool_span = None
+        self.step_count = 0
+        self.payloads = {}  # span_id -> full LLM response / tool input and result
+        self._usage_before = {}
+        self._tool_reset = None
+        self._attempt_start_ns = None
+
+    def _emit(self, event_type: str, **fields):
+        """Send a progress event to the listener; listener errors never reach the crew."""
+        if self.on_event is None:
+            return
+        phase = self.phases[self.phase_index] if 0 <= self.phase_index < len(self.phases) else None
+        agent = self.phase_span.attributes.get("agent") if self.phase_span else None
+        try:
+            self.on_event({"type": event_type, "phase": phase, "agent": agent, "time": time.time(), **fields})
+        except Exception:
+            pass
+
+    def start_phase(self, agent: str) -> Optional[Span]:
+        """Close the current phase and open the next one."""
+        self.end_phase()
+        self.phase_index += 1
+        if self.phase_index >= len(self.phases):
+            return None
+        self.step_count = 0
+        self.phase_span = self.tracer.start_span(
+            self.phases[self.phase_index],
+            "phase",
+            phase=self.phase_index + 1,
+            agent=agent
+        )
+        self._emit("phase_start", index=self.phase_index + 1, total=len(self.phases))
+        return self.phase_span
+
+    def end_phase(self):
+        """Close the current phase and any spans still open inside it."""
+        self.end_step()
+        if self.phase_span:
+            self.phase_span.end(steps=self.step_count)
+            self._emit(
+                "phase_end",
+                index=self.phase_index + 1,
+                steps=self.step_count,
+                duration_seconds=round(self.phase_span.duration_seconds, 3)
+            )
+            self.phase_span = None
+
+    def _ensure_step(self) -> Span:
+        if self.step_span is None:
+            self.step_count += 1
+            self.step_span = self.tracer.start_span(
+                f"step {self.step_count}",
+                "agent_step",
+                parent=self.phase_span,
+                step=self.step_count
+            )
+        return self.step_span
+
+    def end_step(self, **attributes):
+        """Close the current agent step."""
+        for span in (self.tool_span, self.llm_span):
+            if span and span.end_ns is None:
+                span.end(unfinished=True)
+        self.tool_span = self.llm_span = None
+        if self.step_span:
+            self.step_span.end(**attributes)
+            self.step_span = None
+
+    def before_llm_call(self, context):
+        """Open an LLM call span (CrewAI before_llm_call hook)."""
+        if self.llm_span is not None:
+            # The previous call raised instead of returning; CrewAI is retrying it
+            self.llm_span.end(status="error", retries=max(self.llm_span.attributes["attempts"] - 1, 0))
+        step = self._ensure_step()
+        llm = context.llm
+        self.llm_span = self.tracer.start_span(
+            "llm call",
+            "llm",
+            parent=step,
+            model=getattr(llm, "model", str(llm)),
+            messages=len(context.messages),
+            prompt_chars=message_chars(context.messages),
+            iteration=context.iterations,
+            attempts=0
+        )
+        self._usage_before = _token_usage(llm)
+
+    def llm_attempt(self):
+        """Count an HTTP attempt of the current LLM call (transport interceptor)."""
+        if self.llm_span is not None:
+            self.llm_span.attributes["attempts"] += 1
+            self._attempt_start_ns = time.perf_counter_ns()
+
+    def llm_response(self, status_code: int):
+        """Record the HTTP status of the current LLM call's latest attempt."""
+        if self.llm_span is not None:
+            self.llm_span.set(http_status=status_code)
+
+    def llm_first_byte(self, at_ns: int):
+        """Record time to first token of the current LLM call's latest attempt."""
+        if self.llm_span is not None and self._attempt_start_ns is not None:
+            self.llm_span.set(ttft_seconds=round((at_ns - self._attempt_start_ns) / 1e9, 3))
+
+    def after_llm_call(self, context):
+        """Close the LLM call span with the tokens it used (CrewAI after_llm_call hook)."""
+        span = self.llm_span
+        if span is None:
+            return
+        before = self._usage_before
+        after = _token_usage(context.llm)
+        span.end(
+            status="ok",
+            response_chars=len(context.response or ""),
+            retries=max(span.attributes["attempts"] - 1, 0),
+            **{key: after.get(key, 0) - before.get(key, 0) for key in after}
+        )
+        if isinstance(context.response, str):
+            self.payloads[span.span_id] = {"response": context.response}
+        self.llm_span = None
+        self._emit(
+            "llm_call",
+            model=span.attributes["model"],
+            prompt_tokens=span.attributes.get("prompt_tokens", 0),
+            completion_tokens=span.attributes.get("completion_tokens", 0),
+            latency_seconds=round(span.duration_seconds, 3)
+        )
+
+    def before_tool_call(self, context):
+        """Open a tool call span and make it current for HTTP spans (before_tool_call hook)."""
+        step = self._ensure_step()
+        self.tool_span = self.tracer.start_span(
+            context.tool_name,
+            "tool",
+            parent=step,
+            tool=context.tool_name,
+            input=str(context.tool_input)[:200]
+        )
+        self._tool_reset = _current_span.set(self.tool_span)
+        self._emit("tool_start", tool=context.tool_name, input=self.tool_span.attributes["input"])
+
+    def after_tool_call(self, context):
+        """Close the tool call span (CrewAI after_tool_call hook)."""
+        span = self.tool_span
+        if span is None:
+            return
+        if self._tool_reset is not None:
+            _current_span.reset(self._tool_reset)
+            self._tool_reset = None
+        result = str(context.tool_result or "")
+        span.end(result_chars=len(result))
+        self.payloads[span.span_id] = {"tool_input": str(context.tool_input), "result": result}
+        self.tool_span = None
+        self._emit(
+            "tool_end",
+            tool=span.name,
+            result_chars=len(result),
+            duration_seconds=round(span.duration_seconds, 3)
+        )
+
+
+def message_chars(messages) -> int:
+    """Size of an LLM prompt in characters (a message list or a plain string)."""
+    if isinstance(messages, str):
+        return len(messages)
+    return sum(len(str(message.get("content") or "")) for message in messages if isinstance(message, dict))
+
+
+def _token_usage(llm) -> dict:
+    """Snapshot an LLM's cumulative token counters."""
+    usage = getattr(llm, "_token_usage", None)
+    if not isinstance(usage, dict):
+        return {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "cached_prompt_tokens": usage.get("cached_prompt_tokens", 0)
+    }
+
+
+def _dispatch(method: str):
+    """Build a CrewAI hook that forwards to the current CrewTracer."""
+    def hook(context):
+        crew_tracer = _current_crew_tracer.get()
+        if crew_tracer is not None:
+            getattr(crew_tracer, method)(context)
+        return None
+    hook.__name__ = f"trace_{method}"
+    return hook
+
+
+def _install_hooks():
+    """Register the tracing hooks with CrewAI once per process."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        from crewai.hooks import (
+            register_after_llm_call_hook,
+            register_after_tool_call_hook,
+            register_before_llm_call_hook,
+            register_before_tool_call_hook,
+        )
+
+        register_before_llm_call_hook(_dispatch("before_llm_call"))
+        register_after_llm_call_hook(_dispatch("after_llm_call"))
+        register_before_tool_call_hook(_dispatch("before_tool_call"))
+        register_after_tool_call_hook(_dispatch("after_tool_call"))
+        _hooks_installed = True
@@ -1,12 +1,73 @@
-"""Version information for MCP Investigation Tool."""
+"""Version information for MCP Investigation Tool.
 
+Versions are collected once per process and then served from memory.
+Container images record them at build time in build_info.json (see
+write_build_info); elsewhere the git commit comes from the GIT_COMMIT
+environment variable or, failing that, a single `git rev-parse`.
+Call refresh_version_info() to collect them again.
+
+Usage:
+    python -m src.utils.version_info --write-build-info --git-commit <sha>
+"""
+
+import argparse
+import copy
+import json
+import os
 import subprocess
-from typing import Dict
+from datetime import datetime
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
+from typing import Dict, Optional
 
 
-def get_agent_versions() -> Dict[str, str]:
-    """Get version information for all agents and dependencies."""
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Written at image build time; kept outside src/ so source mounts don't hide it
+BUILD_INFO_PATH = PROJECT_ROOT / "build_info.json"
+
+APP_VERSION = "1.1.0"
+DEPENDENCIES = ("crewai", "openai", "gradio")
+
+
+def _dependency_versions() -> Dict[str, str]:
+    """Installed versions of DEPENDENCIES, read from package metadata without importing them."""
+    versions = {}
+    for package in DEPENDENCIES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = "unknown"
+    return versions
+
+
+def _git_commit() -> str:
+    """Short commit of the working tree, or GIT_COMMIT if set."""
+    if os.environ.get("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"][:7]
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            stderr=subprocess.DEVNULL,
+            timeout=5
+        ).decode().strip()
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return "not-available"
+
+
+def _build_info() -> dict:
+    """Build-time versions from BUILD_INFO_PATH, collected now if the file is absent."""
+    try:
+        return json.loads(BUILD_INFO_PATH.read_text())
+    except (OSError, ValueError):
+        return {"git_commit": _git_commit(), "dependencies": _dependency_versions()}
+
+
+@lru_cache(maxsize=1)
+def _collect_versions() -> dict:
+    """Collect version information; cached until refresh_version_info()."""
     # Import config to get model information
     try:
         from ..config import RESEARCH_MODEL, ANALYSIS_MODEL
@@ -14,8 +75,9 @@ def get_agent_versions() -> Dict[str, str]:
         RESEARCH_MODEL = "gpt-4o-mini"
         ANALYSIS_MODEL = "gpt-4o"
 
-    versions = {
-        "app_version": "1.1.0",
+    build = _build_info()
+    return {
+        "app_version": APP_VERSION,
         "agents": {
             "mcp_researcher": {
                 "version": "1.0.0",
@@ -34,42 +96,46 @@ def get_agent_versions() -> Dict[str, str]:
                 "model": ANALYSIS_MODEL
             }
         },
-        "dependencies": {}
+        "dependencies": dict(build.get("dependencies", {})),
+        "git_commit": build.get("git_commit", "not-available"),
+        "built_at": build.get("built_at")
     }
 
-    # Get installed package versions
-    try:
-        import crewai
-        versions["dependencies"]["crewai"] = crewai.__version__
-    except (ImportError, AttributeError):
-        versions["dependencies"]["crewai"] = "unknown"
 
-    try:
-        import openai
-        versions["dependencies"]["openai"] = openai.__version__
-    except (ImportError, AttributeError):
-        versions["dependencies"]["openai"] = "unknown"
+def get_agent_versions() -> Dict[str, str]:
+    """Get version information for all agents and dependencies."""
+    return copy.deepcopy(_collect_versions())
 
-    try:
-        import gradio
-        versions["dependencies"]["gradio"] = gradio.__version__
-    except (ImportError, AttributeError):
-        versions["dependencies"]["gradio"] = "unknown"
 
-    # Get Git commit if available
-    try:
-        git_commit = subprocess.check_output(
-            ["git", "rev-parse", "--short", "HEAD"],
-            cwd=Path(__file__).parent.parent.parent,
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-        versions["git_commit"] = git_commit
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        versions["git_commit"] = "not-available"
+def refresh_version_info() -> Dict[str, str]:
+    """Discard the cached version information and collect it again."""
+    _collect_versions.cache_clear()
+    format_version_info.cache_clear()
+    return get_agent_versions()
 
-    return versions
 
+def write_build_info(path: Path = BUILD_INFO_PATH, git_commit: Optional[str] = None) -> Path:
+    """
+    Record the git commit and dependency versions of a build.
 
+    Args:
+        path: File to write
+        git_commit: Commit to record; detected from the environment or git if omitted
+
+    Returns:
+        Path to the written file
+    """
+    info = {
+        "git_commit": git_commit[:7] if git_commit else _git_commit(),
+        "dependencies": _dependency_versions(),
+        "built_at": datetime.now().isoformat(timespec="seconds")
+    }
+    path = Path(path)
+    path.write_text(json.dumps(info, indent=2) + "\n")
+    return path
+
+
+@lru_cache(maxsize=1)
 def format_version_info() -> str:
     """Format version information for display."""
     versions = get_agent_versions()
@@ -91,3 +157,21 @@ def format_version_info() -> str:
 - Gradio: {versions['dependencies'].get('gradio', 'unknown')}
 """
     return info
+
+
+def main(argv=None):
+    """Write build_info.json or print the current version information."""
+    parser = argparse.ArgumentParser(description="Show or record version information")
+    parser.add_argument("--write-build-info", action="store_true",
+                        help=f"Record the commit and dependency versions in {BUILD_INFO_PATH.name}")
+    parser.add_argument("--git-commit", help="Commit to record (default: GIT_COMMIT or git rev-parse)")
+    args = parser.parse_args(argv)
+
+    if args.write_build_info:
+        print(f"Wrote {write_build_info(git_commit=args.git_commit)}")
+    else:
+        print(json.dumps(get_agent_versions(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Background worker that runs queued investigations from the shared job store."""
+
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from .config import get_settings
+from .storage.jobs import JobStore
+from .utils.cancellation import CancellationToken, InvestigationCancelled
+from .utils.progress import InvestigationProgress
+
+
+# Imported in the background when a worker starts, so the process answers
+# health checks right away and the first job does not pay for them
+WARM_IMPORTS = (
+    "crewai",
+    ".agents.mcp_researcher",
+    ".agents.tech_analyst",
+    ".agents.architect",
+    ".agents.writer",
+    ".tasks.investigation_tasks",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InvestigationWorker:
+    """
+    Claims queued jobs and runs them on a local thread pool.
+
+    One worker runs inside each API process. Workers only pull jobs when they
+    have a free slot, so a busy process never holds work that an idle process
+    could start. A cancelled job gives its slot back immediately; its thread
+    winds down at the crew's next checkpoint.
+    """
+
+    def __init__(self, store: JobStore, max_concurrent: Optional[int] = None):
+        """
+        Initialize the worker.
+
+        Args:
+            store: Shared job store
+            max_concurrent: Maximum investigations running in this process;
+                defaults to the MAX_CONCURRENT_INVESTIGATIONS setting
+        """
+        self.settings = get_settings()
+        max_concurrent = max_concurrent or self.settings.max_concurrent_investigations
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Spare threads let new jobs start while cancelled ones wind down
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent * 2,
+            thread_name_prefix="investigation"
+        )
+        self._slots = threading.Semaphore(max_concurrent)
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._running = {}
+        self._stopping = threading.Event()
+        self._thread = None
+        self.warm = threading.Event()
+
+    @property
+    def active(self) -> int:
+        """Number of investigations currently running in this process."""
+        return self._active
+
+    def start(self):
+        """Start polling the job store and warming up CrewAI in background threads."""
+        threading.Thread(target=self._warm_up, name="worker-warmup", daemon=True).start()
+        self._thread = threading.Thread(target=self._poll_loop, name="job-poller", daemon=True)
+        self._thread.start()
+
+    def _warm_up(self):
+        """Import the crew's heavy dependencies ahead of the first job."""
+        try:
+            for module in WARM_IMPORTS:
+                importlib.import_module(module, __package__)
+        finally:
+            self.warm.set()
+
+    def drain(self):
+        """Stop claiming new jobs and wait for running investigations to finish."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+        # Keep the leases of draining jobs fresh, or other workers fail them as lost
+        while self._running:
+            self.store.heartbeat(self.worker_id, active=self._active, capacity=self.max_concurrent)
+            time.sleep(self.settings.job_poll_interval)
+        self._executor.shutdown(wait=True)
+        self.store.remove_worker(self.worker_id)
+
+    def _poll_loop(self):
+        """Claim jobs whenever a slot is free until the worker is drained."""
+        while not self._stopping.is_set():
+            # A store error (e.g. "database is locked") must not end the loop, or
+            # this process stops heartbeating and its jobs are failed as lost
+            try:
+                self._poll_once()
+            except Exception:
+                logger.exception("Job poll failed on worker %s; retrying", self.worker_id)
+            self._stopping.wait(self.settings.job_poll_interval)
+
+    def _poll_once(self):
+        """Heartbeat, expire lost jobs, apply cancel requests and claim jobs for free slots."""
+        self.store.heartbeat(self.worker_id, active=self._active, capacity=self.max_concurrent)
+        self.store.fail_stale(self.settings.job_lease_seconds)
+
+        for job_id in self.store.cancel_requests(self.worker_id):
+            self.cancel(job_id)
+
+        while not self._stopping.is_set() and self._slots.acquire(blocking=False):
+            try:
+                job = self.store.claim(self.worker_id)
+            except Exception:
+                self._slots.release()
+                raise
+            if job is None:
+                self._slots.release()
+                break
+            with self._active_lock:
+                self._active += 1
+                self._running[job["id"]] = {"token": CancellationToken(), "released": False}
+            self._executor.submit(self._run, job)
+
+    def cancel(self, job_id: str):
+        """Cancel a job running in this process and free its slot."""
+        entry = self._running.get(job_id)
+        if entry is None:
+            return
+        entry["token"].cancel("Investigation cancelled by request")
+        self.store.mark_cancelled(job_id)
+        self._release(job_id)
+
+    def _release(self, job_id: str):
+        """Give a job's slot back exactly once."""
+        with self._active_lock:
+            entry = self._running.get(job_id)
+            if entry is None or entry["released"]:
+                return
+            entry["released"] = True
+            self._active -= 1
+        self._slots.release()
+
+    def _progress_reporter(self, job_id: str, progress: InvestigationProgress):
+        """Build a crew event listener that publishes the job's live progress to the store."""
+        def on_event(event: dict):
+            progress.update(event)
+            fields = {}
+            if event["type"] == "phase_start":
+                fields = {
+                    "phase": event["phase"],
+                    "message": f"Phase {event['index']}/{event['total']}: {event['phase']} ({event['agent']})"
+                }
+            self.store.report_progress(job_id, progress.to_dict(), **fields)
+        return on_event
+
+    def _run(self, job: dict):
+        """Run a single claimed investigation and record its outcome."""
+        token = self._running[job["id"]]["token"]
+        try:
+            start_time = datetime.now()
+            self.store.update(job["id"], phase="investigating", message="Investigation running...")
+
+            from .crew import PHASES, MCPInvestigationCrew
+
+            crew = MCPInvestigationCrew(verbose=self.settings.verbose)
+            result = crew.investigate(
+                topic=job["topic"],
+                depth=job["depth"],
+                cancel_token=token,
+                profile=True if job["profile"] else None,
+                on_event=self._progress_reporter(job["id"], InvestigationProgress(PHASES))
+            )
+
+            duration = (datetime.now() - start_time).total_seconds()
+            self.store.complete(job["id"], report=result.content, duration_seconds=duration, usage=crew.usage)
+
+        except InvestigationCancelled:
+            self.store.mark_cancelled(job["id"])
+
+        except Exception as e:
+            self.store.fail(job["id"], str(e))
+
+        finally:
+            self._release(job["id"])
+            with self._active_lock:
+                del self._running[job["id"]]
@@ -0,0 +1,14 @@
+"""Shared test setup."""
+
+import pytest
+
+from src.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def dummy_api_key(monkeypatch):
+    """Load settings with a placeholder OPENAI_API_KEY, so no test needs a real key."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
@@ -0,0 +1,48 @@
+"""Session event logs shared by the analytics and estimator tests."""
+
+import json
+
+
+def session_events(
+    session_id: str,
+    depth: str = "quick",
+    model: str = "m1",
+    seconds: int = 40,
+    success: bool = True,
+    prompt_tokens: int = 10,
+    completion_tokens: int = 5,
+    phases: tuple = ("MCP Research", "Technical Analysis")
+) -> list:
+    """
+    Build the events of a finished session.
+
+    The phases split its duration evenly. The first phase sends a 100 character
+    prompt; the last makes one tool call and one LLM call.
+    """
+    day = "2026-03-02"
+    starts = [seconds * i // len(phases) for i in range(len(phases))]
+    events = [
+        {"session_id": session_id, "event_type": "investigation_start", "timestamp": f"{day}T10:00:00",
+         "topic": "t", "depth": depth},
+        {"session_id": session_id, "event_type": "agent_prompt", "timestamp": f"{day}T10:00:00",
+         "task_id": "task1", "prompt_length": 100},
+    ]
+    for number, (name, start) in enumerate(zip(phases, starts), 1):
+        events.append({"session_id": session_id, "event_type": "phase_start", "timestamp": f"{day}T10:00:{start:02d}",
+                       "phase": number, "phase_name": name})
+    events += [
+        {"session_id": session_id, "event_type": "tool_use", "timestamp": f"{day}T10:00:{starts[-1]:02d}",
+         "tool": "github_repo_search", "phase": phases[-1]},
+        {"session_id": session_id, "event_type": "llm_call", "timestamp": f"{day}T10:00:{starts[-1]:02d}",
+         "phase": phases[-1], "model": model, "prompt_tokens": prompt_tokens,
+         "completion_tokens": completion_tokens},
+        {"session_id": session_id, "event_type": "investigation_complete", "timestamp": f"{day}T10:00:{seconds:02d}",
+         "success": success, "duration_seconds": seconds},
+    ]
+    return events
+
+
+def write_session(logs_dir, events):
+    """Write a session's events where the analytics ingest looks for them."""
+    path = logs_dir / f"session_{events[0]['session_id']}_events.jsonl"
+    path.write_text("".join(json.dumps(event) + "\n" for event in events))
@@ -0,0 +1,46 @@
+"""Tests for cross-session performance analytics."""
+
+from src.storage.analytics import SessionAnalytics, percentile, summarize_session
+
+from .sessions import session_events, write_session
+
+
+def test_summarize_session_phases():
+    """Test that phase durations and per-phase counts come from the event stream."""
+    session = summarize_session(session_events("s1", "quick", "m1", 40))
+    assert session["status"] == "completed"
+    assert session["tool_calls"] == 1
+    research, analysis = session["phases"]
+    assert research["duration_seconds"] == 20
+    assert research["prompt_chars"] == 100
+    assert analysis["duration_seconds"] == 20
+    assert analysis["model"] == "m1"
+    assert analysis["tool_calls"] == 1
+
+
+def test_ingest_is_incremental_and_report_slices(tmp_path):
+    """Test incremental ingestion and slicing by depth and model."""
+    analytics = SessionAnalytics(tmp_path / ".analytics.db")
+    write_session(tmp_path, session_events("s1", "quick", "m1", 10))
+    write_session(tmp_path, session_events("s2", "quick", "m2", 30, success=False))
+    write_session(tmp_path, session_events("s3", "comprehensive", "m1", 50))
+    assert analytics.ingest(tmp_path) == 3
+    assert analytics.ingest(tmp_path) == 0
+
+    [overall] = analytics.report()
+    assert overall["sessions"] == 3
+    assert overall["failure_rate"] == 1 / 3
+
+    by_depth = {group["group"]: group for group in analytics.report(group_by="depth")}
+    assert by_depth["quick"]["duration_seconds"]["p50"] == 10
+    assert by_depth["comprehensive"]["phases"][0]["phase"] == "MCP Research"
+
+    [m1] = analytics.report(model="m1")
+    assert m1["sessions"] == 2
+
+
+def test_percentile():
+    """Test interpolated percentiles."""
+    assert percentile([], 50) is None
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile(list(range(101)), 99) == 99
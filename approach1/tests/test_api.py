@@ -0,0 +1,77 @@
+"""Tests for the API's job waiting."""
+
+import asyncio
+import gzip
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import api
+from src.storage.jobs import JobStore
+
+
+class DisconnectedRequest:
+    """Stands in for a request whose client has gone away."""
+
+    def __init__(self):
+        self.checks = 0
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return True
+
+
+class FakeWorker:
+    def __init__(self):
+        self.cancelled = []
+
+    def cancel(self, job_id):
+        self.cancelled.append(job_id)
+
+
+def test_disconnect_cancels_running_job_once(tmp_path, monkeypatch):
+    """Test that a disconnected client cancels its job once and stops waiting."""
+    store = JobStore(tmp_path / "jobs.db")
+    worker = FakeWorker()
+    monkeypatch.setattr(api, "get_job_store", lambda: store)
+    monkeypatch.setattr(api, "get_worker", lambda: worker)
+    job = store.submit("MCP servers", "quick")
+    store.claim("other-worker")
+
+    request = DisconnectedRequest()
+    job = asyncio.run(asyncio.wait_for(api.wait_for_job(job["id"], request), timeout=5))
+    assert job["status"] == "running"
+    assert job["cancel_requested"]
+    assert request.checks == 1
+    assert worker.cancelled == [job["id"]]
+
+
+def test_wait_for_missing_job_is_not_found(tmp_path, monkeypatch):
+    """Test that waiting on a job that does not exist answers 404 instead of crashing."""
+    store = JobStore(tmp_path / "jobs.db")
+    monkeypatch.setattr(api, "get_job_store", lambda: store)
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(api.wait_for_job("missing"))
+    assert raised.value.status_code == 404
+
+
+def test_range_request_on_compressed_report(tmp_path, monkeypatch):
+    """Test that a gzip-stored report answers byte ranges from its decompressed text."""
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    text = "# Report\n" + "MCP servers expose tools.\n" * 100
+    (tmp_path / "report.md.gz").write_bytes(gzip.compress(text.encode()))
+    client = TestClient(api.app)
+
+    response = client.get("/api/report/report.md.gz/raw", headers={"range": "bytes=2-7"})
+    assert response.status_code == 206
+    assert response.text == text[2:8]
+    assert response.headers["content-range"] == f"bytes 2-7/{len(text)}"
+
+    response = client.get("/api/report/report.md.gz/raw", headers={"range": f"bytes={len(text)}-"})
+    assert response.status_code == 416
+
+    response = client.get("/api/report/report.md.gz/raw", headers={"range": "bytes=2-7", "if-range": '"stale"'})
+    assert response.status_code == 200
+    assert response.text == text
@@ -0,0 +1,49 @@
+"""Tests for following API jobs from the Gradio apps."""
+
+import pytest
+
+from src.api_client import InvestigationAPIError, RemoteInvestigation
+from src.utils.cancellation import InvestigationCancelled
+
+
+class FakeClient:
+    """Serves a fixed sequence of job states."""
+
+    poll_interval = 0
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.cancelled = []
+
+    def get(self, job_id):
+        return self.states.pop(0)
+
+    def cancel(self, job_id):
+        self.cancelled.append(job_id)
+        return {"job_id": job_id, "status": "running", "message": "Cancelling..."}
+
+
+def _job(status, message="", report=None):
+    return {"job_id": "j1", "status": status, "message": message, "report": report}
+
+
+def test_remote_investigation_follows_job_until_completed():
+    """Test that updates stream non-terminal states and outcome returns the report."""
+    client = FakeClient([_job("running", "Phase 1/4"), _job("completed", report="# Report")])
+    run = RemoteInvestigation(client, _job("queued", "Waiting"))
+
+    assert [job["message"] for job in run.updates()] == ["Waiting", "Phase 1/4"]
+    assert run.outcome() == "# Report"
+
+
+def test_remote_investigation_raises_on_cancel_and_failure():
+    """Test that cancelled and failed jobs surface as the apps' exceptions."""
+    client = FakeClient([_job("cancelled", "Investigation cancelled")])
+    run = RemoteInvestigation(client, _job("queued"))
+    run.cancel("user")
+    assert client.cancelled == ["j1"]
+    with pytest.raises(InvestigationCancelled):
+        run.outcome()
+
+    with pytest.raises(InvestigationAPIError, match="worker lost"):
+        RemoteInvestigation(FakeClient([]), _job("failed", "worker lost")).outcome()
@@ -0,0 +1,84 @@
+"""Tests for stopping investigations when the Gradio client goes away."""
+
+import threading
+import time
+
+import pytest
+
+from src.api_client import RemoteInvestigation
+from src.utils.cancellation import InvestigationCancelled
+
+
+class BlockingCrew:
+    """Stands in for the crew; runs until its cancellation token is cancelled."""
+
+    tokens = []
+    stopped = threading.Event()
+
+    def __init__(self, verbose=False, session_logger=None):
+        pass
+
+    def investigate(self, topic, depth, cancel_token=None, on_event=None):
+        self.tokens.append(cancel_token)
+        on_event({"type": "phase_start", "phase": "MCP Research", "time": time.time()})
+        try:
+            while not cancel_token.cancelled:
+                time.sleep(0.01)
+            raise InvestigationCancelled("cancelled")
+        finally:
+            self.stopped.set()
+
+
+class FakeClient:
+    poll_interval = 0
+
+    def __init__(self):
+        self.cancelled = []
+
+    def start(self, topic, depth):
+        return RemoteInvestigation(self, {"job_id": "j1", "status": "queued", "message": "Waiting",
+                                          "eta_seconds": None, "progress": None})
+
+    def get(self, job_id):
+        return {"job_id": job_id, "status": "running", "message": "Phase 1/4", "progress": None}
+
+    def cancel(self, job_id):
+        self.cancelled.append(job_id)
+        return {"job_id": job_id, "status": "running", "message": "Cancelling...", "progress": None}
+
+
+@pytest.fixture
+def app_enhanced(tmp_path, monkeypatch):
+    """The app module; it builds its UI on import, which loads the settings."""
+    monkeypatch.chdir(tmp_path)
+    import app_enhanced
+    return app_enhanced
+
+
+def test_closing_the_generator_cancels_the_crew(app_enhanced, monkeypatch):
+    """Test that a disconnected client stops the in-process crew instead of leaving it running."""
+    monkeypatch.setattr(app_enhanced, "get_api_client", lambda: None)
+    monkeypatch.setattr(app_enhanced, "MCPInvestigationCrew", BlockingCrew)
+
+    updates = app_enhanced.investigate_topic("MCP servers", "quick")
+    next(updates)
+    next(updates)
+    updates.close()
+
+    [token] = BlockingCrew.tokens
+    assert token.cancelled
+    assert BlockingCrew.stopped.wait(5)
+    assert app_enhanced.active_tokens == {}
+
+
+def test_closing_the_generator_cancels_the_api_job(app_enhanced, monkeypatch):
+    """Test that a disconnected client cancels the job it submitted to the API."""
+    client = FakeClient()
+    monkeypatch.setattr(app_enhanced, "get_api_client", lambda: client)
+
+    updates = app_enhanced.investigate_topic("MCP servers", "quick")
+    next(updates)
+    updates.close()
+
+    assert client.cancelled == ["j1"]
+    assert app_enhanced.active_tokens == {}
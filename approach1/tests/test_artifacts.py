@@ -0,0 +1,42 @@
+"""Tests for the report artifact store."""
+
+import json
+from datetime import datetime, timedelta
+
+from src.storage.artifacts import ArtifactStore, read_report
+from src.storage.report_index import ReportIndex
+
+
+def test_same_topic_saves_never_collide(tmp_path):
+    """Test that concurrent-looking saves get unique, date-sharded files with sidecars."""
+    store = ArtifactStore(tmp_path)
+    started = datetime.now() - timedelta(seconds=30)
+    first = store.save("# One", topic="file system MCP tool", depth="quick", started_at=started,
+                       token_usage={"total_tokens": 150}, session_id="abc123")
+    second = store.save("# Two", topic="file system MCP tool")
+
+    assert first.id != second.id
+    assert first.path.parent.relative_to(tmp_path).as_posix().count("/") == 2
+    assert str(first) == first.path.read_text() == "# One"
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+    metadata = json.loads(first.metadata_path.read_text())
+    assert metadata["filename"] == first.path.relative_to(tmp_path).as_posix()
+    assert metadata["session_id"] == "abc123"
+    assert metadata["token_usage"] == {"total_tokens": 150}
+    assert 29 < metadata["duration_seconds"] < 60
+
+
+def test_compressed_artifacts_are_read_and_backfilled(tmp_path):
+    """Test gzip storage and that the index picks artifacts up from their sidecars."""
+    artifact = ArtifactStore(tmp_path, compress=True).save("# Scraping report", topic="web scraping", depth="standard")
+    assert artifact.path.name.endswith(".md.gz")
+    assert read_report(artifact.path) == "# Scraping report"
+
+    index = ReportIndex(tmp_path)
+    assert index.backfill() == 1
+    assert index.backfill() == 0
+
+    results, _ = index.search("scraping")
+    assert results[0]["filename"] == artifact.filename
+    assert results[0]["depth"] == "standard"
@@ -0,0 +1,44 @@
+"""Tests for the offline benchmark and its stub backend."""
+
+import requests
+
+from src.benchmark import find_regressions, run_benchmark
+from src.utils.stub_backend import StubBackend
+
+
+def test_stub_backend_calls_a_tool_then_answers():
+    """Test the ReAct flow, search endpoints and accounting of simulated waits."""
+    with StubBackend(llm_latency=0.01, search_latency=0.01, completion_tokens=50) as backend:
+        chat = f"{backend.url}/v1/chat/completions"
+        messages = [{"role": "system", "content": "Tool Name: web_search"}, {"role": "user", "content": "Go"}]
+        first = requests.post(chat, json={"model": "m", "messages": messages}).json()
+        assert "Action: web_search" in first["choices"][0]["message"]["content"]
+
+        messages.append({"role": "assistant", "content": "Observation: results"})
+        second = requests.post(chat, json={"model": "m", "messages": messages}).json()
+        assert "Final Answer: # Investigation Report" in second["choices"][0]["message"]["content"]
+        assert second["usage"]["completion_tokens"] == 50
+
+        repos = requests.get(f"{backend.url}/search/repositories", params={"q": "mcp"}).json()
+        assert repos["items"][0]["full_name"] == "example/mcp-0"
+        assert dict(backend.requests) == {"llm": 2, "github": 1}
+        assert backend.waited_seconds >= 0.03
+
+
+def test_run_benchmark_end_to_end():
+    """Test a full offline investigation against the stub backend."""
+    result = run_benchmark(runs=1, llm_latency=0, search_latency=0, warmup=False)
+    assert result["llm_calls"] == 6
+    assert result["search_calls"] == 2
+    assert 0 < result["overhead_seconds"]["median"] <= result["latency_seconds"]["median"]
+    assert result["memory"]["peak_bytes"] > 0
+
+
+def test_find_regressions():
+    """Test that only metrics grown beyond the allowed ratio are reported."""
+    baseline = {"overhead_seconds": {"median": 1.0}, "memory": {"peak_bytes": 1000}}
+    result = {"overhead_seconds": {"median": 1.2}, "memory": {"peak_bytes": 2000}}
+    assert find_regressions(result, baseline, 0.3) == ["memory.peak_bytes: 1,000 -> 2,000 (+100.0%)"]
+    assert find_regressions({"overhead_seconds": {"median": 1.2}, "memory": None}, baseline, 0.1) == [
+        "overhead_seconds.median: 1.0 -> 1.2 (+20.0%)"
+    ]
@@ -0,0 +1,31 @@
+"""Tests for the content-addressed blob store."""
+
+from src.storage import blobs
+from src.storage.blobs import BlobStore, blob_digest
+
+
+def test_put_deduplicates_and_round_trips(tmp_path):
+    """Test that equal payloads share one compressed file."""
+    store = BlobStore(tmp_path)
+    text = "MCP servers expose tools. " * 500
+    digest = store.put(text)
+    assert digest == blob_digest(text)
+    assert BlobStore(tmp_path).put(text) == digest
+
+    [path] = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert path.parent.name == digest[:2]
+    assert path.stat().st_size < len(text) / 10
+    assert BlobStore(tmp_path).get(digest) == text
+    assert store.get(blob_digest("missing")) is None
+
+
+def test_known_digests_are_bounded(tmp_path, monkeypatch):
+    """Test that the store remembers only the most recently stored digests."""
+    monkeypatch.setattr(blobs, "KNOWN_DIGESTS", 2)
+    store = BlobStore(tmp_path)
+    first, second = store.put("first"), store.put("second")
+    store.put("first")
+    store.put("third")
+    assert list(store._known) == [first, blob_digest("third")]
+    assert second not in store._known
+    assert store.get(second) == "second"
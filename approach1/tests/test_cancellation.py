@@ -0,0 +1,54 @@
+"""Tests for cooperative cancellation."""
+
+import pytest
+
+from src.utils.cancellation import (
+    CancellationToken,
+    InvestigationCancelled,
+    _block_if_cancelled,
+    cancellation_scope,
+    current_token,
+)
+
+
+def test_token_raises_after_cancel():
+    """Test that a cancelled token raises at the next checkpoint."""
+    token = CancellationToken()
+    token.raise_if_cancelled()
+
+    token.cancel("stop")
+    assert token.cancelled
+    with pytest.raises(InvestigationCancelled, match="stop"):
+        token.raise_if_cancelled()
+
+
+def test_hook_blocks_calls_only_inside_cancelled_scope():
+    """Test that the CrewAI hook blocks LLM/tool calls of a cancelled run only."""
+    token = CancellationToken()
+    with cancellation_scope(token):
+        assert current_token() is token
+        assert _block_if_cancelled(None) is None
+        token.cancel()
+        assert _block_if_cancelled(None) is False
+
+    assert current_token() is None
+    assert _block_if_cancelled(None) is None
+
+
+def test_request_cancel_queued_and_running(tmp_path):
+    """Test cancelling jobs through the shared job store."""
+    from src.storage.jobs import JobStore
+
+    store = JobStore(tmp_path / "jobs.db")
+    queued = store.submit("queued topic", "quick")
+    assert store.request_cancel(queued["id"])["status"] == "cancelled"
+    assert store.claim("worker-1") is None
+
+    running = store.submit("running topic", "quick")
+    store.claim("worker-1")
+    assert store.request_cancel(running["id"])["status"] == "running"
+    assert store.cancel_requests("worker-1") == [running["id"]]
+
+    store.mark_cancelled(running["id"])
+    store.complete(running["id"], report="late", duration_seconds=1.0)
+    assert store.get(running["id"])["status"] == "cancelled"
@@ -0,0 +1,44 @@
+"""Tests for the pre-flight estimator."""
+
+from src.estimator import InvestigationEstimator, over_budget
+from src.storage.analytics import SessionAnalytics
+
+from .sessions import session_events, write_session
+
+
+def test_model_rates_fit_prompt_and_completion_time(tmp_path):
+    """Test that seconds per prompt and completion token are recovered from phases."""
+    # duration = 0.001 * prompt + 0.01 * completion
+    for i, (prompt, completion) in enumerate([(1000, 1000), (5000, 1000), (2000, 3000)]):
+        seconds = round(0.001 * prompt + 0.01 * completion)
+        write_session(tmp_path, session_events(f"s{i}", seconds=seconds, prompt_tokens=prompt,
+                                               completion_tokens=completion, phases=("MCP Research",)))
+    analytics = SessionAnalytics(tmp_path / ".analytics.db")
+    analytics.ingest(tmp_path)
+
+    rates = analytics.model_rates()["m1"]
+    assert abs(rates["seconds_per_prompt_token"] - 0.001) < 1e-9
+    assert abs(rates["seconds_per_completion_token"] - 0.01) < 1e-9
+    assert analytics.phase_history("quick")["MCP Research"]["sessions"] == 3
+    assert analytics.phase_history("comprehensive") == {}
+
+
+def test_estimate_uses_defaults_without_history(tmp_path):
+    """Test that a fresh install still produces a full estimate."""
+    estimate = InvestigationEstimator(tmp_path).estimate("web scraping MCP tool", "quick")
+    assert [phase["basis"] for phase in estimate["phases"]] == ["defaults"] * 4
+    assert estimate["prompt_tokens"] > 0
+    assert estimate["duration_seconds"] > 0
+    # Later phases carry earlier outputs as context
+    first, *_, last = estimate["phases"]
+    assert last["prompt_tokens"] > first["prompt_tokens"]
+
+
+def test_over_budget():
+    """Test cost and duration limits."""
+    estimate = {"cost_usd": 0.5, "duration_seconds": 600}
+    assert over_budget(estimate) is None
+    assert over_budget(estimate, max_cost_usd=1.0, max_seconds=900) is None
+    assert "cost" in over_budget(estimate, max_cost_usd=0.1)
+    assert "duration" in over_budget(estimate, max_seconds=60)
+    assert over_budget({"cost_usd": None, "duration_seconds": 1}, max_cost_usd=0.1) is None
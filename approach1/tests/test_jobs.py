@@ -0,0 +1,78 @@
+"""Tests for the shared job store."""
+
+import time
+
+from src.storage.jobs import JobStore
+
+
+def test_claim_takes_oldest_queued_job(tmp_path):
+    """Test that jobs are claimed in submission order and only once."""
+    store = JobStore(tmp_path / "jobs.db")
+    first = store.submit("topic a", "quick")
+    second = store.submit("topic b", "standard")
+
+    claimed = store.claim("worker-1")
+    assert claimed["id"] == first["id"]
+    assert claimed["status"] == "running"
+    assert claimed["worker_id"] == "worker-1"
+
+    assert store.claim("worker-2")["id"] == second["id"]
+    assert store.claim("worker-2") is None
+
+
+def test_store_is_shared_between_instances(tmp_path):
+    """Test that separate store instances (processes) see the same jobs."""
+    writer = JobStore(tmp_path / "jobs.db")
+    reader = JobStore(tmp_path / "jobs.db")
+
+    job = writer.submit("shared topic", "quick")
+    writer.claim("worker-1")
+    writer.complete(job["id"], report="# Report", duration_seconds=1.5)
+
+    seen = reader.get(job["id"])
+    assert seen["status"] == "completed"
+    assert seen["report"] == "# Report"
+    assert reader.latest_for_topic("shared topic")["id"] == job["id"]
+    assert reader.count_by_status() == {"completed": 1}
+
+
+def test_fail_stale_marks_lost_jobs_failed(tmp_path):
+    """Test that running jobs without a heartbeat are failed."""
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit("topic", "quick")
+    store.claim("worker-1")
+    store.update(job["id"], heartbeat_at=time.time() - 120)
+
+    assert store.fail_stale(lease_seconds=60) == 1
+    assert store.get(job["id"])["status"] == "failed"
+
+
+def test_pending_seconds_sums_estimates_ahead(tmp_path):
+    """Test that queue ETAs count earlier queued jobs and unfinished running work."""
+    store = JobStore(tmp_path / "jobs.db")
+    running = store.submit("a", "quick", estimated_seconds=100)
+    store.claim("worker-1")
+    store.submit("b", "quick", estimated_seconds=30)
+    third = store.submit("c", "quick")
+
+    assert 99 <= store.pending_seconds(before=third["created_at"], default_seconds=5) <= 130
+    assert store.pending_seconds(default_seconds=5) >= 135 - 1
+    store.complete(running["id"], report="", duration_seconds=1)
+    assert store.pending_seconds(before=third["created_at"]) == 30
+
+
+def test_report_progress_only_updates_running_jobs(tmp_path):
+    """Test that live progress is stored for running jobs and kept after cancellation."""
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit("topic", "quick")
+    store.claim("worker-1")
+
+    store.report_progress(job["id"], {"llm_calls": 1}, phase="MCP Research", message="Phase 1/4")
+    running = store.get(job["id"])
+    assert (running["phase"], running["progress"]) == ("MCP Research", {"llm_calls": 1})
+
+    store.mark_cancelled(job["id"])
+    store.report_progress(job["id"], {"llm_calls": 2}, phase="Documentation")
+    cancelled = store.get(job["id"])
+    assert (cancelled["status"], cancelled["phase"]) == ("cancelled", "cancelled")
+    assert cancelled["progress"] == {"llm_calls": 1}
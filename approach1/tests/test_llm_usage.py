@@ -0,0 +1,60 @@
+"""Tests for per-call LLM accounting."""
+
+from types import SimpleNamespace
+
+import httpx
+
+from src.utils.llm_interceptor import LLMUsageInterceptor
+from src.utils.llm_usage import llm_calls, usage_summary
+from src.utils.tracing import CrewTracer, Tracer, tracing_scope
+
+
+def test_interceptor_counts_retries_and_time_to_first_token():
+    """Test that HTTP attempts and the first body byte land on the LLM call span."""
+    tracer = Tracer()
+    crew_tracer = CrewTracer(tracer, ["MCP Research"])
+    interceptor = LLMUsageInterceptor()
+    llm = SimpleNamespace(model="gpt-test", _token_usage={"prompt_tokens": 0, "completion_tokens": 0})
+    request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+
+    with tracing_scope(tracer, crew_tracer):
+        crew_tracer.start_phase("MCP Researcher")
+        crew_tracer.before_llm_call(SimpleNamespace(llm=llm, messages=[], iterations=0))
+        interceptor.on_outbound(request)
+        interceptor.on_inbound(httpx.Response(503, stream=httpx.ByteStream(b"")))
+        interceptor.on_outbound(request)
+        response = interceptor.on_inbound(httpx.Response(200, stream=httpx.ByteStream(b"{}")))
+        assert b"".join(response.stream) == b"{}"
+        llm._token_usage = {"prompt_tokens": 50, "completion_tokens": 5, "cached_prompt_tokens": 10}
+        crew_tracer.after_llm_call(SimpleNamespace(llm=llm, response="ok"))
+        crew_tracer.end_phase()
+
+    [call] = llm_calls(tracer)
+    assert call["agent"] == "MCP Researcher"
+    assert call["phase"] == "MCP Research"
+    assert call["retries"] == 1
+    assert call["ttft_seconds"] is not None
+    assert call["cached_prompt_tokens"] == 10
+
+
+def test_usage_summary_aggregates_per_agent_and_phase():
+    """Test run, agent and phase totals."""
+    calls = [
+        {"agent": "A", "phase": "P1", "model": "m1", "status": "ok", "prompt_tokens": 10,
+         "completion_tokens": 2, "cached_prompt_tokens": 0, "latency_seconds": 1.0,
+         "ttft_seconds": 0.5, "retries": 0},
+        {"agent": "A", "phase": "P1", "model": "m1", "status": "error", "prompt_tokens": 0,
+         "completion_tokens": 0, "cached_prompt_tokens": 0, "latency_seconds": 0.5,
+         "ttft_seconds": None, "retries": 2},
+        {"agent": "B", "phase": "P2", "model": "m2", "status": "ok", "prompt_tokens": 30,
+         "completion_tokens": 6, "cached_prompt_tokens": 20, "latency_seconds": 2.0,
+         "ttft_seconds": 1.5, "retries": 0},
+    ]
+    summary = usage_summary(calls)
+    assert summary["calls"] == 3
+    assert summary["prompt_tokens"] == 40
+    assert summary["errors"] == 1
+    assert summary["mean_ttft_seconds"] == 1.0
+    assert summary["by_agent"]["A"]["retries"] == 2
+    assert summary["by_phase"]["P2"]["cached_prompt_tokens"] == 20
+    assert summary["by_phase"]["P2"]["models"] == ["m2"]
@@ -0,0 +1,57 @@
+"""Tests for the API load test harness."""
+
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.loadtest import find_ceiling, parse_mix, run_stage
+
+
+class FakeJobsAPI(BaseHTTPRequestHandler):
+    """Rejects every third submission and completes the rest immediately."""
+
+    submissions = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        FakeJobsAPI.submissions += 1
+        if FakeJobsAPI.submissions % 3 == 0:
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        now = datetime.now().isoformat()
+        body = json.dumps({"job_id": "j", "status": "completed", "created_at": now,
+                           "started_at": now, "completed_at": now}).encode()
+        self.send_response(202)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_run_stage_counts_outcomes():
+    """Test that a stage tallies completions, 429s and latency percentiles."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeJobsAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        stage = run_stage(f"http://127.0.0.1:{server.server_port}", concurrency=2, duration=0.3,
+                          mix=parse_mix("quick=1,standard"), topics=["t"], poll_interval=0.01)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stage["requests"] == stage["completed"] + stage["rejected_429"]
+    assert stage["completed"] > 0 and stage["rejected_429"] > 0
+    assert stage["errors"] == 0
+    assert stage["latency_seconds"]["p50"] <= stage["latency_seconds"]["p99"]
+
+
+def test_find_ceiling():
+    """Test that the ceiling is the last stage before throughput flattens."""
+    stages = [{"concurrency": c, "throughput_per_minute": t} for c, t in ((1, 20), (2, 38), (4, 40), (8, 30))]
+    assert find_ceiling(stages) == 2
+    assert find_ceiling(stages[:2]) is None
@@ -0,0 +1,99 @@
+"""Tests for session logging."""
+
+import logging
+import os
+
+from src.utils.logging_config import (
+    LOGGER_NAME,
+    SessionLogger,
+    flush_logs,
+    read_session_events,
+    tail_session_events,
+)
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else 0
+
+
+def test_sessions_share_one_logger_and_close_files(tmp_path, monkeypatch):
+    """Test that many sessions neither add handlers nor keep files open."""
+    monkeypatch.chdir(tmp_path)
+    first = SessionLogger()
+    first.start_investigation("topic", "quick")
+    first.complete_investigation(success=True)
+    flush_logs()
+
+    handlers = len(logging.getLogger(LOGGER_NAME).handlers)
+    loggers = len(logging.Logger.manager.loggerDict)
+    fds = _open_fds()
+
+    for _ in range(200):
+        session = SessionLogger()
+        session.start_investigation("topic", "quick")
+        session.complete_investigation(success=True)
+    flush_logs()
+
+    assert len(logging.getLogger(LOGGER_NAME).handlers) == handlers
+    assert len(logging.Logger.manager.loggerDict) == loggers
+    assert _open_fds() <= fds
+
+    lines = session.log_file.read_text().splitlines()
+    assert len(lines) == 3
+    assert f"[SESSION:{session.session_id}]" in lines[0]
+    assert "INVESTIGATION_START" in lines[0]
+
+
+def test_events_stream_to_jsonl_and_tail(tmp_path, monkeypatch):
+    """Test that events are appended as JSON lines and can be tailed."""
+    monkeypatch.chdir(tmp_path)
+    session = SessionLogger()
+    session.start_investigation("topic", "quick")
+    session.log_agent_output("Writer", "x" * 10000)
+    flush_logs()
+
+    assert not hasattr(session, "events")
+    partial = list(tail_session_events(session.events_file, follow=False))
+    assert [event["event_type"] for event in partial] == ["investigation_start", "agent_output"]
+
+    session.complete_investigation(success=True)
+    events_file = session.export_session_log()
+    followed = list(tail_session_events(events_file, follow=True, poll_interval=0.01, timeout=5))
+    assert followed[-1]["event_type"] == "session_summary"
+    assert followed[-1]["events_count"] == 3
+    assert list(read_session_events(events_file)) == followed
+
+
+def test_payloads_are_stored_once_by_hash(tmp_path, monkeypatch):
+    """Test that prompts and outputs go to the blob store and events keep hash and length."""
+    monkeypatch.chdir(tmp_path)
+    output = "report section\n" * 2000
+    session = SessionLogger()
+    session.log_agent_output("Writer", output)
+    session.log_agent_prompt("Architect", output)
+    session.complete_investigation(success=True)
+    flush_logs()
+
+    events = list(read_session_events(session.events_file))
+    assert "output" not in events[0]
+    assert events[0]["output_length"] == len(output)
+    assert events[0]["output_sha256"] == events[1]["prompt_sha256"]
+    assert output not in session.log_file.read_text()
+    assert len(list(session.blobs_dir.rglob("*.*"))) == 1
+
+    restored = list(read_session_events(session.events_file, with_payloads=True))
+    assert restored[0]["output"] == output
+    assert restored[1]["prompt"] == output
+
+
+def test_small_payloads_stay_inline(tmp_path, monkeypatch):
+    """Test that payloads under BLOB_MIN_CHARS are kept in the event, not the blob store."""
+    monkeypatch.chdir(tmp_path)
+    session = SessionLogger()
+    session.log_agent_output("Writer", "short answer")
+    flush_logs()
+
+    [event] = list(read_session_events(session.events_file))
+    assert event["output"] == "short answer"
+    assert "output_sha256" not in event
+    assert not session.blobs_dir.exists()
@@ -0,0 +1,55 @@
+"""Tests for the shared Prometheus metrics store."""
+
+from src.storage.jobs import JobStore
+from src.storage.metrics import MetricsStore
+from src.utils.tracing import Tracer, trace_span, tracing_scope
+
+
+def test_metrics_accumulate_across_store_instances(tmp_path):
+    """Test that separate processes' stores add up to one set of totals."""
+    first = MetricsStore(tmp_path / "metrics.db")
+    second = MetricsStore(tmp_path / "metrics.db")
+    first.inc("report_cache_requests_total", {"cache": "conditional", "result": "hit"})
+    second.inc("report_cache_requests_total", {"cache": "conditional", "result": "hit"})
+    second.observe("investigation_tool_call_duration_seconds", 0.3, {"tool": "web_search"})
+
+    text = first.render([("investigation_queue_depth", "Queued jobs", [({}, 4)])])
+    assert "# TYPE investigation_queue_depth gauge\ninvestigation_queue_depth 4" in text
+    assert 'report_cache_requests_total{cache="conditional",result="hit"} 2' in text
+    assert 'investigation_tool_call_duration_seconds_bucket{tool="web_search",le="0.25"} 0' in text
+    assert 'investigation_tool_call_duration_seconds_bucket{tool="web_search",le="0.5"} 1' in text
+    assert 'investigation_tool_call_duration_seconds_bucket{tool="web_search",le="+Inf"} 1' in text
+    assert 'investigation_tool_call_duration_seconds_count{tool="web_search"} 1' in text
+
+
+def test_record_trace(tmp_path):
+    """Test that an investigation's spans become duration, backend and token series."""
+    tracer = Tracer()
+    with tracing_scope(tracer):
+        with trace_span("investigation", "investigation"):
+            with trace_span("MCP Research", "phase"):
+                with trace_span("GET https://api.github.com/search/code", "http", backend="github") as http:
+                    http.set(status_code=403)
+                with trace_span("llm call", "llm", model="gpt-test") as llm:
+                    llm.set(prompt_tokens=120, completion_tokens=30)
+
+    store = MetricsStore(tmp_path / "metrics.db")
+    store.record_trace(tracer, depth="quick", outcome="completed")
+    text = store.render()
+    assert 'investigations_total{depth="quick",outcome="completed"} 1' in text
+    assert 'investigation_duration_seconds_count{depth="quick",outcome="completed"} 1' in text
+    assert 'investigation_phase_duration_seconds_count{depth="quick",phase="MCP Research"} 1' in text
+    assert 'investigation_backend_requests_total{backend="github",outcome="error"} 1' in text
+    assert 'investigation_llm_tokens_total{model="gpt-test",type="prompt"} 120' in text
+    assert 'investigation_llm_tokens_total{model="gpt-test",type="completion"} 30' in text
+
+
+def test_live_workers(tmp_path):
+    """Test worker liveness reported through heartbeats."""
+    store = JobStore(tmp_path / "jobs.db")
+    store.heartbeat("host:1", active=2, capacity=3)
+    store.heartbeat("host:2", active=0, capacity=3)
+    assert [w["active"] for w in store.live_workers(60)] == [2, 0]
+
+    store.remove_worker("host:2")
+    assert [w["worker_id"] for w in store.live_workers(60)] == ["host:1"]
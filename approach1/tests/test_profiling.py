@@ -0,0 +1,31 @@
+"""Tests for the investigation profiler."""
+
+import json
+import time
+
+from src.utils.profiling import InvestigationProfiler
+
+
+def _busy(seconds: float):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+def test_profiler_samples_investigation_thread(tmp_path):
+    """Test that samples are attributed to the profiled thread and saved."""
+    with InvestigationProfiler(interval=0.001) as profiler:
+        _busy(0.2)
+
+    assert profiler.samples > 0
+    assert profiler.traced_peak is not None
+    top = profiler.top_functions(profiler.wall, "investigation")
+    assert any(label.startswith("_busy ") for label, _, _ in top)
+
+    files = profiler.save(tmp_path, "abc123")
+    speedscope = json.loads(files["speedscope"].read_text())
+    assert speedscope["profiles"][0]["name"] == "investigation (wall)"
+    assert "investigation;" in files["collapsed"].read_text()
+    assert "Top 25 by CPU time, investigation thread" in files["summary"].read_text()
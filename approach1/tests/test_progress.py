@@ -0,0 +1,61 @@
+"""Tests for live investigation progress."""
+
+import pytest
+
+from src.utils.progress import BackgroundInvestigation, InvestigationProgress
+
+
+PHASES = [("MCP Research", "MCP Researcher"), ("Documentation", "Technical Writer")]
+
+
+class FakeCrew:
+    def __init__(self, events, error=None):
+        self.events = events
+        self.error = error
+
+    def investigate(self, topic, depth, cancel_token=None, on_event=None):
+        for event in self.events:
+            on_event(event)
+        if self.error:
+            raise self.error
+        return f"report on {topic}"
+
+
+def _event(kind, phase, **fields):
+    return {"type": kind, "phase": phase, "time": 100.0, **fields}
+
+
+def test_background_investigation_streams_events_into_progress():
+    """Test that crew events arrive in order and fold into per-phase totals."""
+    run = BackgroundInvestigation(FakeCrew([
+        _event("phase_start", "MCP Research"),
+        _event("llm_call", "MCP Research", prompt_tokens=100, completion_tokens=10),
+        _event("tool_start", "MCP Research", tool="web_search", input="{'query': 'mcp'}"),
+        _event("tool_end", "MCP Research", tool="web_search", result_chars=5, duration_seconds=1.5),
+        _event("phase_end", "MCP Research", steps=2, duration_seconds=4.0),
+        _event("phase_start", "Documentation"),
+    ]), "mcp", "quick").start()
+
+    progress = InvestigationProgress(PHASES)
+    for event in run.events(timeout=0.1):
+        if event is not None:
+            progress.update(event)
+
+    assert run.outcome() == "report on mcp"
+    research, docs = progress.phases["MCP Research"], progress.phases["Documentation"]
+    assert (research["status"], research["steps"], research["tool_calls"]) == ("done", 2, 1)
+    assert progress.elapsed("MCP Research") == 4.0
+    assert docs["status"] == "running" and progress.current == "Documentation"
+    assert (progress.prompt_tokens, progress.completion_tokens, progress.llm_calls) == (100, 10, 1)
+    assert progress.recent_tools == [{"tool": "web_search", "input": "{'query': 'mcp'}", "duration_seconds": 1.5}]
+
+    restored = InvestigationProgress.from_dict(progress.to_dict())
+    assert restored.phases == progress.phases and restored.llm_calls == 1
+
+
+def test_background_investigation_reraises_crew_error():
+    """Test that the crew's exception surfaces from outcome() after the events end."""
+    run = BackgroundInvestigation(FakeCrew([], error=ValueError("boom")), "mcp", "quick").start()
+    assert all(event is None for event in run.events(timeout=0.1))
+    with pytest.raises(ValueError):
+        run.outcome()
@@ -0,0 +1,55 @@
+"""Tests for offline session replay."""
+
+import pytest
+
+from src.replay import ReplayExhausted, ReplayLLM, SessionRecording, ToolReplayer
+from src.utils.tokenizer import count_tokens
+
+
+def _tool_call(tool: str, query: str, result: str) -> dict:
+    return {"event_type": "tool_use", "tool": tool, "query": query, "result": result, "duration_seconds": 1.0}
+
+
+def test_recording_reads_llm_and_tool_calls():
+    """Test that a session's topic, calls and completeness are extracted."""
+    recording = SessionRecording([
+        {"event_type": "investigation_start", "session_id": "s1", "topic": "t", "depth": "quick"},
+        {"event_type": "llm_call", "agent": "MCP Researcher", "response": "Final Answer: x"},
+        _tool_call("web_search", "{'query': 'a'}", None),
+        {"event_type": "investigation_complete", "duration_seconds": 12.5},
+    ])
+    assert (recording.session_id, recording.topic, recording.depth) == ("s1", "t", "quick")
+    assert recording.duration_seconds == 12.5
+    assert recording.has_llm_responses
+    assert recording.missing_tool_results == 1
+
+    with pytest.raises(ValueError):
+        SessionRecording([{"event_type": "llm_call"}])
+
+
+def test_tool_replayer_matches_input_then_falls_back_to_order():
+    """Test exact-input matching, in-order fallback and misses."""
+    tools = ToolReplayer([
+        _tool_call("web_search", "{'query': 'a'}", "result a"),
+        _tool_call("web_search", "{'query': 'b'}", "result b"),
+    ], latency_scale=0)
+
+    assert tools.run("web_search", "{'query': 'b'}") == "result b"
+    assert tools.run("web_search", "{'query': 'changed'}") == "result a"
+    assert tools.run("web_search", "{'query': 'a'}").startswith("No recorded result")
+    assert (tools.calls, tools.misses) == (3, 1)
+
+
+def test_replay_llm_scales_prompt_tokens_by_prompt_size():
+    """Test that recorded responses are returned in order with scaled prompt tokens."""
+    llm = ReplayLLM("gpt-test", [
+        {"response": "first", "prompt_tokens": 100, "prompt_chars": 400, "completion_tokens": 7},
+        {"response": "second", "prompt_tokens": 0, "completion_tokens": 3},
+    ], latency_scale=0)
+
+    assert llm.call([{"role": "user", "content": "x" * 800}]) == "first"
+    assert llm.call("y" * 40) == "second"
+    assert llm._token_usage["prompt_tokens"] == 200 + count_tokens("y" * 40, "gpt-test")
+    assert llm._token_usage["completion_tokens"] == 10
+    with pytest.raises(ReplayExhausted):
+        llm.call("z")
@@ -0,0 +1,82 @@
+"""Tests for report delivery helpers."""
+
+import gzip
+
+import pytest
+
+from src.utils.report_delivery import (
+    byte_range,
+    compressed_variant,
+    is_not_modified,
+    negotiate_encoding,
+    resolve_report_path,
+    validators,
+)
+
+
+def test_resolve_report_path_rejects_escapes(tmp_path):
+    """Test that only files inside the output directory are served."""
+    (tmp_path / "report.md").write_text("# Report")
+    assert resolve_report_path(tmp_path, "report.md") == (tmp_path / "report.md").resolve()
+    assert resolve_report_path(tmp_path, "../report.md") is None
+    assert resolve_report_path(tmp_path, "missing.md") is None
+
+
+def test_resolve_report_path_rejects_internal_files(tmp_path):
+    """Test that the index, caches, sidecars and partial writes are not served as reports."""
+    shard = tmp_path / "2026" / "01" / "02"
+    shard.mkdir(parents=True)
+    (tmp_path / ".cache").mkdir()
+    names = [
+        ".reports.db",
+        ".cache/0123abcd.render-v1.json",
+        ".cache/hidden.md",
+        "2026/01/02/report.meta.json",
+        "2026/01/02/report.md.1a2b3c.tmp",
+        "2026/01/02/.report.md",
+    ]
+    for name in names:
+        (tmp_path / name).write_text("internal")
+    (shard / "report.md.gz").write_bytes(b"")
+
+    for name in names:
+        assert resolve_report_path(tmp_path, name) is None, name
+    assert resolve_report_path(tmp_path, "2026/01/02/report.md.gz") == (shard / "report.md.gz").resolve()
+
+
+def test_negotiate_encoding_honours_q_values():
+    """Test Accept-Encoding negotiation."""
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+    assert negotiate_encoding("identity") is None
+
+
+def test_conditional_request_and_variant(tmp_path):
+    """Test strong ETag revalidation and compressed variants."""
+    path = tmp_path / "report.md"
+    path.write_text("# Report\n" * 500)
+
+    headers = validators(path)
+    assert is_not_modified({"if-none-match": headers["etag"]}, headers)
+    assert not is_not_modified({"if-none-match": '"other"'}, headers)
+    assert is_not_modified({"if-modified-since": headers["last-modified"]}, headers)
+    assert validators(path, "gzip")["etag"] != headers["etag"]
+
+    variant = compressed_variant(path, "gzip")
+    assert gzip.decompress(variant.read_bytes()) == path.read_bytes()
+    assert compressed_variant(path, "gzip") == variant
+
+
+def test_byte_range():
+    """Test single byte ranges, suffixes, clamping and unsatisfiable ranges."""
+    assert byte_range(None, 100) is None
+    assert byte_range("bytes=0-9", 100) == (0, 9)
+    assert byte_range("bytes=90-", 100) == (90, 99)
+    assert byte_range("bytes=-10", 100) == (90, 99)
+    assert byte_range("bytes=50-500", 100) == (50, 99)
+    assert byte_range("bytes=0-1,5-6", 100) is None
+    assert byte_range("items=0-1", 100) is None
+    with pytest.raises(ValueError):
+        byte_range("bytes=100-", 100)
@@ -0,0 +1,82 @@
+"""Tests for the report index."""
+
+from src.storage.report_index import ReportIndex
+
+
+def test_add_and_query_with_filters(tmp_path):
+    """Test that saved reports are listed newest first with filters and paging."""
+    index = ReportIndex(tmp_path)
+    for i, depth in enumerate(["quick", "standard", "quick"]):
+        path = tmp_path / f"investigation_report_{i}.md"
+        path.write_text("# Report " * (i + 1))
+        index.add(
+            path,
+            topic=f"Topic {i}: C++/Rust",
+            depth=depth,
+            duration_seconds=10.0 + i,
+            token_usage={"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+        )
+
+    reports, total = index.query(limit=2)
+    assert total == 3
+    assert len(reports) == 2
+
+    quick, total = index.query(depth="quick")
+    assert total == 2
+    assert all(report["depth"] == "quick" for report in quick)
+
+    matched, total = index.query(topic="Topic 1")
+    assert total == 1
+    assert matched[0]["topic"] == "Topic 1: C++/Rust"
+    assert matched[0]["total_tokens"] == 150
+
+
+def test_topic_filter_matches_wildcards_literally(tmp_path):
+    """Test that % and _ and backslashes in a topic filter match only themselves."""
+    index = ReportIndex(tmp_path)
+    for i, topic in enumerate(["100% coverage", "file_system tool", "fileXsystem tool", "C:\\tools"]):
+        path = tmp_path / f"investigation_report_{i}.md"
+        path.write_text("# Report")
+        index.add(path, topic=topic)
+
+    assert [r["topic"] for r in index.query(topic="%")[0]] == ["100% coverage"]
+    assert [r["topic"] for r in index.query(topic="file_system")[0]] == ["file_system tool"]
+    assert [r["topic"] for r in index.query(topic="C:\\t")[0]] == ["C:\\tools"]
+
+
+def test_backfill_recovers_topic_from_filename(tmp_path):
+    """Test that reports written before the index existed are indexed once."""
+    (tmp_path / "investigation_file_system_MCP_tool_20250101_120000.md").write_text("# Report")
+    index = ReportIndex(tmp_path)
+
+    assert index.backfill() == 1
+    assert index.backfill() == 0
+
+    reports, _ = index.query()
+    assert reports[0]["topic"] == "file system MCP tool"
+
+
+def test_search_ranks_and_snippets(tmp_path):
+    """Test full-text search with prefix matching, ranking and pagination."""
+    index = ReportIndex(tmp_path)
+    documents = {
+        "investigation_a.md": ("web scraping MCP tool", "Scrapers fetch pages and parse HTML."),
+        "investigation_b.md": ("PostgreSQL MCP tool", "Connection pooling for database access."),
+        "investigation_c.md": ("Slack MCP tool", "Posting messages; scraping is out of scope.")
+    }
+    for filename, (topic, content) in documents.items():
+        path = tmp_path / filename
+        path.write_text(content)
+        index.add(path, topic=topic, content=content)
+
+    results, total = index.search("scrap")
+    assert total == 2
+    assert results[0]["filename"] == "investigation_a.md"
+    assert "**" in results[0]["snippet"]
+
+    page, _ = index.search("scrap", limit=1, offset=1)
+    assert page[0]["filename"] == "investigation_c.md"
+
+    assert index.search("pool")[1] == 1
+    assert index.search('pool "unbalanced (')[1] == 0
+    assert index.search("!!!") == ([], 0)
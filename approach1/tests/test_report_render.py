@@ -0,0 +1,54 @@
+"""Tests for cached report rendering."""
+
+import pytest
+
+from src.storage.artifacts import ArtifactStore
+from src.utils import report_render
+from src.utils.report_render import get_rendered, is_rendered, prerender, render_markdown, render_text
+
+
+REPORT = "```markdown\n# Title\n\nIntro\n\n## Design\n\n| a | b |\n|---|---|\n| 1 | 2 |\n```"
+
+
+def test_render_markdown_builds_html_toc_and_sections():
+    """Test that fenced reports are unwrapped and headings indexed."""
+    rendered = render_markdown(REPORT)
+    assert '<h2 id="design">Design</h2>' in rendered["html"]
+    assert "<table>" in rendered["html"]
+    assert 'href="#design"' in rendered["toc"]
+    assert rendered["sections"] == [
+        {"level": 1, "id": "title", "title": "Title"},
+        {"level": 2, "id": "design", "title": "Design"},
+    ]
+
+
+def test_render_is_cached_by_content_and_shared_with_text(tmp_path, monkeypatch):
+    """Test that a saved report renders once and text with the same content hits that render."""
+    path = tmp_path / "report.md"
+    path.write_text(REPORT, encoding="utf-8")
+    assert not is_rendered(path, tmp_path)
+
+    prerender(path, tmp_path).result()
+    assert is_rendered(path, tmp_path)
+
+    calls = []
+    monkeypatch.setattr(report_render, "render_markdown", lambda text: calls.append(text) or {})
+    assert get_rendered(path, tmp_path)["sections"][1]["id"] == "design"
+    assert render_text(REPORT, tmp_path)["content_hash"] == get_rendered(path, tmp_path)["content_hash"]
+    assert calls == []
+
+    path.write_text(REPORT + "\n\nMore", encoding="utf-8")
+    get_rendered(path, tmp_path)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_saved_report_render_is_reused_for_text(tmp_path, monkeypatch, compress):
+    """Test that a report saved in a date shard, compressed or not, shares its render with the text."""
+    artifact = ArtifactStore(tmp_path, compress=compress).save(REPORT, topic="render cache")
+    prerender(artifact.path, tmp_path).result()
+
+    calls = []
+    monkeypatch.setattr(report_render, "render_markdown", lambda text: calls.append(text) or {})
+    assert render_text(REPORT, tmp_path)["sections"][1]["id"] == "design"
+    assert calls == []
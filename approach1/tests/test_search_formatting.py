@@ -0,0 +1,63 @@
+"""Tests for search result formatting and its microbenchmark."""
+
+import json
+
+from src.search_benchmark import FIXTURES_DIR, TOOLS, run_search_benchmark, scale_payload
+from src.tools.formatting import SNIPPET_CHARS, format_code_results, format_repo_results, format_serper_results
+
+
+def _fixture(tool):
+    return json.loads((FIXTURES_DIR / TOOLS[tool][0]).read_text())
+
+
+def test_full_layout_is_unchanged():
+    """Test the labelled layout the agents' prompts were written against."""
+    serper = format_serper_results(_fixture("serper"))
+    assert serper.startswith("Title: Introduction - Model Context Protocol\n"
+                             "Link: https://modelcontextprotocol.io/introduction\nSnippet: ")
+    assert serper.count("\n---\n") == 4
+
+    code = _fixture("github_code")
+    item = code["items"][0]
+    assert format_code_results(code).split("\n---\n")[0] == (
+        f"\nRepository: {item['repository']['full_name']}\nFile: {item['name']}\n"
+        f"Path: {item['path']}\nURL: {item['html_url']}\n"
+    )
+    assert format_serper_results({"organic": []}) == ""
+
+
+def test_compact_layout_caps_snippets():
+    """Test that compact output keeps every result but shortens long snippets."""
+    data = scale_payload(_fixture("serper"), "very-large")
+    compact = format_serper_results(data, compact=True)
+    assert [line[:3] for line in compact.splitlines()[::2]] == ["1. ", "2. ", "3. ", "4. ", "5. "]
+    assert all(len(line) <= SNIPPET_CHARS + 3 for line in compact.splitlines()[1::2])
+    assert len(compact) < len(format_serper_results(data)) / 3
+
+
+def test_run_search_benchmark():
+    """Test that every tool and size is measured and compact never costs more tokens."""
+    result = run_search_benchmark(iterations=2)
+    assert len(result["rows"]) == len(TOOLS) * 4
+    assert {row["size"]: row["results"] for row in result["rows"] if row["tool"] == "github_repos"} == {
+        "small": 1, "typical": 5, "large": 100, "very-large": 100
+    }
+    for row in result["rows"]:
+        assert row["parse_us"] > 0
+        assert 0 < row["compact"]["tokens"] <= row["full"]["tokens"]
+
+
+def test_compact_repo_results_keep_their_urls():
+    """Test that compact repository results link each repository as the API returned it."""
+    data = {"items": [{
+        "full_name": "acme/mcp-server",
+        "html_url": "https://github.example.com/acme/mcp-server",
+        "description": "An MCP server",
+        "language": "Python",
+        "stargazers_count": 7,
+        "forks_count": 2
+    }]}
+    assert format_repo_results(data, compact=True) == (
+        "- https://github.example.com/acme/mcp-server (Python, 7 stars, 2 forks): An MCP server"
+    )
+    assert format_repo_results({"items": []}, compact=True) == ""
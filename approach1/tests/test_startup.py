@@ -0,0 +1,62 @@
+"""Tests for import-time cost and side effects."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the API, worker and CLIs import at startup
+STARTUP_MODULES = "src.config, src.crew, src.worker, src.estimator, src.main"
+
+# Cumulative import time budget for STARTUP_MODULES (measured ~0.1s)
+IMPORT_BUDGET_SECONDS = 0.5
+
+# The API also loads FastAPI and uvicorn (measured ~0.4s)
+API_IMPORT_BUDGET_SECONDS = 1.5
+
+# Loaded on first use only
+DEFERRED_PACKAGES = ("crewai", "litellm", "pydantic_settings", "httpx")
+
+
+def _importtime(cwd: Path, modules: str = STARTUP_MODULES) -> dict:
+    """Import modules in a fresh interpreter; return cumulative microseconds per module."""
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_startup_imports_are_light_and_side_effect_free(tmp_path):
+    """Test that startup needs no API key, creates no directories and defers heavy packages."""
+    cumulative = _importtime(tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+    loaded = {name.split(".")[0] for name in cumulative}
+    assert not loaded & set(DEFERRED_PACKAGES)
+
+    top_level = sum(cumulative.get(name, 0) for name in STARTUP_MODULES.split(", "))
+    assert top_level / 1_000_000 < IMPORT_BUDGET_SECONDS
+
+
+def test_api_import_is_side_effect_free(tmp_path):
+    """Test that importing the API needs no API key, writes no files and defers heavy packages."""
+    cumulative = _importtime(tmp_path, "api")
+
+    assert list(tmp_path.iterdir()) == []
+    loaded = {name.split(".")[0] for name in cumulative}
+    assert not loaded & set(DEFERRED_PACKAGES)
+    assert cumulative["api"] / 1_000_000 < API_IMPORT_BUDGET_SECONDS
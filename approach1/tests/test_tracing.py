@@ -0,0 +1,80 @@
+"""Tests for span-based tracing."""
+
+import json
+from types import SimpleNamespace
+
+from src.utils.tracing import CrewTracer, Tracer, current_tracer, trace_span, tracing_scope
+
+
+def test_spans_nest_and_export_chrome_trace(tmp_path):
+    """Test that spans nest under the current span and export as Chrome trace events."""
+    tracer = Tracer("abc123")
+    with tracing_scope(tracer):
+        assert current_tracer() is tracer
+        with trace_span("investigation", "investigation", topic="t") as root:
+            with trace_span("GET https://api.github.com", "http") as http:
+                http.set(status_code=200)
+
+    assert current_tracer() is None
+    assert http.parent_id == root.span_id
+    assert root.duration_seconds >= http.duration_seconds
+
+    path = tracer.export(tmp_path / "trace.json")
+    trace = json.loads(path.read_text())
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert trace["otherData"]["trace_id"] == "abc123"
+    assert events["GET https://api.github.com"]["ph"] == "X"
+    assert events["GET https://api.github.com"]["args"]["status_code"] == 200
+    assert events["investigation"]["args"]["topic"] == "t"
+
+
+def test_trace_span_is_noop_without_tracer():
+    """Test that tools can open spans outside a traced investigation."""
+    with trace_span("GET https://example.com", "http") as span:
+        span.set(status_code=404)
+    assert current_tracer() is None
+
+
+def test_crew_tracer_records_phase_step_llm_and_tool_spans():
+    """Test that the CrewAI hook handlers build the phase -> step -> call hierarchy."""
+    tracer = Tracer()
+    events = []
+    crew_tracer = CrewTracer(tracer, ["MCP Research", "Technical Analysis"], on_event=events.append)
+    llm = SimpleNamespace(model="gpt-test", _token_usage={"prompt_tokens": 10, "completion_tokens": 2})
+
+    phase = crew_tracer.start_phase("MCP Researcher")
+    crew_tracer.before_llm_call(SimpleNamespace(llm=llm, messages=[1, 2], iterations=0))
+    llm._token_usage = {"prompt_tokens": 110, "completion_tokens": 22}
+    crew_tracer.after_llm_call(SimpleNamespace(llm=llm, response="answer"))
+    crew_tracer.before_tool_call(SimpleNamespace(tool_name="web_search", tool_input={"query": "mcp"}))
+    with tracing_scope(tracer), trace_span("POST https://google.serper.dev/search", "http") as http:
+        pass
+    crew_tracer.after_tool_call(SimpleNamespace(tool_input={"query": "mcp"}, tool_result="results"))
+    crew_tracer.end_step()
+    crew_tracer.start_phase("Technical Analyst")
+    crew_tracer.end_phase()
+
+    by_category = {}
+    for span in tracer.spans:
+        by_category.setdefault(span.category, []).append(span)
+
+    step = by_category["agent_step"][0]
+    llm_span = by_category["llm"][0]
+    tool_span = by_category["tool"][0]
+    assert [span.name for span in by_category["phase"]] == ["MCP Research", "Technical Analysis"]
+    assert step.parent_id == phase.span_id
+    assert llm_span.parent_id == tool_span.parent_id == step.span_id
+    assert http.parent_id == tool_span.span_id
+    assert llm_span.attributes["prompt_tokens"] == 100
+    assert llm_span.attributes["completion_tokens"] == 20
+    assert crew_tracer.payloads[llm_span.span_id] == {"response": "answer"}
+    assert crew_tracer.payloads[tool_span.span_id]["result"] == "results"
+    assert "result" not in tool_span.attributes
+    assert all(span.end_ns is not None for span in tracer.spans)
+
+    assert [event["type"] for event in events] == [
+        "phase_start", "llm_call", "tool_start", "tool_end", "phase_end", "phase_start", "phase_end"
+    ]
+    assert events[1]["phase"] == "MCP Research" and events[1]["agent"] == "MCP Researcher"
+    assert events[1]["prompt_tokens"] == 100
+    assert events[-1]["phase"] == "Technical Analysis"
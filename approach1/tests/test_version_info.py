@@ -0,0 +1,49 @@
+"""Tests for cached version information."""
+
+import json
+
+import pytest
+
+from src.utils import version_info
+
+
+@pytest.fixture
+def git_calls(monkeypatch, tmp_path):
+    """Count git subprocess calls, with no build_info.json present."""
+    calls = []
+
+    def check_output(args, **kwargs):
+        calls.append(args)
+        return b"abc1234\n"
+
+    monkeypatch.delenv("GIT_COMMIT", raising=False)
+    monkeypatch.setattr(version_info, "BUILD_INFO_PATH", tmp_path / "build_info.json")
+    monkeypatch.setattr(version_info.subprocess, "check_output", check_output)
+    version_info.refresh_version_info()
+    calls.clear()
+    yield calls
+    monkeypatch.undo()
+    version_info.refresh_version_info()
+
+
+def test_versions_are_collected_once_until_refreshed(git_calls):
+    """Test that repeated calls are served from memory and refresh is explicit."""
+    versions = version_info.get_agent_versions()
+    versions["git_commit"] = "modified by caller"
+    assert version_info.get_agent_versions()["git_commit"] == "abc1234"
+    version_info.format_version_info()
+    assert git_calls == []
+
+    version_info.refresh_version_info()
+    assert len(git_calls) == 1
+
+
+def test_build_info_is_used_instead_of_git(git_calls):
+    """Test that a build-time build_info.json replaces the git lookup."""
+    path = version_info.write_build_info(version_info.BUILD_INFO_PATH, git_commit="0123456789abcdef")
+    assert json.loads(path.read_text())["git_commit"] == "0123456"
+
+    versions = version_info.refresh_version_info()
+    assert versions["git_commit"] == "0123456"
+    assert set(versions["dependencies"]) == set(version_info.DEPENDENCIES)
+    assert git_calls == []
@@ -0,0 +1,92 @@
+"""Tests for the background job worker."""
+
+import sqlite3
+import time
+
+import src.crew
+from src.config import get_settings
+from src.storage.artifacts import ReportArtifact
+from src.storage.jobs import JobStore
+from src.worker import InvestigationWorker
+
+
+LEASE_SECONDS = 0.3
+
+
+class SlowCrew:
+    """Stands in for the crew; each investigation outlasts the job lease."""
+
+    usage = None
+
+    def __init__(self, verbose=False):
+        pass
+
+    def investigate(self, topic, depth, **kwargs):
+        time.sleep(LEASE_SECONDS * 4)
+        return ReportArtifact("# Report")
+
+
+class LockedStore(JobStore):
+    """Job store whose first claims fail as if another process held the write lock."""
+
+    def __init__(self, db_path, failures):
+        super().__init__(db_path)
+        self.failures = failures
+
+    def claim(self, worker_id):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().claim(worker_id)
+
+
+def _worker(store, worker_id):
+    worker = InvestigationWorker(store, max_concurrent=1)
+    worker.worker_id = worker_id
+    worker.settings = get_settings().model_copy(update={"job_lease_seconds": LEASE_SECONDS,
+                                                        "job_poll_interval": 0.02})
+    return worker
+
+
+def test_drain_keeps_leases_while_jobs_finish(tmp_path, monkeypatch):
+    """Test that a draining worker's job is not failed as lost by another worker."""
+    monkeypatch.setattr(src.crew, "MCPInvestigationCrew", SlowCrew)
+    store = JobStore(tmp_path / "jobs.db")
+    draining = _worker(store, "draining")
+    other = _worker(store, "other")
+    job = store.submit("topic", "quick")
+
+    draining.start()
+    deadline = time.monotonic() + 5
+    while store.get(job["id"])["status"] != "running" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    other.start()
+    try:
+        draining.drain()
+    finally:
+        other.drain()
+
+    finished = store.get(job["id"])
+    assert finished["status"] == "completed"
+    assert finished["report"] == "# Report"
+
+
+def test_poll_loop_survives_store_errors(tmp_path, monkeypatch, caplog):
+    """Test that a failing store call is logged and the worker keeps polling and claiming."""
+    monkeypatch.setattr(src.crew, "MCPInvestigationCrew", SlowCrew)
+    store = LockedStore(tmp_path / "jobs.db", failures=3)
+    worker = _worker(store, "locked")
+    job = store.submit("topic", "quick")
+
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while store.get(job["id"])["status"] == "queued" and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        worker.drain()
+
+    assert store.failures == 0
+    assert store.get(job["id"])["status"] == "completed"
+    assert worker.active == 0
+    assert "database is locked" in caplog.text